@@ -1,13 +1,16 @@
 """Test Harness API Server"""
 
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.adapters.http_pool import get_http_pool, close_http_pool
 from .routers import tests, prompts, datasets, evaluations, websocket
 from .dependencies import get_database, close_database
+from .services.progress_bus import get_progress_bus
 
 
 @asynccontextmanager
@@ -18,11 +21,18 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # 데이터베이스 연결 (테이블 자동 생성)
     await get_database()
     print("Database connected.")
+    # LLM API 공용 연결 풀 (configs/models.yaml의 http_pool 섹션)
+    project_root = Path(__file__).parent.parent.parent.parent.parent
+    pool = get_http_pool(project_root / "configs" / "models.yaml")
+    print(f"HTTP pool ready (http2={pool.http2}).")
+    # WebSocket 진행률 전달 (configs/models.yaml의 progress_bus 섹션)
+    get_progress_bus(project_root / "configs" / "models.yaml")
 
     yield
 
     # Shutdown
     print("Shutting down Test Harness API...")
+    await close_http_pool()
     await close_database()
     print("Database closed.")
 
@@ -1,12 +1,16 @@
 """데이터셋 관리 API (Import + 3단계 Fallback 매핑)"""
 
+import codecs
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from fastapi.responses import PlainTextResponse, JSONResponse
 from pydantic import BaseModel
-from typing import Any
 
 from ..dependencies import get_dataset_service
-from ..services.dataset_service import DatasetService
+from ..services.dataset_service import DatasetService, ImportAbortedError
 
 router = APIRouter()
 
@@ -172,15 +176,35 @@ async def list_cases(
     dataset_id: str,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
+    include_total: bool | None = None,
     service: DatasetService = Depends(get_dataset_service),
 ):
-    """데이터셋의 테스트 케이스 목록"""
+    """데이터셋의 테스트 케이스 목록
+
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회합니다 (offset보다 우선).
+    total은 첫 페이지(cursor 없음)에서 계산하고, 이후 페이지는 include_total=true일 때만
+    계산합니다 (include_total=false면 첫 페이지도 생략).
+    전체 수는 데이터셋의 case_count로도 확인할 수 있습니다.
+    """
+    if not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+
     # 데이터셋 존재 확인
     dataset = await service.get_dataset(dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    return await service.list_cases(dataset_id, limit=limit, offset=offset)
+    try:
+        return await service.list_cases(
+            dataset_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/{dataset_id}/cases")
@@ -246,6 +270,48 @@ async def delete_case(
 # Import
 # =============================================================================
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+async def _iter_upload_text(file: UploadFile) -> AsyncIterator[str]:
+    """업로드 파일을 청크 단위로 읽어 점진적으로 디코딩
+
+    UTF-8로 디코딩하다가 실패하면, 그때까지 읽은 내용이 모두 ASCII인 경우에 한해
+    cp949(한글 Windows)로 전환한다.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    ascii_only = True
+
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        try:
+            text = decoder.decode(chunk)
+        except UnicodeDecodeError:
+            if not ascii_only:
+                raise
+            # 앞부분은 ASCII였으므로 남은 바이트부터 cp949로 디코딩
+            pending, _ = decoder.getstate()
+            decoder = codecs.getincrementaldecoder("cp949")()
+            text = decoder.decode(pending + chunk)
+
+        if ascii_only and not text.isascii():
+            ascii_only = False
+        yield text
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _parse_column_mapping(column_mapping: str | None) -> dict[str, str] | None:
+    """Form으로 받은 column_mapping JSON 문자열 파싱"""
+    if not column_mapping:
+        return None
+    try:
+        return json.loads(column_mapping)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid column_mapping JSON")
+
+
 @router.post("/{dataset_id}/import/csv")
 async def import_csv(
     dataset_id: str,
@@ -272,29 +338,54 @@ async def import_csv(
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    # 파일 읽기
-    content = await file.read()
+    mapping = _parse_column_mapping(column_mapping)
+
+    # 파일을 청크 단위로 읽어 디코딩 → 레코드가 완성되는 대로 INSERT
     try:
-        csv_content = content.decode("utf-8")
-    except UnicodeDecodeError:
-        csv_content = content.decode("cp949")  # 한글 Windows
+        result = await service.import_csv_stream(
+            dataset_id=dataset_id,
+            chunks=_iter_upload_text(file),
+            column_mapping=mapping,
+            expected_output_column=expected_output_column,
+            metadata_prefix=metadata_prefix,
+        )
+    except ImportAbortedError as e:
+        # 디코딩 실패 → 이미 읽은 행도 롤백됨, 어디까지 처리했는지 함께 반환
+        raise HTTPException(status_code=400, detail={"message": str(e), **e.result})
 
-    # 매핑 파싱
-    mapping = None
-    if column_mapping:
-        try:
-            import json
-            mapping = json.loads(column_mapping)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid column_mapping JSON")
+    return result
 
-    result = await service.import_csv(
-        dataset_id=dataset_id,
-        csv_content=csv_content,
-        column_mapping=mapping,
-        expected_output_column=expected_output_column,
-        metadata_prefix=metadata_prefix,
-    )
+
+@router.post("/{dataset_id}/import/jsonl")
+async def import_jsonl(
+    dataset_id: str,
+    file: UploadFile = File(...),
+    column_mapping: str | None = Form(None),  # JSON 문자열
+    service: DatasetService = Depends(get_dataset_service),
+):
+    """JSONL 파일 Import (줄 단위 JSON, 스트리밍)
+
+    각 줄은 JSON Import의 data 항목과 같은 형식:
+    ```
+    {"input": {"question": "..."}, "expected_output": "..."}
+    {"raw_input": {"q": "..."}, "expected": "...", "metadata": {...}}
+    ```
+    """
+    dataset = await service.get_dataset(dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    mapping = _parse_column_mapping(column_mapping)
+
+    try:
+        result = await service.import_jsonl_stream(
+            dataset_id=dataset_id,
+            chunks=_iter_upload_text(file),
+            column_mapping=mapping,
+        )
+    except ImportAbortedError as e:
+        # 디코딩 실패 → 이미 읽은 행도 롤백됨, 어디까지 처리했는지 함께 반환
+        raise HTTPException(status_code=400, detail={"message": str(e), **e.result})
 
     return result
 
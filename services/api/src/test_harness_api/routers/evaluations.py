@@ -1,31 +1,160 @@
 """평가 결과 API"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+
+from ..dependencies import get_database
+from ..services.evaluation_service import EvaluationService
+from ..services.run_aggregates import RunAggregates
 
 router = APIRouter()
 
 
+async def get_evaluation_service() -> EvaluationService:
+    """평가 서비스 인스턴스"""
+    db = await get_database()
+    return EvaluationService(db)
+
+
 @router.get("/{test_run_id}/summary")
-async def get_evaluation_summary(test_run_id: str):
-    """평가 요약 조회"""
-    # TODO: DB에서 조회 및 계산
-    return {
-        "test_run_id": test_run_id,
-        "total_tests": 0,
-        "passed_tests": 0,
-        "failed_tests": 0,
-        "pass_rate": 0.0,
-        "avg_latency_ms": 0.0,
-        "by_prompt": {},
-        "by_model": {},
-    }
+async def get_evaluation_summary(
+    test_run_id: str,
+    refresh: bool = False,
+    service: EvaluationService = Depends(get_evaluation_service),
+):
+    """평가 요약 조회
+
+    test_results를 SQL로 집계한 결과를 캐시해 두고 반환합니다.
+    새 결과가 저장되면 캐시가 무효화되어 다음 조회 때 다시 계산합니다.
+
+    Args:
+        refresh: True면 캐시를 무시하고 다시 계산
+    """
+    summary = await service.get_summary(test_run_id, refresh=refresh)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Test run not found")
+    return summary
+
+
+@router.get("/{test_run_id}/live")
+async def get_live_summary(
+    test_run_id: str,
+    service: EvaluationService = Depends(get_evaluation_service),
+):
+    """실행 중 누적 집계 조회
+
+    Executor가 결과 저장 시 함께 갱신하는 (prompt, model)별 집계를 반환합니다.
+    test_results를 스캔하지 않으므로 실행 중 폴링용으로 사용합니다.
+    p50/p95 latency는 스케치 기반 근사값(상대 오차 1%)입니다.
+    """
+    run = await service.db.fetchone(
+        "SELECT status FROM test_runs WHERE id = ?",
+        (test_run_id,)
+    )
+    if not run:
+        raise HTTPException(status_code=404, detail="Test run not found")
+
+    aggregates = RunAggregates(service.db, test_run_id)
+    await aggregates.load()
+    return {**aggregates.snapshot(), "status": run["status"]}
 
 
 @router.get("/{test_run_id}/compare")
-async def compare_results(test_run_id: str):
-    """Side-by-side 비교용 데이터"""
-    # TODO: 비교 데이터 생성
-    return {
-        "test_run_id": test_run_id,
-        "comparisons": [],
+async def compare_results(
+    test_run_id: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    filter: str = "all",
+    service: EvaluationService = Depends(get_evaluation_service),
+):
+    """Side-by-side 비교용 데이터
+
+    케이스(test_case_id)별로 prompt × model 셀의 출력/통과 여부/latency를 반환합니다.
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회합니다.
+
+    Args:
+        limit: 페이지당 케이스 수
+        cursor: 이전 응답의 next_cursor
+        filter: all, disagree (셀 간 결과가 다른 케이스만), failed (실패 셀이 있는 케이스만)
+
+    응답 예시:
+    ```json
+    {
+      "columns": [
+        {"key": "prompt_1::llama-3.3-70b", "prompt_id": "prompt_1", "model_id": "llama-3.3-70b"}
+      ],
+      "rows": [
+        {
+          "test_case_id": "case_1",
+          "input": {"question": "..."},
+          "expected_output": "...",
+          "cells": {
+            "prompt_1::llama-3.3-70b": {"output": "...", "passed": true, "latency_ms": 812.4}
+          }
+        }
+      ],
+      "next_cursor": "eyJjYXNlIjoiY2FzZV8xIn0"
     }
+    ```
+    """
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+
+    try:
+        result = await service.compare(
+            test_run_id,
+            limit=limit,
+            cursor=cursor,
+            case_filter=filter,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Test run not found")
+    return result
+
+
+@router.get("/{test_run_id}/diff")
+async def diff_runs(
+    test_run_id: str,
+    baseline_id: str,
+    limit: int = 100,
+    latency_threshold: float = 0.2,
+    min_latency_delta_ms: float = 100.0,
+    prompt_id: str | None = None,
+    baseline_prompt_id: str | None = None,
+    service: EvaluationService = Depends(get_evaluation_service),
+):
+    """회귀 비교 (baseline 실행 → 이 실행)
+
+    같은 데이터셋으로 돌린 두 실행을 (test_case_id, model_id)로 조인해
+    새로 실패한 케이스, 새로 통과한 케이스, latency가 회귀한 케이스를 반환합니다.
+    프롬프트 버전 활성화 전 회귀 검사용입니다.
+
+    Args:
+        baseline_id: 기준 실행 ID (예: 현재 활성 버전으로 돌린 실행)
+        limit: 변경 유형별 반환할 최대 케이스 수 (counts는 전체 개수)
+        latency_threshold: latency 회귀 기준 증가율 (0.2 = 20%)
+        min_latency_delta_ms: latency 회귀 최소 증가량 (ms)
+        prompt_id: 이 실행에서 비교할 프롬프트 (없으면 전체)
+        baseline_prompt_id: 기준 실행에서 비교할 프롬프트 (없으면 전체)
+    """
+    if not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+
+    try:
+        result = await service.diff_runs(
+            base_run_id=baseline_id,
+            head_run_id=test_run_id,
+            limit=limit,
+            latency_threshold=latency_threshold,
+            min_latency_delta_ms=min_latency_delta_ms,
+            base_prompt_id=baseline_prompt_id,
+            head_prompt_id=prompt_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Test run not found")
+    return result
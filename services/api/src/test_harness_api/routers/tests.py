@@ -1,16 +1,28 @@
 """테스트 실행 및 관리 API (3단계 Fallback 매핑)"""
 
+import os
+import socket
+import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from ..dependencies import get_database
 from ..services.test_service import TestService
 from ..services.test_executor import TestExecutor
+from ..services.job_queue import JobQueue
+from ..services.job_runner import JobRunner
+from ..services.pagination import decode_cursor
+from ..services.progress_bus import get_progress_bus, progress_message
+from ..services.result_stream import stream_results
 
 router = APIRouter()
 
+# 이 API 프로세스가 직접 실행하는 작업의 소유자 ID (jobs.worker_id)
+API_WORKER_ID = f"api-{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:4]}"
+
 
 # =============================================================================
 # Request/Response Models
@@ -90,13 +102,30 @@ async def list_test_runs(
     limit: int = 20,
     offset: int = 0,
     status: str | None = None,
+    cursor: str | None = None,
+    include_total: bool | None = None,
     service: TestService = Depends(get_test_service),
 ):
-    """테스트 실행 목록 조회
+    """테스트 실행 목록 조회 (최신순)
 
     status: pending, running, completed, failed, cancelled
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회합니다 (offset보다 우선).
+    total은 첫 페이지(cursor 없음)에서 계산하고, 이후 페이지는 include_total=true일 때만
+    계산합니다 (include_total=false면 첫 페이지도 생략, 그 외에는 null).
     """
-    return await service.list_test_runs(limit=limit, offset=offset, status=status)
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+
+    try:
+        return await service.list_test_runs(
+            limit=limit,
+            offset=offset,
+            status=status,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{test_id}")
@@ -116,15 +145,100 @@ async def get_test_results(
     test_id: str,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
+    include_total: bool | None = None,
     service: TestService = Depends(get_test_service),
 ):
-    """테스트 결과 조회"""
+    """테스트 결과 조회
+
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회합니다 (offset보다 우선).
+    total은 첫 페이지(cursor 없음)에서 계산하고, 이후 페이지는 include_total=true일 때만
+    계산합니다 (include_total=false면 첫 페이지도 생략, 그 외에는 null).
+    """
+    if not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+
     # 테스트 존재 확인
     test_run = await service.get_test_run(test_id)
     if not test_run:
         raise HTTPException(status_code=404, detail="Test run not found")
 
-    return await service.get_test_results(test_id, limit=limit, offset=offset)
+    try:
+        return await service.get_test_results(
+            test_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{test_id}/results/stream")
+async def stream_test_results(
+    test_id: str,
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+    service: TestService = Depends(get_test_service),
+):
+    """셀 결과 실시간 스트림 (Server-Sent Events)
+
+    저장된 결과를 순서대로 `result` 이벤트로 보내고,
+    실행 중이면 새 결과가 저장될 때마다 이어서 보냅니다.
+    실행이 끝나고 남은 결과를 모두 보내면 `end` 이벤트 후 연결을 닫습니다.
+    연결이 끊기면 브라우저 EventSource가 Last-Event-ID 헤더로 자동 재연결하며,
+    그 이후 결과부터 다시 받습니다 (헤더를 못 보내는 클라이언트는 last_event_id 파라미터 사용).
+
+    이벤트 예시:
+    ```
+    id: eyJjcmVhdGVkX2F0Ijoi...
+    event: result
+    data: {"id": "res_...", "prompt_id": "prompt_1", "model_id": "...", "passed": true, ...}
+
+    event: end
+    data: {"test_run_id": "run_1", "status": "completed",
+           "completed_cases": 400, "total_cases": 400}
+    ```
+    """
+    test_run = await service.get_test_run(test_id)
+    if not test_run:
+        raise HTTPException(status_code=404, detail="Test run not found")
+
+    resume_from = last_event_id_header or last_event_id
+    if resume_from:
+        try:
+            decode_cursor(resume_from, ("created_at", "id"))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        stream_results(service, get_progress_bus(), test_id, resume_from),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 등 프록시 버퍼링 해제
+        },
+    )
+
+
+@router.get("/{test_id}/stream-metrics")
+async def get_stream_metrics(
+    test_id: str,
+    service: TestService = Depends(get_test_service),
+):
+    """모델별 스트리밍 지표 (streaming=true로 실행한 결과)
+
+    TTFT 평균/p50/p95/p99, 평균 전체 시간, tokens/sec, 토큰 간 지연
+    """
+    test_run = await service.get_test_run(test_id)
+    if not test_run:
+        raise HTTPException(status_code=404, detail="Test run not found")
+
+    return {
+        "test_run_id": test_id,
+        "by_model": await service.get_stream_metrics_by_model(test_id),
+    }
 
 
 @router.delete("/{test_id}")
@@ -149,19 +263,58 @@ async def execute_test_run(
     background_tasks: BackgroundTasks,
     sync: bool = False,
     timeout: int = 600,
+    engine: str = "promptfoo",
+    concurrency: int = 8,
+    use_cache: bool = False,
+    resume: bool = True,
+    streaming: bool = False,
+    workers: int = 1,
+    shard_size: int | None = None,
+    shard_timeout: int | None = None,
+    shard_retries: int = 1,
+    queue: bool = False,
+    priority: int = 0,
+    coalesce: bool = True,
+    coalesce_sampled: bool = False,
+    temperature: float = 0.7,
 ):
     """테스트 실행 시작
 
     pending 상태의 테스트를 실제로 실행합니다.
-    promptfoo를 통해 LLM 호출 및 Assertion 평가를 수행합니다.
+    failed/cancelled 상태나, 프로세스 재시작으로 running에 멈춘 테스트는
+    이미 저장된 (prompt, model, case) 셀을 건너뛰고 남은 셀만 실행합니다.
+    이 프로세스에서 실행할 때도 jobs에 running 작업을 만들고 lease를 연장하므로,
+    lease가 만료된 running 테스트를 중단된 실행으로 판단합니다 (API 서버 여러 개여도 동일).
+    promptfoo 또는 native 엔진을 통해 LLM 호출 및 Assertion 평가를 수행합니다.
 
     Args:
         test_id: 테스트 실행 ID
         sync: True면 동기 실행 (완료까지 대기), False면 백그라운드 실행
         timeout: 타임아웃 (초, 기본 600초 = 10분)
+        engine: 실행 엔진 (promptfoo: CLI subprocess, native: in-process asyncio)
+        concurrency: native 엔진 동시 실행 셀 수
+        use_cache: LLM 응답 캐시 사용 (모델 + 렌더링된 프롬프트 + 파라미터가 같으면 재사용)
+        resume: True면 저장된 셀 이후부터 재개, False면 기존 결과 삭제 후 처음부터
+        streaming: 스트리밍 측정 모드 (native 엔진 전용, 셀마다 TTFT/토큰 간 지연 기록)
+        workers: promptfoo 엔진 동시 프로세스 수 (1보다 크면 케이스를 shard로 나눠 병렬 실행)
+        shard_size: promptfoo shard당 케이스 수 (기본 100)
+        shard_timeout: promptfoo shard 하나의 타임아웃 (초, 기본은 timeout)
+        shard_retries: promptfoo shard 실패 시 재시도 횟수 (끝내 실패한 shard의 셀은 에러로 기록)
+        queue: True면 이 프로세스에서 실행하지 않고 작업 큐에 추가 (워커 프로세스가 실행)
+        priority: 우선순위 (0~10, 클수록 먼저). native 엔진은 동시에 도는 실행들과 나눠 쓰는
+            (provider, model) 슬롯을 먼저 받고, queue=True면 워커가 먼저 가져감.
+            같은 우선순위끼리는 슬롯을 고르게 나눠 작은 실행이 대형 배치 뒤에 밀리지 않음
+        coalesce: native 엔진에서 진행 중인 동일한 temperature 0 요청 (모델 + 렌더링된 프롬프트
+            + 파라미터)을 한 번만 호출하고 결과 공유 (동시에 도는 다른 실행과도, 캐시 사용 여부가
+            같은 실행끼리만). 셀 호출은 temperature=0일 때만 합쳐지고, 기본값 0.7이면
+            llm-rubric 채점 호출만 합쳐짐
+        coalesce_sampled: 셀 호출 등 temperature > 0 요청도 합침
+            (합쳐진 셀은 같은 샘플을 공유, 셀마다 독립 샘플이 필요하면 false 유지)
+        temperature: native 엔진 셀 호출 샘플링 온도 (0~2, promptfoo는 프로바이더 기본값)
 
     Returns:
         sync=True: 실행 결과
+        queue=True: 추가된 작업 정보
         sync=False: 실행 시작 메시지
     """
     db = await get_database()
@@ -172,43 +325,205 @@ async def execute_test_run(
     if not test_run:
         raise HTTPException(status_code=404, detail="Test run not found")
 
+    # 실행을 기다리거나 lease가 살아 있는 실행 중 작업이 있는 경우 (API 서버/워커 무관)
+    job_queue = JobQueue(db)
+    active_job = await job_queue.get_active(test_id)
+    if job_queue.is_live(active_job):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Test run already has a {active_job['status']} job: {active_job['id']}"
+        )
+
     # 이미 실행 중이거나 완료된 경우
-    if test_run["status"] not in ["pending", "failed"]:
+    # running이지만 lease가 살아 있는 작업이 없으면 소유 프로세스가 죽은 중단된 실행 → 재개 허용
+    # (작업 없이 이 프로세스에서 직접 execute 중인 실행은 제외)
+    interrupted = (
+        test_run["status"] == "running" and test_id not in TestExecutor.active_runs
+    )
+    if test_run["status"] not in ["pending", "failed", "cancelled"] and not interrupted:
         raise HTTPException(
             status_code=400,
             detail=f"Test run is already {test_run['status']}"
         )
 
+    if engine not in ("promptfoo", "native"):
+        raise HTTPException(status_code=400, detail="engine must be 'promptfoo' or 'native'")
+    if concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency must be >= 1")
+    if streaming and engine != "native":
+        raise HTTPException(status_code=400, detail="streaming requires engine=native")
+    if workers < 1:
+        raise HTTPException(status_code=400, detail="workers must be >= 1")
+    if shard_size is not None and shard_size < 1:
+        raise HTTPException(status_code=400, detail="shard_size must be >= 1")
+    if shard_retries < 0:
+        raise HTTPException(status_code=400, detail="shard_retries must be >= 0")
+    if not 0 <= priority <= 10:
+        raise HTTPException(status_code=400, detail="priority must be between 0 and 10")
+    if not 0 <= temperature <= 2:
+        raise HTTPException(status_code=400, detail="temperature must be between 0 and 2")
+    if coalesce_sampled and not coalesce:
+        raise HTTPException(status_code=400, detail="coalesce_sampled requires coalesce=true")
+    if sync and queue:
+        raise HTTPException(status_code=400, detail="sync and queue cannot be used together")
+
+    # 실행 옵션은 JSON으로 저장 → 워커나 lease를 이어받은 프로세스가 그대로 execute에 전달
+    options = {
+        "timeout": timeout,
+        "engine": engine,
+        "concurrency": concurrency,
+        "use_cache": use_cache,
+        "resume": resume,
+        "streaming": streaming,
+        "workers": workers,
+        "shard_size": shard_size,
+        "shard_timeout": shard_timeout,
+        "shard_retries": shard_retries,
+        "priority": priority,
+        "coalesce": coalesce,
+        "coalesce_sampled": coalesce_sampled,
+        "temperature": temperature,
+    }
+
+    if queue:
+        # 워커 프로세스 실행
+        try:
+            job = await job_queue.enqueue(test_id, options)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {
+            "message": "Test execution queued",
+            "test_id": test_id,
+            "job_id": job["id"],
+            "status": job["status"],
+        }
+
+    # 이 프로세스에서 실행: running 작업을 만들어 lease를 잡음
+    # (동시에 들어온 execute는 하나만 성공, 다른 프로세스도 lease로 실행 중임을 앎)
+    try:
+        job = await job_queue.start(test_id, API_WORKER_ID, options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     # 프로젝트 루트 경로 (node_modules 위치)
     # tests.py → routers → test_harness_api → src → api → services → Test-Harness
     project_root = Path(__file__).parent.parent.parent.parent.parent.parent
 
-    executor = TestExecutor(db, project_root=project_root)
+    # 프로세스가 종료돼도 작업을 대기 상태로 되돌리지 않음 → lease 만료 후 중단된 실행으로 재개
+    runner = JobRunner(db, API_WORKER_ID, project_root=project_root, release_on_cancel=False)
+    on_progress = get_progress_bus().progress_callback(test_id)
 
     if sync:
         # 동기 실행: 완료까지 대기
         try:
-            result = await executor.execute(test_id, timeout=timeout)
-            return result
+            result = await runner.run(job, on_progress=on_progress)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        if result is None:
+            raise HTTPException(
+                status_code=500,
+                detail="Lost the job lease; the run was taken over by a worker",
+            )
+        return result
     else:
         # 백그라운드 실행
         async def run_in_background():
             try:
-                await executor.execute(test_id, timeout=timeout)
-            except Exception as e:
-                # 에러는 이미 test_run에 기록됨
+                await runner.run(job, on_progress=on_progress)
+            except Exception:
+                # 에러는 이미 test_run과 작업에 기록됨
                 pass
 
         background_tasks.add_task(run_in_background)
         return {
             "message": "Test execution started",
             "test_id": test_id,
+            "job_id": job["id"],
             "status": "running",
         }
 
 
+@router.post("/{test_id}/cancel")
+async def cancel_test_run(
+    test_id: str,
+    service: TestService = Depends(get_test_service),
+):
+    """테스트 실행 취소
+
+    새 셀 스케줄링을 멈추고 진행 중인 LLM 요청(native) 또는 promptfoo 프로세스를 종료합니다.
+    이미 저장된 결과는 유지되며 상태는 cancelled가 됩니다.
+    cancelled 상태의 테스트를 다시 execute하면 남은 셀부터 재개합니다.
+
+    취소는 항상 작업의 cancel_requested로 전달됩니다 (어느 API 프로세스에 요청해도 동일).
+    - 이 프로세스가 실행 중이면 바로 취소하고 cancelled 상태를 반환
+    - 다른 프로세스(워커, 다른 API 서버)가 실행 중이면 202와 cancel_requested=true 반환
+      → 소유자가 다음 heartbeat에서 취소를 확인하고 cancelled로 바꿀 때까지 상태는 running
+    - 대기 중이거나 소유자가 죽은 (lease 만료) 실행은 바로 cancelled
+
+    Returns:
+        취소 후 테스트 실행 정보
+    """
+    test_run = await service.get_test_run(test_id)
+    if not test_run:
+        raise HTTPException(status_code=404, detail="Test run not found")
+
+    if test_run["status"] not in ["pending", "running"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Test run is already {test_run['status']}"
+        )
+
+    job = await JobQueue(service.db).request_cancel(test_id)
+
+    if job is not None and job["status"] == "running":
+        # lease가 살아 있는 실행 → 소유자가 이 프로세스면 바로 취소 (heartbeat를 기다리지 않음)
+        if await TestExecutor.cancel(test_id):
+            return await service.get_test_run(test_id)
+        # 다른 프로세스 소유 → 소유자가 확인할 때까지 cancelled로 보고하지 않음
+        return JSONResponse(
+            status_code=202,
+            content={
+                **await service.get_test_run(test_id),
+                "cancel_requested": True,
+                "job_id": job["id"],
+            },
+        )
+
+    # 작업 없이 이 프로세스에서 직접 실행 중인 경우
+    if await TestExecutor.cancel(test_id):
+        return await service.get_test_run(test_id)
+
+    # 대기 중이거나 소유자가 죽은 실행 → 실행 중인 곳이 없으므로 바로 cancelled
+    await service.update_test_run_status(test_id, "cancelled")
+    get_progress_bus().publish(test_id, progress_message(
+        test_id,
+        test_run["completed_cases"],
+        test_run["total_cases"],
+        "cancelled",
+    ))
+    return await service.get_test_run(test_id)
+
+
+@router.get("/{test_id}/jobs")
+async def list_test_jobs(
+    test_id: str,
+    limit: int = 20,
+    service: TestService = Depends(get_test_service),
+):
+    """작업 큐 이력 조회 (execute?queue=true로 추가된 작업, 최신순)
+
+    워커 ID, 시도 횟수(attempts), lease 만료 시각, 마지막 heartbeat를 확인할 수 있습니다.
+    """
+    if not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+
+    test_run = await service.get_test_run(test_id)
+    if not test_run:
+        raise HTTPException(status_code=404, detail="Test run not found")
+
+    return {"jobs": await JobQueue(service.db).list_jobs(test_id, limit=limit)}
+
+
 # =============================================================================
 # 매핑 미리보기
 # =============================================================================
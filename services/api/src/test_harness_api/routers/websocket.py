@@ -1,35 +1,104 @@
 """WebSocket 실시간 업데이트"""
 
 import asyncio
-import json
+from collections.abc import Awaitable, Callable
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from ..dependencies import get_database
+from ..services.progress_bus import ProgressBus, get_progress_bus, progress_message
+from ..services.test_service import TestService
+
 router = APIRouter()
 
 
 class ConnectionManager:
-    """WebSocket 연결 관리"""
+    """WebSocket 연결 관리
+
+    연결마다 ProgressBus를 구독하고 전송 task가 자기 큐만 비운다.
+    broadcast는 큐에 넣기만 하므로 느린 연결이 다른 연결이나 실행을 막지 않는다.
+    버스 알림이 poll_interval 동안 없으면 poll로 DB의 진행률을 확인해 바뀌었을 때만 전송
+    (워커 등 다른 프로세스에서 실행 중이면 이 프로세스의 버스에는 알림이 오지 않음).
+    """
 
-    def __init__(self):
-        self.active_connections: dict[str, list[WebSocket]] = {}
+    def __init__(self, bus: ProgressBus | None = None):
+        self._bus = bus
+        self.active_connections: dict[str, dict[WebSocket, asyncio.Task]] = {}
 
-    async def connect(self, websocket: WebSocket, test_run_id: str):
+    @property
+    def bus(self) -> ProgressBus:
+        if self._bus is None:
+            self._bus = get_progress_bus()
+        return self._bus
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        test_run_id: str,
+        initial: dict | None = None,
+        poll: Callable[[], Awaitable[dict | None]] | None = None,
+    ):
+        """
+        Args:
+            initial: 연결 직후 보낼 현재 상태
+            poll: 현재 진행률 메시지 조회 (없으면 버스 알림만 전달)
+        """
         await websocket.accept()
-        if test_run_id not in self.active_connections:
-            self.active_connections[test_run_id] = []
-        self.active_connections[test_run_id].append(websocket)
+        queue = self.bus.subscribe(test_run_id)
+        if initial is not None:
+            queue.put_nowait(initial)
+        sender = asyncio.create_task(self._send_loop(websocket, test_run_id, queue, poll))
+        self.active_connections.setdefault(test_run_id, {})[websocket] = sender
 
     def disconnect(self, websocket: WebSocket, test_run_id: str):
-        if test_run_id in self.active_connections:
-            self.active_connections[test_run_id].remove(websocket)
-            if not self.active_connections[test_run_id]:
-                del self.active_connections[test_run_id]
+        connections = self.active_connections.get(test_run_id)
+        if not connections or websocket not in connections:
+            return
+        connections.pop(websocket).cancel()
+        if not connections:
+            del self.active_connections[test_run_id]
 
     async def broadcast(self, test_run_id: str, message: dict):
-        if test_run_id in self.active_connections:
-            for connection in self.active_connections[test_run_id]:
-                await connection.send_json(message)
+        self.bus.publish(test_run_id, message)
+
+    async def _send_loop(
+        self,
+        websocket: WebSocket,
+        test_run_id: str,
+        queue: asyncio.Queue,
+        poll: Callable[[], Awaitable[dict | None]] | None = None,
+    ):
+        """구독 큐 → WebSocket 전송 (연결 종료/끊김 시 구독 해제)"""
+        last: dict | None = None
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=self.bus.config.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    if poll is None:
+                        continue
+                    message = await poll()
+                    if message is None or not _advanced(last, message):
+                        continue
+                await websocket.send_json(message)
+                last = message
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # 이미 닫힌 연결
+        finally:
+            self.bus.unsubscribe(test_run_id, queue)
+
+
+def _advanced(last: dict | None, polled: dict) -> bool:
+    """DB에서 읽은 진행률이 마지막 전송보다 새로운지
+
+    in-process 실행은 버스 알림(CLI 보고 포함)이 DB 저장보다 앞설 수 있으므로
+    상태가 같으면 current가 늘었을 때만 보냄 (진행률이 뒤로 가지 않게)
+    """
+    if last is None or polled["status"] != last["status"]:
+        return True
+    return polled["current"] > last["current"]
 
 
 manager = ConnectionManager()
@@ -37,12 +106,40 @@ manager = ConnectionManager()
 
 @router.websocket("/ws/tests/{test_run_id}/progress")
 async def test_progress(websocket: WebSocket, test_run_id: str):
-    """테스트 실행 진행률 스트리밍"""
-    await manager.connect(websocket, test_run_id)
+    """테스트 실행 진행률 스트리밍
+
+    연결 직후 현재 상태를 한 번 보내고, 이후 실행 중 진행률을
+    초당 최대 progress_bus.max_rate회 전달합니다 (configs/models.yaml).
+    워커 등 다른 프로세스에서 실행 중이면 progress_bus.poll_interval마다
+    DB의 진행률을 확인해 바뀌었을 때 전달합니다.
+
+    메시지 예시:
+    ```json
+    {"type": "progress", "test_run_id": "run_1", "current": 120, "total": 400,
+     "progress": 30, "status": "running"}
+    ```
+    """
+    test_service = TestService(await get_database())
+
+    async def current_progress() -> dict | None:
+        test_run = await test_service.get_test_run(test_run_id)
+        if not test_run:
+            return None
+        return progress_message(
+            test_run_id,
+            test_run["completed_cases"],
+            test_run["total_cases"],
+            test_run["status"],
+        )
+
+    # 현재 상태 (실행 도중 접속한 경우)
+    initial = await current_progress()
+
+    await manager.connect(websocket, test_run_id, initial, poll=current_progress)
+
     try:
         while True:
-            # 클라이언트로부터 메시지 수신 대기
-            data = await websocket.receive_text()
-            # 필요시 처리
+            # 클라이언트로부터 메시지 수신 대기 (연결 종료 감지)
+            await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(websocket, test_run_id)
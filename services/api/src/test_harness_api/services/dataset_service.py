@@ -4,6 +4,7 @@ import csv
 import io
 import json
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
 
@@ -11,10 +12,35 @@ from shared.core.models import DatasetType, SourceType
 from shared.core.mapping import MappingResolver
 from shared.database.database import Database
 
+from .pagination import decode_cursor, keyset_page
+
+
+class ImportAbortedError(ValueError):
+    """Import 도중 입력을 더 읽을 수 없어 (디코딩/CSV 파싱 실패) 전체를 롤백함"""
+
+    def __init__(self, message: str, result: dict):
+        """
+        Args:
+            message: 실패 원인
+            result: 롤백 시점까지의 처리 현황 (imported는 항상 0)
+        """
+        super().__init__(message)
+        self.result = result
+
 
 class DatasetService:
     """데이터셋 CRUD 및 Import"""
 
+    INSERT_CASE_SQL = """
+        INSERT INTO test_cases
+        (id, dataset_id, raw_input, expected_output, assertions, metadata,
+         is_edge_case, is_error_pattern, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # Import 시 한 번에 INSERT 하는 케이스 수
+    IMPORT_BATCH_SIZE = 1000
+
     def __init__(self, db: Database):
         self.db = db
 
@@ -198,27 +224,18 @@ class DatasetService:
         is_error_pattern: bool = False,
     ) -> dict:
         """테스트 케이스 추가"""
-        case_id = f"case_{uuid.uuid4().hex[:8]}"
-        now = self.db.now_iso()
-
-        await self.db.execute(
-            """
-            INSERT INTO test_cases
-            (id, dataset_id, raw_input, expected_output, assertions, metadata, is_edge_case, is_error_pattern, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                case_id,
-                dataset_id,
-                self.db.serialize_json(raw_input),
-                expected_output,
-                self.db.serialize_json(assertions) if assertions else None,
-                self.db.serialize_json(metadata) if metadata else None,
-                1 if is_edge_case else 0,
-                1 if is_error_pattern else 0,
-                now,
-            ),
+        params = self._case_params(
+            dataset_id=dataset_id,
+            raw_input=raw_input,
+            expected_output=expected_output,
+            assertions=assertions,
+            metadata=metadata,
+            is_edge_case=is_edge_case,
+            is_error_pattern=is_error_pattern,
         )
+        case_id = params[0]
+
+        await self.db.execute(self.INSERT_CASE_SQL, params)
 
         # case_count 업데이트
         await self._update_case_count(dataset_id)
@@ -253,23 +270,47 @@ class DatasetService:
         dataset_id: str,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
+        include_total: bool = False,
     ) -> dict:
-        """데이터셋의 테스트 케이스 목록"""
-        count_row = await self.db.fetchone(
-            "SELECT COUNT(*) as cnt FROM test_cases WHERE dataset_id = ?",
-            (dataset_id,)
-        )
-        total = count_row["cnt"] if count_row else 0
+        """데이터셋의 테스트 케이스 목록
 
-        rows = await self.db.fetchall(
-            """
-            SELECT * FROM test_cases
-            WHERE dataset_id = ?
-            ORDER BY created_at
-            LIMIT ? OFFSET ?
-            """,
-            (dataset_id, limit, offset)
-        )
+        cursor가 있으면 (created_at, id) keyset으로 이어서 조회하고 offset은 무시한다.
+        COUNT(*)는 include_total=True일 때만 실행 (아니면 total은 None).
+
+        Raises:
+            ValueError: 형식이 잘못된 cursor
+        """
+        total = None
+        if include_total:
+            count_row = await self.db.fetchone(
+                "SELECT COUNT(*) as cnt FROM test_cases WHERE dataset_id = ?",
+                (dataset_id,)
+            )
+            total = count_row["cnt"] if count_row else 0
+
+        if cursor:
+            after = decode_cursor(cursor, ("created_at", "id"))
+            rows = await self.db.fetchall(
+                """
+                SELECT * FROM test_cases
+                WHERE dataset_id = ? AND (created_at, id) > (?, ?)
+                ORDER BY created_at, id
+                LIMIT ?
+                """,
+                (dataset_id, after["created_at"], after["id"], limit + 1)
+            )
+        else:
+            rows = await self.db.fetchall(
+                """
+                SELECT * FROM test_cases
+                WHERE dataset_id = ?
+                ORDER BY created_at, id
+                LIMIT ? OFFSET ?
+                """,
+                (dataset_id, limit + 1, offset)
+            )
+        rows, next_cursor = keyset_page(rows, limit)
 
         cases = []
         for row in rows:
@@ -288,8 +329,27 @@ class DatasetService:
             "total": total,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
         }
 
+    async def iter_cases(
+        self,
+        dataset_id: str,
+        chunk_size: int = 500,
+    ) -> AsyncIterator[dict]:
+        """데이터셋의 전체 테스트 케이스를 chunk_size개씩 keyset으로 읽어 하나씩 yield
+
+        개수 제한 없이 전체를 순회하면서도 한 번에 chunk_size개만 메모리에 올린다.
+        """
+        cursor = None
+        while True:
+            page = await self.list_cases(dataset_id, limit=chunk_size, cursor=cursor)
+            for case in page["cases"]:
+                yield case
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
     async def delete_case(self, case_id: str) -> bool:
         """테스트 케이스 삭제"""
         case = await self.get_case(case_id)
@@ -312,166 +372,216 @@ class DatasetService:
         column_mapping: dict[str, str] | None = None,
         expected_output_column: str = "expected_output",
         metadata_prefix: str = "_",
+        batch_size: int | None = None,
     ) -> dict:
         """CSV 파일 내용을 테스트 케이스로 임포트
 
+        케이스는 batch_size 단위 executemany로 배치마다 커밋하고, 모두 저장한 뒤
+        한 번에 데이터셋에 반영한다 (중간에 실패하면 저장한 케이스도 삭제).
+
         Args:
             dataset_id: 대상 데이터셋 ID
             csv_content: CSV 파일 내용 (문자열)
             column_mapping: 컬럼 매핑 (선택, 지정하면 데이터셋에 저장)
             expected_output_column: 기대 출력 컬럼명
             metadata_prefix: 메타데이터 컬럼 접두사 (기본: _)
+            batch_size: INSERT 배치 크기 (기본: IMPORT_BATCH_SIZE)
 
         Returns:
             임포트 결과 (추가된 케이스 수 등)
         """
-        dataset = await self.get_dataset(dataset_id)
-        if not dataset:
-            raise ValueError(f"Dataset not found: {dataset_id}")
+        async def single_chunk():
+            yield csv_content
+
+        return await self.import_csv_stream(
+            dataset_id=dataset_id,
+            chunks=single_chunk(),
+            column_mapping=column_mapping,
+            expected_output_column=expected_output_column,
+            metadata_prefix=metadata_prefix,
+            batch_size=batch_size,
+        )
 
-        # CSV 파싱
-        reader = csv.DictReader(io.StringIO(csv_content))
-        rows = list(reader)
+    async def import_csv_stream(
+        self,
+        dataset_id: str,
+        chunks: AsyncIterator[str],
+        column_mapping: dict[str, str] | None = None,
+        expected_output_column: str = "expected_output",
+        metadata_prefix: str = "_",
+        batch_size: int | None = None,
+    ) -> dict:
+        """CSV 텍스트 청크 스트림을 테스트 케이스로 임포트
 
-        if not rows:
-            return {"imported": 0, "errors": [], "message": "No data in CSV"}
+        완성된 레코드 단위로 파싱하여 바로 배치 INSERT 하므로
+        파일 전체를 메모리에 올리지 않는다. 업로드를 기다리는 동안 쓰기 잠금을 잡지 않도록
+        배치마다 커밋하고, 끝까지 읽은 뒤 한 번에 데이터셋에 반영한다 (_CaseBatchImporter).
 
-        # 매핑 설정 저장
-        if column_mapping:
-            await self.db.execute(
-                """
-                UPDATE test_datasets
-                SET column_mapping = ?, source_type = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (
-                    self.db.serialize_json(column_mapping),
-                    SourceType.CSV.value,
-                    self.db.now_iso(),
-                    dataset_id,
-                ),
-            )
+        Args:
+            dataset_id: 대상 데이터셋 ID
+            chunks: 디코딩된 CSV 텍스트 청크 (임의 위치에서 잘려도 됨)
+            column_mapping: 컬럼 매핑 (선택, 지정하면 데이터셋에 저장)
+            expected_output_column: 기대 출력 컬럼명
+            metadata_prefix: 메타데이터 컬럼 접두사 (기본: _)
+            batch_size: INSERT 배치 크기 (기본: IMPORT_BATCH_SIZE)
 
-        imported = 0
-        errors = []
+        Returns:
+            임포트 결과 (추가된 케이스 수 등)
+
+        Raises:
+            ImportAbortedError: 디코딩/CSV 파싱 실패 (그때까지 INSERT한 케이스도 롤백)
+        """
+        dataset = await self.get_dataset(dataset_id)
+        if not dataset:
+            raise ValueError(f"Dataset not found: {dataset_id}")
+
+        async with _CaseBatchImporter(self, dataset_id, batch_size) as importer:
+            total_rows = 0
 
-        for i, row in enumerate(rows):
             try:
-                # raw_input 구성 (expected_output과 metadata 제외)
-                raw_input = {}
-                metadata = {}
-                expected_output = None
-
-                for key, value in row.items():
-                    if key == expected_output_column:
-                        expected_output = value
-                    elif key.startswith(metadata_prefix):
-                        # 메타데이터 (접두사 제거)
-                        meta_key = key[len(metadata_prefix):]
-                        metadata[meta_key] = value
-                    else:
-                        raw_input[key] = value
-
-                # 특수 메타데이터 플래그 처리
-                is_edge_case = metadata.pop("is_edge_case", "").lower() in ("true", "1", "yes")
-                is_error_pattern = metadata.pop("is_error_pattern", "").lower() in ("true", "1", "yes")
-
-                # 케이스 추가
-                await self.add_case(
-                    dataset_id=dataset_id,
-                    raw_input=raw_input,
-                    expected_output=expected_output,
-                    metadata=metadata if metadata else None,
-                    is_edge_case=is_edge_case,
-                    is_error_pattern=is_error_pattern,
-                )
-                imported += 1
-
-            except Exception as e:
-                errors.append({"row": i + 2, "error": str(e)})
+                async for i, row in _aenumerate(_iter_csv_rows(chunks)):
+                    total_rows += 1
+                    try:
+                        params = self._csv_row_to_params(
+                            importer.staging_id, row, expected_output_column, metadata_prefix
+                        )
+                    except Exception as e:
+                        importer.errors.append({"row": i + 2, "error": str(e)})
+                        continue
+                    await importer.add({"row": i + 2}, params)
+            except (UnicodeDecodeError, csv.Error) as e:
+                raise importer.aborted(e, total_rows=total_rows) from e
+
+            if total_rows == 0:
+                return {"imported": 0, "errors": [], "message": "No data in CSV"}
+
+            # 매핑 설정 저장 (데이터가 있을 때만)
+            await importer.finish(column_mapping, SourceType.CSV)
 
         return {
-            "imported": imported,
-            "errors": errors,
-            "total_rows": len(rows),
-            "message": f"Imported {imported}/{len(rows)} cases",
+            "imported": importer.imported,
+            "errors": importer.errors,
+            "total_rows": total_rows,
+            "message": f"Imported {importer.imported}/{total_rows} cases",
         }
 
+    # =========================================================================
+    # JSON / JSONL Import
+    # =========================================================================
+
     async def import_json(
         self,
         dataset_id: str,
         json_data: list[dict],
         column_mapping: dict[str, str] | None = None,
+        batch_size: int | None = None,
     ) -> dict:
-        """JSON 배열을 테스트 케이스로 임포트"""
+        """JSON 배열을 테스트 케이스로 임포트 (배치 INSERT, 끝나면 한 번에 반영)"""
         dataset = await self.get_dataset(dataset_id)
         if not dataset:
             raise ValueError(f"Dataset not found: {dataset_id}")
 
-        if column_mapping:
-            await self.db.execute(
-                """
-                UPDATE test_datasets
-                SET column_mapping = ?, source_type = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (
-                    self.db.serialize_json(column_mapping),
-                    SourceType.JSON.value,
-                    self.db.now_iso(),
-                    dataset_id,
-                ),
-            )
+        async with _CaseBatchImporter(self, dataset_id, batch_size) as importer:
+            for i, item in enumerate(json_data):
+                try:
+                    params = self._json_item_to_params(importer.staging_id, item)
+                except Exception as e:
+                    importer.errors.append({"index": i, "error": str(e)})
+                    continue
+                await importer.add({"index": i}, params)
+
+            await importer.finish(column_mapping, SourceType.JSON)
+
+        return {
+            "imported": importer.imported,
+            "errors": importer.errors,
+            "total_items": len(json_data),
+            "message": f"Imported {importer.imported}/{len(json_data)} cases",
+        }
 
-        imported = 0
-        errors = []
+    async def import_jsonl_stream(
+        self,
+        dataset_id: str,
+        chunks: AsyncIterator[str],
+        column_mapping: dict[str, str] | None = None,
+        batch_size: int | None = None,
+    ) -> dict:
+        """JSONL(줄 단위 JSON) 텍스트 청크 스트림을 테스트 케이스로 임포트
+
+        각 줄은 import_json의 항목과 같은 형식.
+        빈 줄은 건너뛰고, 에러는 1부터 시작하는 줄 번호로 보고한다.
+        배치마다 커밋하고, 끝까지 읽은 뒤 한 번에 데이터셋에 반영한다 (_CaseBatchImporter).
+
+        Raises:
+            ImportAbortedError: 디코딩 실패 (그때까지 INSERT한 케이스도 롤백)
+        """
+        dataset = await self.get_dataset(dataset_id)
+        if not dataset:
+            raise ValueError(f"Dataset not found: {dataset_id}")
+
+        async with _CaseBatchImporter(self, dataset_id, batch_size) as importer:
+            total_items = 0
 
-        for i, item in enumerate(json_data):
             try:
-                raw_input = item.get("input", item.get("raw_input", {}))
-                expected_output = item.get("expected_output", item.get("expected"))
-                metadata = item.get("metadata")
-                is_edge_case = item.get("is_edge_case", False)
-                is_error_pattern = item.get("is_error_pattern", False)
-
-                # input이 dict가 아니면 변환
-                if not isinstance(raw_input, dict):
-                    raw_input = {"input": raw_input}
-
-                await self.add_case(
-                    dataset_id=dataset_id,
-                    raw_input=raw_input,
-                    expected_output=expected_output,
-                    metadata=metadata,
-                    is_edge_case=is_edge_case,
-                    is_error_pattern=is_error_pattern,
-                )
-                imported += 1
-
-            except Exception as e:
-                errors.append({"index": i, "error": str(e)})
+                async for i, line in _aenumerate(_iter_lines(chunks)):
+                    line = line.rstrip("\r\n")
+                    if not line.strip():
+                        continue
+
+                    total_items += 1
+                    try:
+                        params = self._json_item_to_params(importer.staging_id, json.loads(line))
+                    except Exception as e:
+                        importer.errors.append({"line": i + 1, "error": str(e)})
+                        continue
+                    await importer.add({"line": i + 1}, params)
+            except UnicodeDecodeError as e:
+                raise importer.aborted(e, total_items=total_items) from e
+
+            await importer.finish(column_mapping, SourceType.JSON)
 
         return {
-            "imported": imported,
-            "errors": errors,
-            "total_items": len(json_data),
-            "message": f"Imported {imported}/{len(json_data)} cases",
+            "imported": importer.imported,
+            "errors": importer.errors,
+            "total_items": total_items,
+            "message": f"Imported {importer.imported}/{total_items} cases",
         }
 
+    async def _save_import_mapping(
+        self,
+        dataset_id: str,
+        column_mapping: dict[str, str],
+        source_type: SourceType,
+    ) -> None:
+        """Import 시 지정한 매핑/소스 타입 저장 (커밋하지 않음)"""
+        await self.db.execute(
+            """
+            UPDATE test_datasets
+            SET column_mapping = ?, source_type = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (
+                self.db.serialize_json(column_mapping),
+                source_type.value,
+                self.db.now_iso(),
+                dataset_id,
+            ),
+        )
+
     # =========================================================================
     # Export
     # =========================================================================
 
     async def export_csv(self, dataset_id: str) -> str:
         """데이터셋을 CSV로 내보내기"""
-        cases = await self.list_cases(dataset_id, limit=10000)
+        cases = [case async for case in self.iter_cases(dataset_id)]
 
-        if not cases["cases"]:
+        if not cases:
             return ""
 
         # 모든 컬럼 수집
         all_columns = set()
-        for case in cases["cases"]:
+        for case in cases:
             all_columns.update(case["raw_input"].keys())
 
         columns = sorted(all_columns) + ["expected_output", "_is_edge_case", "_is_error_pattern"]
@@ -480,7 +590,7 @@ class DatasetService:
         writer = csv.DictWriter(output, fieldnames=columns)
         writer.writeheader()
 
-        for case in cases["cases"]:
+        for case in cases:
             row = {**case["raw_input"]}
             row["expected_output"] = case.get("expected_output", "")
             row["_is_edge_case"] = "true" if case.get("is_edge_case") else "false"
@@ -491,8 +601,7 @@ class DatasetService:
 
     async def export_json(self, dataset_id: str) -> list[dict]:
         """데이터셋을 JSON으로 내보내기"""
-        cases = await self.list_cases(dataset_id, limit=10000)
-        return cases["cases"]
+        return [case async for case in self.iter_cases(dataset_id)]
 
     # =========================================================================
     # 헬퍼
@@ -518,6 +627,86 @@ class DatasetService:
             "updated_at": row["updated_at"],
         }
 
+    def _case_params(
+        self,
+        dataset_id: str,
+        raw_input: dict[str, Any],
+        expected_output: str | None = None,
+        assertions: list[dict] | None = None,
+        metadata: dict | None = None,
+        is_edge_case: bool = False,
+        is_error_pattern: bool = False,
+    ) -> tuple:
+        """INSERT_CASE_SQL 파라미터 생성 (첫 번째 값이 case_id)"""
+        return (
+            f"case_{uuid.uuid4().hex[:16]}",
+            dataset_id,
+            self.db.serialize_json(raw_input),
+            expected_output,
+            self.db.serialize_json(assertions) if assertions else None,
+            self.db.serialize_json(metadata) if metadata else None,
+            1 if is_edge_case else 0,
+            1 if is_error_pattern else 0,
+            self.db.now_iso(),
+        )
+
+    def _csv_row_to_params(
+        self,
+        dataset_id: str,
+        row: dict[str, str],
+        expected_output_column: str,
+        metadata_prefix: str,
+    ) -> tuple:
+        """CSV 행 → INSERT 파라미터"""
+        # raw_input 구성 (expected_output과 metadata 제외)
+        raw_input = {}
+        metadata = {}
+        expected_output = None
+
+        for key, value in row.items():
+            if key == expected_output_column:
+                expected_output = value
+            elif key.startswith(metadata_prefix):
+                # 메타데이터 (접두사 제거)
+                meta_key = key[len(metadata_prefix):]
+                metadata[meta_key] = value
+            else:
+                raw_input[key] = value
+
+        # 특수 메타데이터 플래그 처리
+        is_edge_case = metadata.pop("is_edge_case", "").lower() in ("true", "1", "yes")
+        is_error_pattern = metadata.pop("is_error_pattern", "").lower() in ("true", "1", "yes")
+
+        return self._case_params(
+            dataset_id=dataset_id,
+            raw_input=raw_input,
+            expected_output=expected_output,
+            metadata=metadata if metadata else None,
+            is_edge_case=is_edge_case,
+            is_error_pattern=is_error_pattern,
+        )
+
+    def _json_item_to_params(self, dataset_id: str, item: dict) -> tuple:
+        """JSON 항목 → INSERT 파라미터"""
+        raw_input = item.get("input", item.get("raw_input", {}))
+        expected_output = item.get("expected_output", item.get("expected"))
+        metadata = item.get("metadata")
+        is_edge_case = item.get("is_edge_case", False)
+        is_error_pattern = item.get("is_error_pattern", False)
+
+        # input이 dict가 아니면 변환
+        if not isinstance(raw_input, dict):
+            raw_input = {"input": raw_input}
+
+        return self._case_params(
+            dataset_id=dataset_id,
+            raw_input=raw_input,
+            expected_output=expected_output,
+            metadata=metadata,
+            is_edge_case=is_edge_case,
+            is_error_pattern=is_error_pattern,
+        )
+
     async def _update_case_count(self, dataset_id: str):
         """케이스 수 업데이트"""
         count_row = await self.db.fetchone(
@@ -530,3 +719,190 @@ class DatasetService:
             "UPDATE test_datasets SET case_count = ?, updated_at = ? WHERE id = ?",
             (count, self.db.now_iso(), dataset_id)
         )
+
+
+class _CaseBatchImporter:
+    """Import용 케이스 배치 INSERT (스테이징 후 교체)
+
+    업로드를 읽는 동안 쓰기 잠금을 잡고 있지 않도록 배치마다 별도 트랜잭션으로 커밋한다
+    (잠금을 오래 잡으면 결과 flush, 작업 heartbeat 등 다른 쓰기가 모두 멈춤).
+    케이스는 스테이징 dataset_id로 저장했다가 finish()에서 한 트랜잭션으로 대상 데이터셋에
+    옮기므로, 중간에 실패해도 대상 데이터셋에는 일부 케이스가 보이지 않는다.
+    - batch_size 단위로 executemany
+    - 배치 INSERT 실패 시 SAVEPOINT로 되돌린 뒤 행 단위로 재시도해 행별 에러 기록
+    - finish() 없이 async with를 벗어나면 (실패, 취소) 스테이징 케이스 삭제
+
+    사용 예:
+        async with _CaseBatchImporter(service, dataset_id) as importer:
+            params = service._json_item_to_params(importer.staging_id, item)
+            await importer.add({"index": 0}, params)
+            await importer.finish()
+    """
+
+    def __init__(self, service: DatasetService, dataset_id: str, batch_size: int | None = None):
+        self.service = service
+        self.db = service.db
+        self.dataset_id = dataset_id
+        self.batch_size = max(1, batch_size or service.IMPORT_BATCH_SIZE)
+        # 스테이징 케이스의 dataset_id (test_datasets 행 없음 → 어떤 조회에도 나타나지 않음)
+        self.staging_id = f"staging_{uuid.uuid4().hex[:12]}"
+
+        self._batch: list[tuple[dict, tuple]] = []
+        self._finished = False
+        self.imported = 0
+        self.errors: list[dict] = []
+
+    async def __aenter__(self) -> "_CaseBatchImporter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if not self._finished:
+            await self.discard()
+
+    async def add(self, position: dict, params: tuple) -> None:
+        """케이스 1건 추가 (position: 에러 보고용 {"row": n} 또는 {"index": n})"""
+        self._batch.append((position, params))
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """현재 배치를 스테이징에 INSERT + 커밋"""
+        if not self._batch:
+            return
+
+        batch, self._batch = self._batch, []
+        sql = self.service.INSERT_CASE_SQL
+
+        async with self.db.transaction() as tx:
+            await tx.execute("SAVEPOINT case_batch")
+            try:
+                await tx.executemany(sql, [params for _, params in batch])
+                self.imported += len(batch)
+            except Exception:
+                # 배치 전체를 되돌리고 행 단위로 재시도
+                await tx.execute("ROLLBACK TO case_batch")
+                for position, params in batch:
+                    try:
+                        await tx.execute(sql, params)
+                        self.imported += 1
+                    except Exception as e:
+                        self.errors.append({**position, "error": str(e)})
+            finally:
+                await tx.execute("RELEASE case_batch")
+
+    def aborted(self, error: Exception, **counts: int) -> ImportAbortedError:
+        """입력 읽기 실패 → 롤백될 Import의 처리 현황을 담은 예외"""
+        return ImportAbortedError(
+            f"Import aborted and rolled back: {error}",
+            {
+                "imported": 0,
+                "rolled_back": True,
+                **counts,
+                "errors": self.errors,
+            },
+        )
+
+    async def finish(
+        self,
+        column_mapping: dict[str, str] | None = None,
+        source_type: SourceType | None = None,
+    ) -> None:
+        """남은 배치 INSERT 후 한 트랜잭션으로 스테이징 → 대상 데이터셋 이동
+
+        Args:
+            column_mapping: 지정하면 데이터셋에 매핑/소스 타입 저장
+            source_type: 매핑과 함께 저장할 소스 타입
+        """
+        await self.flush()
+        self.errors.sort(key=lambda e: e.get("row", e.get("index", e.get("line", 0))))
+
+        async with self.db.transaction() as tx:
+            service = DatasetService(tx)
+            if column_mapping and source_type:
+                await service._save_import_mapping(self.dataset_id, column_mapping, source_type)
+            await tx.execute(
+                "UPDATE test_cases SET dataset_id = ? WHERE dataset_id = ?",
+                (self.dataset_id, self.staging_id),
+            )
+            await service._update_case_count(self.dataset_id)
+        self._finished = True
+
+    async def discard(self) -> None:
+        """스테이징 케이스 삭제 (Import 실패/취소)"""
+        self._batch = []
+        if self.imported == 0:
+            return
+        async with self.db.transaction() as tx:
+            await tx.execute("DELETE FROM test_cases WHERE dataset_id = ?", (self.staging_id,))
+
+
+# =============================================================================
+# 스트리밍 파싱 헬퍼
+# =============================================================================
+
+async def _aenumerate(items: AsyncIterator) -> AsyncIterator[tuple[int, Any]]:
+    """enumerate의 async 버전"""
+    i = 0
+    async for item in items:
+        yield i, item
+        i += 1
+
+
+async def _iter_lines(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """텍스트 청크 스트림을 \n 기준으로 분리 (\n 포함, \r\n의 \r도 그대로)
+
+    str.splitlines()는 U+2028, \x85 등도 줄바꿈으로 보므로 쓰지 않는다
+    (JSON 문자열이나 CSV 필드 안의 해당 문자가 레코드를 나누면 안 됨).
+    """
+    pending = ""
+    async for chunk in chunks:
+        pending += chunk
+        start = 0
+        while (end := pending.find("\n", start)) != -1:
+            yield pending[start:end + 1]
+            start = end + 1
+        # 마지막 줄은 다음 청크와 이어질 수 있음
+        pending = pending[start:]
+    if pending:
+        yield pending
+
+
+async def _iter_csv_rows(
+    chunks: AsyncIterator[str],
+    batch_lines: int = 1000,
+) -> AsyncIterator[dict[str, str]]:
+    """CSV 텍스트 청크 스트림을 csv.DictReader와 같은 dict 행으로 파싱
+
+    따옴표 개수가 짝수가 되는 줄 경계(= 레코드 경계)까지 모아
+    완성된 레코드만 batch_lines 줄 단위로 파싱하므로 따옴표 안의 줄바꿈도 처리된다.
+    """
+    fieldnames: list[str] | None = None
+    ready: list[str] = []       # 완성된 레코드의 줄
+    pending: list[str] = []     # 따옴표가 열린 미완성 레코드의 줄
+    quote_count = 0
+
+    def parse(lines: list[str]) -> list[dict[str, str]]:
+        # 원문 텍스트 그대로 csv 모듈에 넘김 (따옴표/줄바꿈 처리는 기존 import_csv와 동일)
+        nonlocal fieldnames
+        reader = csv.DictReader(io.StringIO("".join(lines)), fieldnames=fieldnames)
+        rows = list(reader)
+        fieldnames = reader.fieldnames
+        return rows
+
+    async for line in _iter_lines(chunks):
+        pending.append(line)
+        quote_count += line.count('"')
+        if quote_count % 2:
+            continue  # 따옴표 안의 줄바꿈 → 레코드 미완성
+
+        ready.extend(pending)
+        pending, quote_count = [], 0
+        if len(ready) >= batch_lines:
+            for row in parse(ready):
+                yield row
+            ready = []
+
+    ready.extend(pending)
+    if ready:
+        for row in parse(ready):
+            yield row
@@ -0,0 +1,459 @@
+"""평가 요약 서비스 (SQL 집계 + 요약 캐시)"""
+
+from shared.core.models import EvaluationSummary
+from shared.database.database import Database
+
+from .pagination import decode_cursor, encode_cursor
+
+
+class EvaluationService:
+    """테스트 결과 평가 요약
+
+    집계는 test_results에 대한 SQL(GROUP BY + 윈도 함수)로 계산하고,
+    결과는 evaluation_summaries 테이블에 저장해 두었다가 그대로 반환한다.
+    새 결과가 저장되면 TestService가 invalidate()로 캐시를 지운다.
+    캐시에는 계산 시점의 test_runs.completed_cases를 함께 저장하고, 조회 시 값이 다르면
+    다시 계산한다 (계산 중에 invalidate가 끼어들어도 오래된 요약을 반환하지 않음).
+    """
+
+    # (prompt, model) 셀 그룹별 카운트/합계 → 전체/프롬프트별/모델별로 합산
+    # (latency는 실제 호출한 셀만, 캐시 응답 셀은 지연 0이라 평균/최소값을 왜곡하므로 제외)
+    CELL_STATS_SQL = """
+        SELECT
+            prompt_id,
+            model_id,
+            COUNT(*) AS total_tests,
+            SUM(passed) AS passed_tests,
+            SUM(CASE WHEN error IS NOT NULL THEN 1 ELSE 0 END) AS error_tests,
+            SUM(CASE WHEN cached = 0 THEN latency_ms END) AS latency_sum,
+            COUNT(CASE WHEN cached = 0 THEN 1 END) AS latency_count,
+            MIN(CASE WHEN cached = 0 THEN latency_ms END) AS min_latency_ms,
+            MAX(CASE WHEN cached = 0 THEN latency_ms END) AS max_latency_ms,
+            SUM(input_tokens) AS input_tokens,
+            SUM(output_tokens) AS output_tokens
+        FROM test_results
+        WHERE test_run_id = ?
+        GROUP BY prompt_id, model_id
+    """
+
+    # 그룹별 latency 백분위수 (nearest-rank, 캐시 응답 제외,
+    # idx_test_results_live_latency 부분 인덱스만 읽음)
+    PERCENTILE_SQL = """
+        WITH ranked AS (
+            SELECT
+                {group} AS grp, latency_ms,
+                ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY latency_ms) AS rn,
+                COUNT(*) OVER (PARTITION BY {group}) AS n
+            FROM test_results
+            WHERE test_run_id = ? AND cached = 0
+        )
+        SELECT
+            grp,
+            MIN(CASE WHEN rn >= 0.50 * n THEN latency_ms END) AS p50_latency_ms,
+            MIN(CASE WHEN rn >= 0.95 * n THEN latency_ms END) AS p95_latency_ms
+        FROM ranked
+        GROUP BY grp
+    """
+
+    # compare 케이스 필터 (idx_test_results_case_model 커버링 인덱스로 GROUP BY)
+    COMPARE_FILTERS = {
+        "all": "",
+        "disagree": "HAVING MIN(passed) != MAX(passed)",  # 셀 간 통과 여부가 다른 케이스
+        "failed": "HAVING MIN(passed) = 0",               # 하나라도 실패한 케이스
+    }
+
+    # 두 실행의 (case, model)별 결과 비교 (프롬프트가 여러 개면 모두 통과해야 통과,
+    # latency는 캐시 응답을 뺀 평균 → 한쪽이 모두 캐시 응답이면 latency 회귀로 보지 않음)
+    DIFF_SQL = """
+        WITH base AS (
+            SELECT test_case_id, model_id,
+                   MIN(passed) AS passed,
+                   AVG(CASE WHEN cached = 0 THEN latency_ms END) AS latency_ms
+            FROM test_results
+            WHERE test_run_id = ? {base_prompt}
+            GROUP BY test_case_id, model_id
+        ),
+        head AS (
+            SELECT test_case_id, model_id,
+                   MIN(passed) AS passed,
+                   AVG(CASE WHEN cached = 0 THEN latency_ms END) AS latency_ms
+            FROM test_results
+            WHERE test_run_id = ? {head_prompt}
+            GROUP BY test_case_id, model_id
+        ),
+        diff AS (
+            SELECT
+                b.test_case_id, b.model_id,
+                b.passed AS base_passed, h.passed AS head_passed,
+                b.latency_ms AS base_latency_ms, h.latency_ms AS head_latency_ms,
+                CASE
+                    WHEN b.passed = 1 AND h.passed = 0 THEN 'newly_failing'
+                    WHEN b.passed = 0 AND h.passed = 1 THEN 'newly_passing'
+                    WHEN h.latency_ms > b.latency_ms * (1 + ?)
+                         AND h.latency_ms - b.latency_ms >= ? THEN 'latency_regressed'
+                    ELSE 'unchanged'
+                END AS change
+            FROM base b
+            JOIN head h ON h.test_case_id = b.test_case_id AND h.model_id = b.model_id
+        ),
+        ranked AS (
+            SELECT
+                diff.*,
+                ROW_NUMBER() OVER (
+                    PARTITION BY change
+                    ORDER BY head_latency_ms - base_latency_ms DESC, test_case_id, model_id
+                ) AS rn,
+                COUNT(*) OVER (PARTITION BY change) AS n
+            FROM diff
+        )
+        SELECT * FROM ranked WHERE rn <= ? ORDER BY change, rn
+    """
+
+    DIFF_CHANGES = ("newly_failing", "newly_passing", "latency_regressed")
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def get_summary(self, test_run_id: str, refresh: bool = False) -> dict | None:
+        """평가 요약 조회 (캐시 우선)
+
+        Args:
+            test_run_id: 테스트 실행 ID
+            refresh: True면 캐시를 무시하고 다시 계산
+
+        Returns:
+            EvaluationSummary 형식 dict (+ cached), 테스트 실행이 없으면 None
+        """
+        run = await self.db.fetchone(
+            "SELECT completed_cases FROM test_runs WHERE id = ?",
+            (test_run_id,)
+        )
+        if not run:
+            return None
+        result_count = run["completed_cases"]
+
+        if not refresh:
+            # 결과 수가 달라졌으면 (invalidate와 캐시 저장이 엇갈린 경우 포함) 다시 계산
+            row = await self.db.fetchone(
+                """
+                SELECT summary FROM evaluation_summaries
+                WHERE test_run_id = ? AND result_count = ?
+                """,
+                (test_run_id, result_count)
+            )
+            if row:
+                return {**self.db.deserialize_json(row["summary"]), "cached": True}
+
+        summary = await self.compute_summary(test_run_id)
+        # 계산하는 동안 새 결과가 저장됐으면 (completed_cases 변경) 저장하지 않음
+        # → invalidate 이후에 오래된 요약이 캐시에 남지 않음
+        await self.db.execute(
+            """
+            INSERT OR REPLACE INTO evaluation_summaries
+            (test_run_id, summary, result_count, computed_at)
+            SELECT ?, ?, ?, ?
+            WHERE (SELECT completed_cases FROM test_runs WHERE id = ?) = ?
+            """,
+            (
+                test_run_id,
+                self.db.serialize_json(summary),
+                result_count,
+                self.db.now_iso(),
+                test_run_id,
+                result_count,
+            )
+        )
+        await self.db.commit()
+
+        return {**summary, "cached": False}
+
+    async def compute_summary(self, test_run_id: str) -> dict:
+        """SQL 집계로 요약 계산 (캐시 저장 안 함)"""
+        cells = await self.db.fetchall(self.CELL_STATS_SQL, (test_run_id,))
+
+        totals: dict = {}
+        by_prompt: dict[str, dict] = {}
+        by_model: dict[str, dict] = {}
+        for row in cells:
+            self._accumulate(totals, row)
+            self._accumulate(by_prompt.setdefault(row["prompt_id"], {}), row)
+            self._accumulate(by_model.setdefault(row["model_id"], {}), row)
+
+        await self._add_percentiles(test_run_id, "'all'", {"all": totals})
+        await self._add_percentiles(test_run_id, "prompt_id", by_prompt)
+        await self._add_percentiles(test_run_id, "model_id", by_model)
+
+        totals = self._finalize(totals)
+        summary = EvaluationSummary(
+            test_run_id=test_run_id,
+            total_tests=totals["total_tests"],
+            passed_tests=totals["passed_tests"],
+            failed_tests=totals["failed_tests"],
+            error_tests=totals["error_tests"],
+            pass_rate=totals["pass_rate"],
+            avg_latency_ms=totals["avg_latency_ms"] or 0.0,
+            min_latency_ms=totals["min_latency_ms"],
+            max_latency_ms=totals["max_latency_ms"],
+            p50_latency_ms=totals["p50_latency_ms"],
+            p95_latency_ms=totals["p95_latency_ms"],
+            by_prompt={key: self._finalize(stats) for key, stats in by_prompt.items()},
+            by_model={key: self._finalize(stats) for key, stats in by_model.items()},
+        )
+        return summary.model_dump(mode="json")
+
+    async def compare(
+        self,
+        test_run_id: str,
+        limit: int = 50,
+        cursor: str | None = None,
+        case_filter: str = "all",
+    ) -> dict | None:
+        """케이스별 prompt × model 비교표 (keyset 페이지네이션)
+
+        test_case_id 순으로 limit개 케이스를 고르고 그 케이스의 결과만 조회하므로
+        실행 크기와 무관하게 페이지당 비용이 일정하다.
+
+        Args:
+            test_run_id: 테스트 실행 ID
+            limit: 페이지당 케이스 수
+            cursor: 이전 응답의 next_cursor
+            case_filter: all, disagree (셀 간 결과가 다른 케이스), failed
+
+        Returns:
+            {"columns": [...], "rows": [...], "next_cursor": ...}, 테스트 실행이 없으면 None
+
+        Raises:
+            ValueError: 잘못된 커서 또는 필터
+        """
+        if case_filter not in self.COMPARE_FILTERS:
+            raise ValueError(f"filter must be one of {list(self.COMPARE_FILTERS)}")
+        after = decode_cursor(cursor, ("case",))["case"] if cursor else ""
+
+        run = await self.db.fetchone(
+            "SELECT prompt_ids, model_ids FROM test_runs WHERE id = ?",
+            (test_run_id,)
+        )
+        if not run:
+            return None
+
+        columns = [
+            {
+                "key": self.cell_key(prompt_id, model_id),
+                "prompt_id": prompt_id,
+                "model_id": model_id,
+            }
+            for prompt_id in self.db.deserialize_json(run["prompt_ids"])
+            for model_id in self.db.deserialize_json(run["model_ids"])
+        ]
+
+        case_rows = await self.db.fetchall(
+            f"""
+            SELECT test_case_id
+            FROM test_results
+            WHERE test_run_id = ? AND test_case_id > ?
+            GROUP BY test_case_id
+            {self.COMPARE_FILTERS[case_filter]}
+            ORDER BY test_case_id
+            LIMIT ?
+            """,
+            (test_run_id, after, limit + 1)
+        )
+        case_ids = [row["test_case_id"] for row in case_rows[:limit]]
+        next_cursor = (
+            encode_cursor({"case": case_ids[-1]}) if len(case_rows) > limit else None
+        )
+
+        rows = {
+            case_id: {"test_case_id": case_id, "input": None, "expected_output": None, "cells": {}}
+            for case_id in case_ids
+        }
+        if case_ids:
+            placeholders = ", ".join("?" for _ in case_ids)
+            results = await self.db.fetchall(
+                f"""
+                SELECT id, test_case_id, prompt_id, prompt_version, model_id, input_mapped,
+                       output, passed, latency_ms, cached, error, assertion_results
+                FROM test_results
+                WHERE test_run_id = ? AND test_case_id IN ({placeholders})
+                ORDER BY created_at
+                """,
+                (test_run_id, *case_ids)
+            )
+            for result in results:
+                row = rows[result["test_case_id"]]
+                if row["input"] is None:
+                    row["input"] = self.db.deserialize_json(result["input_mapped"])
+                row["cells"][self.cell_key(result["prompt_id"], result["model_id"])] = {
+                    "result_id": result["id"],
+                    "prompt_version": result["prompt_version"],
+                    "output": result["output"],
+                    "passed": bool(result["passed"]),
+                    "latency_ms": result["latency_ms"],
+                    "cached": bool(result["cached"]),
+                    "error": result["error"],
+                    "assertion_results": self.db.deserialize_json(result["assertion_results"]),
+                }
+
+            cases = await self.db.fetchall(
+                f"SELECT id, expected_output FROM test_cases WHERE id IN ({placeholders})",
+                tuple(case_ids)
+            )
+            for case in cases:
+                rows[case["id"]]["expected_output"] = case["expected_output"]
+
+        return {
+            "test_run_id": test_run_id,
+            "columns": columns,
+            "rows": list(rows.values()),
+            "limit": limit,
+            "filter": case_filter,
+            "next_cursor": next_cursor,
+        }
+
+    async def diff_runs(
+        self,
+        base_run_id: str,
+        head_run_id: str,
+        limit: int = 100,
+        latency_threshold: float = 0.2,
+        min_latency_delta_ms: float = 100.0,
+        base_prompt_id: str | None = None,
+        head_prompt_id: str | None = None,
+    ) -> dict | None:
+        """두 실행 간 회귀 비교 (base → head)
+
+        (test_case_id, model_id)로 조인해 새로 실패/새로 통과/latency 회귀 케이스를
+        SQL 한 번으로 계산한다 (idx_test_results_case_model 커버링 인덱스 사용).
+
+        Args:
+            base_run_id: 기준 실행 (예: 이전 활성 버전)
+            head_run_id: 비교 실행 (예: 새 버전)
+            limit: 변경 유형별 반환할 최대 케이스 수 (개수는 전체)
+            latency_threshold: latency 회귀 기준 증가율 (0.2 = 20%)
+            min_latency_delta_ms: latency 회귀 최소 증가량 (ms)
+            base_prompt_id: base 실행에서 비교할 프롬프트 (없으면 전체)
+            head_prompt_id: head 실행에서 비교할 프롬프트 (없으면 전체)
+
+        Returns:
+            변경 유형별 개수와 케이스 목록, 실행이 하나라도 없으면 None
+
+        Raises:
+            ValueError: 데이터셋이 다른 경우
+        """
+        runs = {}
+        for run_id in (base_run_id, head_run_id):
+            row = await self.db.fetchone(
+                "SELECT id, dataset_id, status FROM test_runs WHERE id = ?",
+                (run_id,)
+            )
+            if not row:
+                return None
+            runs[run_id] = row
+        if runs[base_run_id]["dataset_id"] != runs[head_run_id]["dataset_id"]:
+            raise ValueError("Test runs use different datasets")
+
+        params: list = [base_run_id]
+        if base_prompt_id:
+            params.append(base_prompt_id)
+        params.append(head_run_id)
+        if head_prompt_id:
+            params.append(head_prompt_id)
+        params += [latency_threshold, min_latency_delta_ms, limit]
+
+        rows = await self.db.fetchall(
+            self.DIFF_SQL.format(
+                base_prompt="AND prompt_id = ?" if base_prompt_id else "",
+                head_prompt="AND prompt_id = ?" if head_prompt_id else "",
+            ),
+            tuple(params)
+        )
+
+        counts = {change: 0 for change in (*self.DIFF_CHANGES, "unchanged")}
+        cases: dict[str, list[dict]] = {change: [] for change in self.DIFF_CHANGES}
+        for row in rows:
+            counts[row["change"]] = row["n"]
+            if row["change"] in cases:
+                cases[row["change"]].append({
+                    "test_case_id": row["test_case_id"],
+                    "model_id": row["model_id"],
+                    "base_passed": bool(row["base_passed"]),
+                    "head_passed": bool(row["head_passed"]),
+                    "base_latency_ms": row["base_latency_ms"],
+                    "head_latency_ms": row["head_latency_ms"],
+                })
+
+        return {
+            "base_run_id": base_run_id,
+            "head_run_id": head_run_id,
+            "dataset_id": runs[head_run_id]["dataset_id"],
+            "compared": sum(counts.values()),
+            "counts": counts,
+            **cases,
+            "limit": limit,
+            "latency_threshold": latency_threshold,
+            "min_latency_delta_ms": min_latency_delta_ms,
+        }
+
+    @staticmethod
+    def cell_key(prompt_id: str, model_id: str) -> str:
+        """비교표 컬럼 키"""
+        return f"{prompt_id}::{model_id}"
+
+    async def invalidate(self, test_run_id: str) -> None:
+        """요약 캐시 삭제 (커밋하지 않음)"""
+        await self.db.execute(
+            "DELETE FROM evaluation_summaries WHERE test_run_id = ?",
+            (test_run_id,)
+        )
+
+    async def _add_percentiles(
+        self, test_run_id: str, group: str, stats: dict[str, dict]
+    ) -> None:
+        """group 컬럼별 p50/p95를 stats에 추가"""
+        rows = await self.db.fetchall(
+            self.PERCENTILE_SQL.format(group=group),
+            (test_run_id,)
+        )
+        for row in rows:
+            if row["grp"] in stats:
+                stats[row["grp"]]["p50_latency_ms"] = row["p50_latency_ms"]
+                stats[row["grp"]]["p95_latency_ms"] = row["p95_latency_ms"]
+
+    @staticmethod
+    def _accumulate(stats: dict, row) -> None:
+        """셀 그룹 통계를 상위 그룹에 합산"""
+        stats["total_tests"] = stats.get("total_tests", 0) + row["total_tests"]
+        stats["passed_tests"] = stats.get("passed_tests", 0) + (row["passed_tests"] or 0)
+        stats["error_tests"] = stats.get("error_tests", 0) + (row["error_tests"] or 0)
+        stats["latency_sum"] = stats.get("latency_sum", 0.0) + (row["latency_sum"] or 0.0)
+        stats["latency_count"] = stats.get("latency_count", 0) + row["latency_count"]
+        stats["input_tokens"] = stats.get("input_tokens", 0) + (row["input_tokens"] or 0)
+        stats["output_tokens"] = stats.get("output_tokens", 0) + (row["output_tokens"] or 0)
+        for key, pick in (("min_latency_ms", min), ("max_latency_ms", max)):
+            value = row[key]
+            if value is not None:
+                current = stats.get(key)
+                stats[key] = value if current is None else pick(current, value)
+
+    @staticmethod
+    def _finalize(stats: dict) -> dict:
+        """합계 → 응답 형식 (pass_rate, 평균 latency)"""
+        total = stats.get("total_tests", 0)
+        passed = stats.get("passed_tests", 0)
+        return {
+            "total_tests": total,
+            "passed_tests": passed,
+            "failed_tests": total - passed,
+            "error_tests": stats.get("error_tests", 0),
+            "pass_rate": passed / total if total else 0.0,
+            "avg_latency_ms": (
+                stats["latency_sum"] / stats["latency_count"]
+                if stats.get("latency_count") else None
+            ),
+            "min_latency_ms": stats.get("min_latency_ms"),
+            "max_latency_ms": stats.get("max_latency_ms"),
+            "p50_latency_ms": stats.get("p50_latency_ms"),
+            "p95_latency_ms": stats.get("p95_latency_ms"),
+            "input_tokens": stats.get("input_tokens", 0),
+            "output_tokens": stats.get("output_tokens", 0),
+        }
@@ -0,0 +1,401 @@
+"""테스트 실행 작업 큐 (jobs 테이블)
+
+API 서버는 실행 요청을 jobs에 넣기만 하고, 별도 워커 프로세스(worker.py)가
+작업을 claim해서 TestExecutor로 실행한다. 여러 워커가 같은 DB를 공유해도 된다.
+API 서버가 직접 실행하는 경우에도 start로 running 작업을 만들어 lease를 잡는다
+→ 실행이 살아 있는지는 어느 프로세스든 lease 만료 여부로 판단 (is_live)
+
+- claim: UPDATE ... RETURNING 한 문장으로 queued 작업 하나를 running으로 바꿈
+  → 두 워커가 같은 작업을 동시에 가져가지 않음
+  → options.priority가 높은 작업 먼저, 같으면 먼저 들어온 작업부터
+- lease: claim한 워커는 lease_expires_at 전에 heartbeat로 연장해야 함
+  → 워커가 죽으면 lease가 만료되고 다른 워커가 다시 claim (이미 저장된 셀은 건너뛰고 재개)
+- max_attempts번 claim된 뒤에도 lease가 만료되면 작업과 test_run을 failed로 정리
+- 취소: queued 작업과 lease가 만료된 running 작업은 바로 cancelled,
+  lease가 살아 있는 running 작업은 cancel_requested 표시
+  → 소유자(워커 또는 API 서버)가 다음 heartbeat에서 확인하고 TestExecutor.cancel 호출
+"""
+
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from shared.core.models import JobStatus, TestRunStatus
+from shared.database.database import Database
+
+from .test_service import TestService
+
+# 실행 중인 작업 상태 (test_run당 하나만 허용)
+ACTIVE_STATUSES = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+class JobQueue:
+    """DB 기반 실행 작업 큐"""
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.test_service = TestService(db)
+
+    # =========================================================================
+    # API 서버 쪽
+    # =========================================================================
+
+    async def enqueue(
+        self,
+        test_run_id: str,
+        options: dict[str, Any] | None = None,
+        max_attempts: int = 3,
+    ) -> dict:
+        """실행 작업 추가
+
+        Args:
+            test_run_id: 테스트 실행 ID
+            options: TestExecutor.execute 키워드 인자 (engine, timeout 등)
+            max_attempts: 워커가 죽어 lease가 만료됐을 때 다시 claim할 최대 횟수
+
+        Raises:
+            ValueError: 이미 대기 중이거나 실행 중인 작업이 있음
+        """
+        active = await self.get_active(test_run_id)
+        if active:
+            raise ValueError(f"Test run already has an active job: {active['id']}")
+
+        job_id = f"job_{uuid.uuid4().hex[:12]}"
+        await self._insert_active(
+            """
+            INSERT INTO jobs (id, test_run_id, status, options, max_attempts, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job_id,
+                test_run_id,
+                JobStatus.QUEUED.value,
+                self.db.serialize_json(options or {}),
+                max_attempts,
+                self.db.now_iso(),
+            ),
+        )
+        return await self.get_job(job_id)
+
+    async def start(
+        self,
+        test_run_id: str,
+        worker_id: str,
+        options: dict[str, Any] | None = None,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+    ) -> dict:
+        """큐를 거치지 않고 바로 실행할 작업 추가 (worker_id가 lease를 가진 running 상태)
+
+        lease가 만료된 실행 중 작업 (소유 프로세스가 죽음)은 failed로 정리하고 새로 만든다.
+
+        Raises:
+            ValueError: 대기 중이거나 lease가 살아 있는 실행 중 작업이 있음
+        """
+        now = datetime.now()
+        await self.db.execute(
+            """
+            UPDATE jobs
+            SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL
+            WHERE test_run_id = ? AND status = ? AND lease_expires_at < ?
+            """,
+            (
+                JobStatus.FAILED.value,
+                "Lease expired; run restarted",
+                now.isoformat(),
+                test_run_id,
+                JobStatus.RUNNING.value,
+                now.isoformat(),
+            ),
+        )
+
+        job_id = f"job_{uuid.uuid4().hex[:12]}"
+        await self._insert_active(
+            """
+            INSERT INTO jobs
+            (id, test_run_id, status, options, attempts, max_attempts, worker_id,
+             lease_expires_at, created_at, started_at, heartbeat_at)
+            VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job_id,
+                test_run_id,
+                JobStatus.RUNNING.value,
+                self.db.serialize_json(options or {}),
+                max_attempts,
+                worker_id,
+                (now + timedelta(seconds=lease_seconds)).isoformat(),
+                now.isoformat(),
+                now.isoformat(),
+                now.isoformat(),
+            ),
+        )
+        return await self.get_job(job_id)
+
+    async def _insert_active(self, sql: str, params: tuple) -> None:
+        """대기 중/실행 중 작업 INSERT (idx_jobs_active_run 위반 → ValueError)"""
+        try:
+            await self.db.execute(sql, params)
+        except sqlite3.IntegrityError:
+            # 실패한 문장만 취소됨 (공유 연결이라 rollback하면 다른 요청의 쓰기까지 취소)
+            raise ValueError("Test run already has an active job") from None
+        finally:
+            await self.db.commit()
+
+    @staticmethod
+    def is_live(job: dict | None) -> bool:
+        """대기 중이거나 lease가 만료되지 않은 실행 중 작업인지
+
+        running인데 lease가 만료됐으면 소유 프로세스가 죽은 것 (재개 가능한 중단된 실행).
+        """
+        if job is None:
+            return False
+        if job["status"] == JobStatus.QUEUED.value:
+            return True
+        return (
+            job["status"] == JobStatus.RUNNING.value
+            and job["lease_expires_at"] is not None
+            and job["lease_expires_at"] >= datetime.now().isoformat()
+        )
+
+    async def get_job(self, job_id: str) -> dict | None:
+        """작업 조회"""
+        row = await self.db.fetchone("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._row_to_dict(row) if row else None
+
+    async def get_active(self, test_run_id: str) -> dict | None:
+        """test_run의 대기 중/실행 중 작업 조회 (없으면 None)"""
+        row = await self.db.fetchone(
+            """
+            SELECT * FROM jobs
+            WHERE test_run_id = ? AND status IN (?, ?)
+            ORDER BY created_at DESC
+            LIMIT 1
+            """,
+            (test_run_id, *ACTIVE_STATUSES),
+        )
+        return self._row_to_dict(row) if row else None
+
+    async def list_jobs(self, test_run_id: str, limit: int = 20) -> list[dict]:
+        """test_run의 작업 이력 (최신순)"""
+        rows = await self.db.fetchall(
+            """
+            SELECT * FROM jobs
+            WHERE test_run_id = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (test_run_id, limit),
+        )
+        return [self._row_to_dict(row) for row in rows]
+
+    async def request_cancel(self, test_run_id: str) -> dict | None:
+        """test_run의 작업 취소 요청
+
+        Returns:
+            취소 요청된 작업 (queued이거나 lease가 만료됐으면 status=cancelled,
+            lease가 살아 있는 running이면 cancel_requested=True),
+            대기 중/실행 중 작업이 없으면 None
+        """
+        now = self.db.now_iso()
+        row = await self.db.fetchone(
+            """
+            UPDATE jobs
+            SET status = ?, cancel_requested = 1, finished_at = ?, lease_expires_at = NULL
+            WHERE test_run_id = ?
+              AND (status = ? OR (status = ? AND lease_expires_at < ?))
+            RETURNING *
+            """,
+            (
+                JobStatus.CANCELLED.value,
+                now,
+                test_run_id,
+                JobStatus.QUEUED.value,
+                JobStatus.RUNNING.value,
+                now,
+            ),
+        )
+        if row is None:
+            row = await self.db.fetchone(
+                """
+                UPDATE jobs SET cancel_requested = 1
+                WHERE test_run_id = ? AND status = ?
+                RETURNING *
+                """,
+                (test_run_id, JobStatus.RUNNING.value),
+            )
+        await self.db.commit()
+        return self._row_to_dict(row) if row else None
+
+    # =========================================================================
+    # 워커 쪽
+    # =========================================================================
+
+    async def claim(self, worker_id: str, lease_seconds: float = 60.0) -> dict | None:
+        """우선순위가 가장 높고 가장 오래된 대기 작업 (또는 lease가 만료된 실행 작업) 하나를 가져옴
+
+        Returns:
+            claim한 작업 (attempts가 1 증가), 가져올 작업이 없으면 None
+        """
+        await self.reclaim_expired()
+
+        now = datetime.now()
+        row = await self.db.fetchone(
+            """
+            UPDATE jobs
+            SET status = ?,
+                worker_id = ?,
+                attempts = attempts + 1,
+                lease_expires_at = ?,
+                heartbeat_at = ?,
+                started_at = COALESCE(started_at, ?)
+            WHERE id = (
+                SELECT id FROM jobs
+                WHERE status = ?
+                   OR (status = ? AND lease_expires_at < ?)
+                ORDER BY COALESCE(json_extract(options, '$.priority'), 0) DESC, created_at
+                LIMIT 1
+            )
+            RETURNING *
+            """,
+            (
+                JobStatus.RUNNING.value,
+                worker_id,
+                (now + timedelta(seconds=lease_seconds)).isoformat(),
+                now.isoformat(),
+                now.isoformat(),
+                JobStatus.QUEUED.value,
+                JobStatus.RUNNING.value,
+                now.isoformat(),
+            ),
+        )
+        await self.db.commit()
+        return self._row_to_dict(row) if row else None
+
+    async def heartbeat(
+        self,
+        job_id: str,
+        worker_id: str,
+        lease_seconds: float = 60.0,
+    ) -> dict | None:
+        """lease 연장
+
+        Returns:
+            연장된 작업 (cancel_requested 확인용), lease를 잃었으면 None
+            (만료 후 다른 워커가 claim했거나 작업이 삭제됨 → 실행을 멈춰야 함)
+        """
+        now = datetime.now()
+        row = await self.db.fetchone(
+            """
+            UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ?
+            WHERE id = ? AND worker_id = ? AND status = ?
+            RETURNING *
+            """,
+            (
+                (now + timedelta(seconds=lease_seconds)).isoformat(),
+                now.isoformat(),
+                job_id,
+                worker_id,
+                JobStatus.RUNNING.value,
+            ),
+        )
+        await self.db.commit()
+        return self._row_to_dict(row) if row else None
+
+    async def finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        error: str | None = None,
+    ) -> bool:
+        """작업 종료 (completed / failed / cancelled)
+
+        Returns:
+            이 워커가 아직 lease를 갖고 있어서 종료 처리했으면 True
+        """
+        row = await self.db.fetchone(
+            """
+            UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL
+            WHERE id = ? AND worker_id = ? AND status = ?
+            RETURNING id
+            """,
+            (status, error, self.db.now_iso(), job_id, worker_id, JobStatus.RUNNING.value),
+        )
+        await self.db.commit()
+        return row is not None
+
+    async def release(self, job_id: str, worker_id: str) -> bool:
+        """워커 종료 시 실행 중인 작업을 대기 상태로 되돌림
+
+        워커 잘못이 아니므로 attempts는 되돌린다. 다른 워커가 남은 셀부터 재개한다.
+        """
+        row = await self.db.fetchone(
+            """
+            UPDATE jobs
+            SET status = ?, worker_id = NULL, lease_expires_at = NULL,
+                attempts = MAX(attempts - 1, 0)
+            WHERE id = ? AND worker_id = ? AND status = ?
+            RETURNING id
+            """,
+            (JobStatus.QUEUED.value, job_id, worker_id, JobStatus.RUNNING.value),
+        )
+        await self.db.commit()
+        return row is not None
+
+    async def reclaim_expired(self) -> int:
+        """lease가 만료됐지만 다시 claim하면 안 되는 작업 정리
+
+        - 취소 요청된 작업 → cancelled (test_run도 cancelled)
+        - max_attempts를 다 쓴 작업 → failed (test_run도 failed)
+        나머지 만료 작업은 claim()이 다시 가져간다.
+
+        Returns:
+            정리한 작업 수
+        """
+        now = self.db.now_iso()
+        rows = await self.db.fetchall(
+            """
+            SELECT id, test_run_id, attempts, cancel_requested FROM jobs
+            WHERE status = ? AND lease_expires_at < ?
+              AND (cancel_requested = 1 OR attempts >= max_attempts)
+            """,
+            (JobStatus.RUNNING.value, now),
+        )
+
+        count = 0
+        for row in rows:
+            if row["cancel_requested"]:
+                status, run_status, error = (
+                    JobStatus.CANCELLED.value, TestRunStatus.CANCELLED.value, None
+                )
+            else:
+                status, run_status = JobStatus.FAILED.value, TestRunStatus.FAILED.value
+                error = f"Worker lease expired after {row['attempts']} attempts"
+
+            # 조회 후 다른 워커가 먼저 정리했을 수 있음 → 조건을 다시 걸어 한 번만 처리
+            updated = await self.db.fetchone(
+                """
+                UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL
+                WHERE id = ? AND status = ? AND lease_expires_at < ?
+                RETURNING id
+                """,
+                (status, error, now, row["id"], JobStatus.RUNNING.value, now),
+            )
+            await self.db.commit()
+            if updated is None:
+                continue
+
+            await self.test_service.update_test_run_status(
+                row["test_run_id"], run_status, error_message=error
+            )
+            count += 1
+        return count
+
+    def _row_to_dict(self, row) -> dict:
+        """DB Row → dict"""
+        job = dict(row)
+        job["options"] = self.db.deserialize_json(job["options"]) or {}
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
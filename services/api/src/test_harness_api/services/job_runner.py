@@ -0,0 +1,142 @@
+"""jobs 작업 하나를 lease와 함께 실행 (워커 프로세스, API 서버 공용)
+
+- 실행 중에는 lease_seconds / 3마다 heartbeat로 lease 연장
+  → 실행이 살아 있는지는 프로세스 메모리가 아니라 jobs의 lease로 판단
+- heartbeat에서 취소 요청을 확인하면 TestExecutor.cancel (저장된 결과 유지, cancelled)
+- heartbeat가 lease를 잃었다고 알려주면 (만료 후 다른 워커가 가져감) 실행만 멈춤
+- heartbeat가 일시적 DB 오류(database is locked 등)로 실패하면 짧게 재시도하고,
+  lease가 만료될 때까지 연장하지 못하면 lease를 잃은 것으로 보고 실행을 멈춤
+"""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+from shared.core.models import JobStatus
+from shared.database.database import Database
+
+from .job_queue import JobQueue
+from .test_executor import TestExecutor
+
+
+class JobRunner:
+    """claim/start한 작업 실행기"""
+
+    # heartbeat가 일시적 DB 오류로 실패했을 때 재시도 간격 (초)
+    HEARTBEAT_RETRY_SECONDS = 1.0
+
+    def __init__(
+        self,
+        db: Database,
+        worker_id: str,
+        project_root: Path | None = None,
+        lease_seconds: float = 60.0,
+        release_on_cancel: bool = True,
+    ):
+        """
+        Args:
+            db: 데이터베이스
+            worker_id: 작업 소유자 ID (jobs.worker_id)
+            project_root: 프로젝트 루트 (promptfoo 실행 위치)
+            lease_seconds: lease 길이 (초)
+            release_on_cancel: 실행 task가 취소되면 (프로세스 종료) 작업을 대기 상태로 되돌림.
+                False면 running으로 남겨 lease 만료 후 중단된 실행으로 처리
+        """
+        self.db = db
+        self.queue = JobQueue(db)
+        self.worker_id = worker_id
+        self.project_root = project_root
+        self.lease_seconds = lease_seconds
+        self.release_on_cancel = release_on_cancel
+
+    async def run(self, job: dict, on_progress: callable = None) -> dict | None:
+        """작업 하나 실행 (heartbeat 포함)
+
+        Args:
+            job: 이 worker_id가 lease를 가진 running 작업
+            on_progress: TestExecutor.execute 진행률 콜백
+
+        Returns:
+            실행 결과 요약, lease를 잃어 실행을 멈췄으면 None
+
+        Raises:
+            Exception: 실행 실패 (test_run과 작업은 failed로 기록된 뒤 다시 던짐)
+        """
+        test_run_id = job["test_run_id"]
+        options = dict(job["options"])
+        if job["attempts"] > 1:
+            # 이전 소유자가 죽은 작업 → 처음부터 다시 하지 않고 저장된 셀 이후부터
+            options["resume"] = True
+
+        executor = TestExecutor(self.db, project_root=self.project_root)
+        execution = asyncio.create_task(
+            executor.execute(test_run_id, on_progress=on_progress, **options)
+        )
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(job, execution, lease_lost))
+
+        try:
+            result = await asyncio.shield(execution)
+            if result.get("status") == JobStatus.CANCELLED.value:
+                status = JobStatus.CANCELLED.value
+            else:
+                status = JobStatus.COMPLETED.value
+            await self.queue.finish(job["id"], self.worker_id, status)
+            return result
+        except asyncio.CancelledError:
+            if lease_lost.is_set():
+                return None  # 작업은 이미 다른 워커 소유 → 건드리지 않음
+            # 프로세스 종료 → 실행을 멈추고 (test_run은 running 유지)
+            execution.cancel()
+            await asyncio.gather(execution, return_exceptions=True)
+            if self.release_on_cancel:
+                await self.queue.release(job["id"], self.worker_id)
+            raise
+        except Exception as e:
+            # test_run은 executor가 이미 failed로 기록
+            await self.queue.finish(
+                job["id"], self.worker_id, JobStatus.FAILED.value, error=str(e)
+            )
+            raise
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _heartbeat(
+        self,
+        job: dict,
+        execution: asyncio.Task,
+        lease_lost: asyncio.Event,
+    ) -> None:
+        """lease 연장 + 취소 요청 확인"""
+        loop = asyncio.get_running_loop()
+        # 마지막으로 연장에 성공한 lease의 만료 시각 (요청 전 시각 기준이라 DB보다 이르거나 같음)
+        lease_deadline = loop.time() + self.lease_seconds
+        interval = self.lease_seconds / 3
+        cancelling = False
+
+        while not execution.done():
+            await asyncio.sleep(min(interval, max(lease_deadline - loop.time(), 0)))
+            requested_at = loop.time()
+            try:
+                current = await self.queue.heartbeat(job["id"], self.worker_id, self.lease_seconds)
+            except sqlite3.OperationalError:
+                # database is locked 등 일시적 오류 → lease가 남아 있으면 짧게 재시도
+                if loop.time() < lease_deadline:
+                    interval = min(self.lease_seconds / 3, self.HEARTBEAT_RETRY_SECONDS)
+                    continue
+                current = None  # 연장하지 못한 채 만료 → 다른 워커가 가져갈 수 있음
+
+            if current is None:
+                # lease 만료 후 다른 워커가 가져감 → 중복 실행 방지를 위해 실행만 중단
+                lease_lost.set()
+                execution.cancel()
+                return
+
+            lease_deadline = requested_at + self.lease_seconds
+            interval = self.lease_seconds / 3
+
+            if current["cancel_requested"] and not cancelling:
+                cancelling = True
+                # cancel()은 실행이 정리될 때까지 기다림 → heartbeat는 계속 돌도록 별도 task
+                asyncio.create_task(TestExecutor.cancel(job["test_run_id"]))
@@ -0,0 +1,52 @@
+"""Keyset 페이지네이션 커서
+
+커서는 마지막 행의 정렬 키를 담은 불투명(opaque) 문자열이다.
+클라이언트는 응답의 next_cursor를 그대로 다음 요청에 넘기기만 한다.
+"""
+
+import base64
+import json
+from typing import Any
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """정렬 키 → 커서 문자열 (URL-safe base64 JSON)"""
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: tuple[str, ...]) -> dict[str, Any]:
+    """커서 문자열 → 정렬 키
+
+    Args:
+        cursor: encode_cursor 결과
+        keys: 반드시 포함되어야 하는 키
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(values, dict) or any(key not in values for key in keys):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def keyset_page(
+    rows: list,
+    limit: int,
+    keys: tuple[str, ...] = ("created_at", "id"),
+) -> tuple[list, str | None]:
+    """limit + 1개 조회 결과 → (페이지 행, next_cursor)
+
+    한 행을 더 조회해서 다음 페이지 존재 여부를 COUNT 없이 판단한다.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor({key: last[key] for key in keys})
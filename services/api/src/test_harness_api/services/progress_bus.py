@@ -0,0 +1,178 @@
+"""테스트 실행 진행률 in-process pub/sub
+
+Executor는 셀이 끝날 때마다 진행률을 publish하고 (await 없음 → 실행을 막지 않음),
+WebSocket 연결마다 subscribe한 큐를 별도 task가 비우며 전송한다.
+
+- 실행별로 초당 max_rate회까지만 전달 (그 사이 업데이트는 마지막 값으로 합침)
+- 구독자 큐는 queue_size로 제한, 가득 차면 가장 오래된 메시지를 버림
+  (진행률은 스냅샷이라 최신 값만 있으면 됨 → 느린 브라우저가 다른 구독자/실행을 막지 않음)
+- completed / failed / cancelled 같은 종료 상태는 합치지 않고 즉시 전달
+- 버스는 프로세스 안에서만 전달되므로 워커 등 다른 프로세스에서 실행 중이면 알림이 없음
+  → 구독자가 poll_interval마다 DB의 진행률을 확인 (WebSocket ConnectionManager)
+
+설정 예시 (configs/models.yaml):
+    progress_bus:
+      max_rate: 4
+      queue_size: 16
+      poll_interval: 2
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# 종료 상태 (합치지 않고 즉시 전달)
+FINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+@dataclass
+class ProgressBusConfig:
+    """진행률 전달 설정"""
+    max_rate: float = 4.0     # 실행별 초당 최대 전달 횟수
+    queue_size: int = 16      # 구독자별 대기 메시지 수
+    poll_interval: float = 2.0  # 알림이 없을 때 DB 진행률 확인 주기 (초, 다른 프로세스 실행 대비)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ProgressBusConfig":
+        """dict에서 생성 (알 수 없는 키는 무시)"""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @classmethod
+    def from_yaml(cls, path: str | Path) -> "ProgressBusConfig":
+        """models.yaml의 progress_bus 섹션으로 생성 (파일이 없으면 기본값)"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        return cls.from_dict(config.get("progress_bus") or {})
+
+
+class _RunChannel:
+    """실행 하나의 구독자와 합쳐지는 중인 메시지"""
+
+    def __init__(self):
+        self.subscribers: set[asyncio.Queue] = set()
+        self.last_sent = 0.0
+        self.pending: dict | None = None
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class ProgressBus:
+    """실행별 진행률 pub/sub
+
+    사용 예:
+        queue = bus.subscribe(test_run_id)
+        try:
+            message = await queue.get()
+        finally:
+            bus.unsubscribe(test_run_id, queue)
+    """
+
+    def __init__(self, config: ProgressBusConfig | None = None):
+        self.config = config or ProgressBusConfig()
+        self.interval = 1.0 / self.config.max_rate if self.config.max_rate > 0 else 0.0
+        self._channels: dict[str, _RunChannel] = {}
+
+    def subscribe(self, test_run_id: str) -> asyncio.Queue:
+        """구독 (bounded 큐 반환)"""
+        channel = self._channels.setdefault(test_run_id, _RunChannel())
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.queue_size))
+        channel.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, test_run_id: str, queue: asyncio.Queue) -> None:
+        """구독 해제 (마지막 구독자면 실행별 상태 정리)"""
+        channel = self._channels.get(test_run_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            self._drop(test_run_id)
+
+    def publish(self, test_run_id: str, message: dict) -> None:
+        """메시지 발행 (await 없이 반환, 구독자가 없으면 버림)"""
+        channel = self._channels.get(test_run_id)
+        if channel is None or not channel.subscribers:
+            return
+
+        if message.get("status") in FINAL_STATUSES:
+            self._deliver(channel, message)
+            return
+
+        elapsed = time.monotonic() - channel.last_sent
+        if elapsed >= self.interval and channel.timer is None:
+            self._deliver(channel, message)
+            return
+
+        # 전달 간격 안의 업데이트 → 마지막 값만 남겨 두었다가 한 번에 전달
+        channel.pending = message
+        if channel.timer is None:
+            loop = asyncio.get_running_loop()
+            channel.timer = loop.call_later(
+                max(0.0, self.interval - elapsed),
+                self._flush,
+                test_run_id,
+            )
+
+    def progress_callback(self, test_run_id: str) -> Callable[[int, int, str], None]:
+        """TestExecutor.execute의 on_progress 콜백 (current, total, status)"""
+        def on_progress(current: int, total: int, status: str) -> None:
+            self.publish(test_run_id, progress_message(test_run_id, current, total, status))
+        return on_progress
+
+    def _flush(self, test_run_id: str) -> None:
+        channel = self._channels.get(test_run_id)
+        if channel is None:
+            return
+        channel.timer = None
+        if channel.pending is not None:
+            self._deliver(channel, channel.pending)
+
+    def _deliver(self, channel: _RunChannel, message: dict) -> None:
+        if channel.timer is not None:
+            channel.timer.cancel()
+            channel.timer = None
+        channel.pending = None
+        channel.last_sent = time.monotonic()
+
+        for queue in channel.subscribers:
+            if queue.full():
+                queue.get_nowait()  # 느린 구독자 → 가장 오래된 메시지 버림
+            queue.put_nowait(message)
+
+    def _drop(self, test_run_id: str) -> None:
+        channel = self._channels.pop(test_run_id, None)
+        if channel and channel.timer is not None:
+            channel.timer.cancel()
+
+
+def progress_message(test_run_id: str, current: int, total: int, status: str) -> dict:
+    """WebSocket 진행률 메시지"""
+    return {
+        "type": "progress",
+        "test_run_id": test_run_id,
+        "current": current,
+        "total": total,
+        "progress": int(current * 100 / total) if total else 0,
+        "status": status,
+    }
+
+
+_bus: ProgressBus | None = None
+
+
+def get_progress_bus(config_path: str | Path | None = None) -> ProgressBus:
+    """프로세스 공용 ProgressBus (최초 호출 시 models.yaml 로드)"""
+    global _bus
+    if _bus is None:
+        _bus = ProgressBus(
+            ProgressBusConfig.from_yaml(config_path or Path("configs/models.yaml"))
+        )
+    return _bus
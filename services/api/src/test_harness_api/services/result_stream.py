@@ -0,0 +1,99 @@
+"""셀 결과 Server-Sent Events 스트림
+
+결과는 test_results에 저장된 순서 (created_at, id) keyset으로 읽는다.
+이벤트 id가 그 keyset 커서이므로 연결이 끊겨도 Last-Event-ID부터 이어서
+재전송할 수 있고, 실행이 끝난 뒤 접속해도 처음부터 replay된다.
+
+실행 중에는 ProgressBus 진행률 알림마다 (초당 최대 max_rate회) 새로 저장된 결과만
+조회하고, 알림이 없어도 poll_interval마다 한 번 확인한다
+(다른 프로세스에서 실행 중인 경우 대비).
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from .pagination import encode_cursor
+from .progress_bus import FINAL_STATUSES, ProgressBus
+from .test_service import TestService
+
+
+def format_event(data: dict, event: str, event_id: str | None = None) -> str:
+    """SSE 이벤트 문자열"""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_results(
+    test_service: TestService,
+    bus: ProgressBus,
+    test_run_id: str,
+    last_event_id: str | None = None,
+    batch_size: int = 500,
+    poll_interval: float = 2.0,
+    keepalive_interval: float = 15.0,
+) -> AsyncIterator[str]:
+    """저장된 결과를 SSE 이벤트로 yield (실행이 끝나고 남은 결과를 모두 보내면 end 이벤트)
+
+    Args:
+        last_event_id: 마지막으로 받은 이벤트 id (없으면 처음부터, 호출 전에 decode_cursor로 검증)
+        batch_size: 한 번에 조회할 결과 수
+        poll_interval: 진행률 알림이 없을 때 새 결과 확인 주기 (초)
+        keepalive_interval: 보낼 이벤트가 없을 때 연결 유지용 주석 전송 주기 (초)
+    """
+    cursor = last_event_id or None
+    # 조회 전에 구독해야 조회와 구독 사이에 저장된 결과 알림을 놓치지 않음
+    queue = bus.subscribe(test_run_id)
+    loop = asyncio.get_running_loop()
+
+    try:
+        yield f"retry: {int(poll_interval * 1000)}\n\n"
+        last_sent = loop.time()
+
+        while True:
+            # 실행 상태를 결과 조회보다 먼저 확인 → 종료 상태면 이후 조회가 마지막 결과까지 포함
+            test_run = await test_service.get_test_run(test_run_id)
+            if test_run is None:
+                yield format_event({"test_run_id": test_run_id, "status": "deleted"}, "end")
+                return
+            finished = test_run["status"] in FINAL_STATUSES
+
+            while True:
+                page = await test_service.get_test_results(
+                    test_run_id, limit=batch_size, cursor=cursor
+                )
+                for result in page["results"]:
+                    cursor = encode_cursor({"created_at": result["created_at"], "id": result["id"]})
+                    yield format_event(result, "result", cursor)
+                    last_sent = loop.time()
+                if not page["next_cursor"]:
+                    break
+
+            if finished:
+                yield format_event({
+                    "test_run_id": test_run_id,
+                    "status": test_run["status"],
+                    "completed_cases": test_run["completed_cases"],
+                    "total_cases": test_run["total_cases"],
+                }, "end")
+                return
+
+            # 새 결과 알림 또는 poll_interval 대기
+            try:
+                await asyncio.wait_for(queue.get(), timeout=poll_interval)
+                while not queue.empty():
+                    queue.get_nowait()
+            except asyncio.TimeoutError:
+                pass
+
+            if loop.time() - last_sent >= keepalive_interval:
+                yield ": keep-alive\n\n"
+                last_sent = loop.time()
+
+    finally:
+        bus.unsubscribe(test_run_id, queue)
+
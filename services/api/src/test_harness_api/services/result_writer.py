@@ -0,0 +1,146 @@
+"""테스트 결과 배치 저장기
+
+결과를 버퍼에 모았다가 executemany + 진행률 UPDATE 1회 + commit 1회로
+한 트랜잭션에 저장한다. 결과 1건마다 INSERT/UPDATE/commit 하던 방식 대비
+SQLite fsync 횟수가 배치 크기만큼 줄어든다.
+
+flush_interval은 타이머로도 확인하므로, 결과가 드문드문 들어오는 느린 실행에서도
+버퍼의 결과는 flush_interval 안에 저장된다 (프로세스가 죽어도 잃는 결과가 그만큼으로 제한).
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .run_aggregates import RunAggregates
+    from .test_service import TestService
+
+
+class ResultWriter:
+    """테스트 결과 배치 저장
+
+    사용 예:
+        async with test_service.result_writer(test_run_id) as writer:
+            await writer.add(prompt_id=..., model_id=..., ...)
+    """
+
+    def __init__(
+        self,
+        test_service: "TestService",
+        test_run_id: str,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        aggregates: "RunAggregates | None" = None,
+    ):
+        """
+        Args:
+            test_service: 테스트 서비스 (SQL/파라미터 생성)
+            test_run_id: 테스트 실행 ID
+            flush_size: 버퍼가 이 크기에 도달하면 flush
+            flush_interval: 마지막 flush 이후 이 시간(초)이 지나면 flush
+            aggregates: 누적 집계 (결과와 같은 트랜잭션으로 저장)
+        """
+        self.test_service = test_service
+        self.db = test_service.db
+        self.test_run_id = test_run_id
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.aggregates = aggregates
+
+        self._buffer: list[tuple] = []
+        self._last_flush = time.monotonic()
+        self._write_lock = asyncio.Lock()
+        self._writes: set[asyncio.Future] = set()
+        self._timer: asyncio.Task | None = None
+        self.written = 0
+
+    async def add(self, **fields: Any) -> str:
+        """결과 1건 버퍼에 추가 (필요 시 flush)
+
+        Args:
+            fields: TestService.save_test_result와 같은 인자 (test_run_id 제외)
+
+        Returns:
+            생성된 결과 ID
+        """
+        self._check_timer()
+        if self._timer is None and self.flush_interval > 0:
+            self._timer = asyncio.create_task(self._flush_periodically())
+
+        result_id = self.test_service.new_result_id()
+        self._buffer.append(
+            self.test_service.result_params(
+                result_id=result_id,
+                test_run_id=self.test_run_id,
+                **fields,
+            )
+        )
+        if self.aggregates is not None:
+            self.aggregates.add(**fields)
+
+        if (
+            len(self._buffer) >= self.flush_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+        return result_id
+
+    async def flush(self) -> int:
+        """버퍼의 결과를 한 트랜잭션으로 저장
+
+        Returns:
+            저장한 결과 수
+        """
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return 0
+
+        rows, self._buffer = self._buffer, []
+        # 실행이 취소되어도 꺼낸 배치는 끝까지 저장 (close()가 완료를 기다림)
+        writing = asyncio.ensure_future(self._write(rows))
+        self._writes.add(writing)
+        writing.add_done_callback(self._writes.discard)
+        await asyncio.shield(writing)
+        return len(rows)
+
+    async def _write(self, rows: list[tuple]) -> None:
+        """배치 INSERT + 진행률/집계 갱신 + commit (타이머 flush와 겹치지 않게 순서대로)"""
+        async with self._write_lock:
+            await self.db.executemany(self.test_service.INSERT_RESULT_SQL, rows)
+            await self.test_service.increment_progress(self.test_run_id, len(rows))
+            if self.aggregates is not None:
+                await self.aggregates.flush()
+            await self.db.commit()
+            self.written += len(rows)
+
+    async def _flush_periodically(self) -> None:
+        """마지막 flush 후 flush_interval이 지나면 add() 호출이 없어도 flush"""
+        while True:
+            await asyncio.sleep(
+                max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+            )
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                await self.flush()
+
+    def _check_timer(self) -> None:
+        """타이머 flush가 실패했으면 그 예외를 다시 발생"""
+        if self._timer is not None and self._timer.done() and not self._timer.cancelled():
+            self._timer.result()
+
+    async def close(self) -> None:
+        """타이머 중지 + 남은 결과 저장"""
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+        if self._writes:
+            await asyncio.gather(*self._writes)
+        await self.flush()
+        self._check_timer()
+
+    async def __aenter__(self) -> "ResultWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
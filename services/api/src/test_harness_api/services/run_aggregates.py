@@ -0,0 +1,235 @@
+"""실행 중 (prompt, model)별 누적 집계
+
+Executor가 결과를 저장할 때마다 메모리에서 통과/에러 수, 토큰 합계,
+latency 분위수 스케치를 갱신하고, ResultWriter flush와 같은 트랜잭션으로
+run_aggregates 테이블에 저장한다. 대시보드는 test_results를 스캔하지 않고
+이 테이블만 읽어 실행 중에도 pass rate / p95 latency를 볼 수 있다.
+"""
+
+from typing import Any
+
+from shared.core.sketch import QuantileSketch
+from shared.database.database import Database
+
+
+class CellAggregate:
+    """(prompt, model) 하나의 누적 집계"""
+
+    def __init__(self, sketch: QuantileSketch | None = None):
+        self.total = 0
+        self.passed = 0
+        self.errors = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency_sum = 0.0
+        self.sketch = sketch or QuantileSketch()
+
+    def add(
+        self,
+        passed: bool,
+        error: str | None,
+        latency_ms: float,
+        input_tokens: int | None,
+        output_tokens: int | None,
+        cached: bool = False,
+    ) -> None:
+        self.total += 1
+        self.passed += 1 if passed else 0
+        self.errors += 1 if error else 0
+        self.input_tokens += input_tokens or 0
+        self.output_tokens += output_tokens or 0
+        if cached:
+            return  # 캐시 응답은 호출하지 않았으므로 latency 집계에서 제외
+        self.latency_sum += latency_ms or 0.0
+        self.sketch.add(latency_ms or 0.0)
+
+    def merge(self, other: "CellAggregate") -> None:
+        self.total += other.total
+        self.passed += other.passed
+        self.errors += other.errors
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.latency_sum += other.latency_sum
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> dict[str, Any]:
+        """응답 형식 (EvaluationSummary 그룹 통계와 같은 키, 분위수는 근사값)"""
+        return {
+            "total_tests": self.total,
+            "passed_tests": self.passed,
+            "failed_tests": self.total - self.passed,
+            "error_tests": self.errors,
+            "pass_rate": self.passed / self.total if self.total else 0.0,
+            "avg_latency_ms": (
+                self.latency_sum / self.sketch.count if self.sketch.count else None
+            ),
+            "p50_latency_ms": self.sketch.quantile(0.50),
+            "p95_latency_ms": self.sketch.quantile(0.95),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+class RunAggregates:
+    """테스트 실행 하나의 (prompt, model)별 누적 집계"""
+
+    UPSERT_SQL = """
+        INSERT OR REPLACE INTO run_aggregates
+        (test_run_id, prompt_id, model_id, total, passed, errors,
+         input_tokens, output_tokens, latency_sum, latency_sketch, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db: Database, test_run_id: str):
+        self.db = db
+        self.test_run_id = test_run_id
+        self.cells: dict[tuple[str, str], CellAggregate] = {}
+        self._dirty: set[tuple[str, str]] = set()
+        self.updated_at: str | None = None
+
+    @property
+    def total(self) -> int:
+        return sum(cell.total for cell in self.cells.values())
+
+    def add(
+        self,
+        prompt_id: str,
+        model_id: str,
+        passed: bool,
+        latency_ms: float,
+        error: str | None = None,
+        input_tokens: int | None = None,
+        output_tokens: int | None = None,
+        cached: bool = False,
+        **_: Any,
+    ) -> None:
+        """결과 1건 반영 (ResultWriter.add 인자를 그대로 받음)"""
+        key = (prompt_id, model_id)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = CellAggregate()
+        cell.add(passed, error, latency_ms, input_tokens, output_tokens, cached)
+        self._dirty.add(key)
+
+    async def flush(self) -> int:
+        """변경된 셀 집계 저장 (커밋하지 않음 → 결과 INSERT와 같은 트랜잭션)
+
+        Returns:
+            저장한 셀 수
+        """
+        if not self._dirty:
+            return 0
+
+        now = self.db.now_iso()
+        rows = []
+        for key in self._dirty:
+            cell = self.cells[key]
+            rows.append((
+                self.test_run_id,
+                key[0],
+                key[1],
+                cell.total,
+                cell.passed,
+                cell.errors,
+                cell.input_tokens,
+                cell.output_tokens,
+                cell.latency_sum,
+                self.db.serialize_json(cell.sketch.to_dict()),
+                now,
+            ))
+        await self.db.executemany(self.UPSERT_SQL, rows)
+
+        self._dirty.clear()
+        self.updated_at = now
+        return len(rows)
+
+    async def load(self) -> int:
+        """저장된 집계 로드 (resume / 조회용)
+
+        Returns:
+            로드한 결과 수 합계
+        """
+        rows = await self.db.fetchall(
+            "SELECT * FROM run_aggregates WHERE test_run_id = ?",
+            (self.test_run_id,)
+        )
+
+        self.cells = {}
+        self._dirty.clear()
+        for row in rows:
+            cell = CellAggregate(
+                QuantileSketch.from_dict(self.db.deserialize_json(row["latency_sketch"]))
+            )
+            cell.total = row["total"]
+            cell.passed = row["passed"]
+            cell.errors = row["errors"]
+            cell.input_tokens = row["input_tokens"]
+            cell.output_tokens = row["output_tokens"]
+            cell.latency_sum = row["latency_sum"]
+            self.cells[(row["prompt_id"], row["model_id"])] = cell
+            if self.updated_at is None or row["updated_at"] > self.updated_at:
+                self.updated_at = row["updated_at"]
+
+        return self.total
+
+    async def rebuild(self) -> int:
+        """test_results에서 다시 계산 (저장된 집계가 결과와 맞지 않을 때, 커밋하지 않음)
+
+        Returns:
+            반영한 결과 수
+        """
+        rows = await self.db.fetchall(
+            """
+            SELECT prompt_id, model_id, passed, error, latency_ms, input_tokens, output_tokens,
+                   cached
+            FROM test_results
+            WHERE test_run_id = ?
+            """,
+            (self.test_run_id,)
+        )
+
+        await self.clear()
+        for row in rows:
+            self.add(
+                prompt_id=row["prompt_id"],
+                model_id=row["model_id"],
+                passed=bool(row["passed"]),
+                latency_ms=row["latency_ms"],
+                error=row["error"],
+                input_tokens=row["input_tokens"],
+                output_tokens=row["output_tokens"],
+                cached=bool(row["cached"]),
+            )
+        await self.flush()
+        return len(rows)
+
+    async def clear(self) -> None:
+        """메모리/저장된 집계 삭제 (커밋하지 않음)"""
+        self.cells = {}
+        self._dirty.clear()
+        await self.db.execute(
+            "DELETE FROM run_aggregates WHERE test_run_id = ?",
+            (self.test_run_id,)
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        """전체/프롬프트별/모델별/셀별 집계"""
+        overall = CellAggregate()
+        by_prompt: dict[str, CellAggregate] = {}
+        by_model: dict[str, CellAggregate] = {}
+        for (prompt_id, model_id), cell in self.cells.items():
+            overall.merge(cell)
+            by_prompt.setdefault(prompt_id, CellAggregate()).merge(cell)
+            by_model.setdefault(model_id, CellAggregate()).merge(cell)
+
+        return {
+            "test_run_id": self.test_run_id,
+            **overall.to_dict(),
+            "by_prompt": {key: agg.to_dict() for key, agg in by_prompt.items()},
+            "by_model": {key: agg.to_dict() for key, agg in by_model.items()},
+            "by_cell": [
+                {"prompt_id": prompt_id, "model_id": model_id, **cell.to_dict()}
+                for (prompt_id, model_id), cell in sorted(self.cells.items())
+            ],
+            "updated_at": self.updated_at,
+        }
@@ -1,10 +1,15 @@
-"""테스트 실행 Executor - promptfoo 기반 실제 테스트 실행"""
+"""테스트 실행 Executor - promptfoo / native 엔진 기반 실제 테스트 실행"""
 
 import asyncio
 from pathlib import Path
 from typing import Any
 
-from shared.core.models import TestRunStatus
+from shared.adapters.cache import CachedAdapter, ResponseCache
+from shared.adapters.coalesce import CoalescingAdapter
+from shared.adapters.rate_limit import SchedulingShare, get_rate_limiters, scheduling_share
+from shared.adapters.together_ai import create_together_adapter
+from shared.core.models import ExecutionEngine, TestRunStatus
+from shared.core.native_runner import NativeRunner
 from shared.core.promptfoo_runner import PromptfooRunner
 from shared.core.mapping import MappingResolver, PromptVariableExtractor, AssertionMerger
 from shared.database.database import Database
@@ -12,14 +17,24 @@ from shared.database.database import Database
 from .test_service import TestService
 from .prompt_service import PromptService
 from .dataset_service import DatasetService
+from .run_aggregates import RunAggregates
 
 
 class TestExecutor:
     """테스트 실행 Executor
 
-    TestRun을 받아 promptfoo로 실제 테스트 실행 후 결과 저장
+    TestRun을 받아 promptfoo 또는 native 엔진으로 실제 테스트 실행 후 결과 저장.
+    이미 test_results에 저장된 (prompt, model, case) 셀은 건너뛰므로
+    중단된 실행을 다시 execute하면 남은 셀만 실행한다 (checkpoint/resume).
     """
 
+    # 이 프로세스에서 실행 중인 test_run_id (중단된 running 상태 판별용)
+    active_runs: set[str] = set()
+    # 실행 중인 결과 소비 task (취소 대상)
+    _consumers: dict[str, asyncio.Task] = {}
+    # 취소 요청된 test_run_id → 실행 종료 이벤트
+    _cancel_requests: dict[str, asyncio.Event] = {}
+
     def __init__(
         self,
         db: Database,
@@ -36,17 +51,54 @@ class TestExecutor:
         test_run_id: str,
         timeout: int = 600,
         on_progress: callable = None,
+        engine: str = ExecutionEngine.PROMPTFOO.value,
+        concurrency: int = 8,
+        flush_size: int = 200,
+        flush_interval: float = 1.0,
+        use_cache: bool = False,
+        resume: bool = True,
+        streaming: bool = False,
+        workers: int = 1,
+        shard_size: int | None = None,
+        shard_timeout: int | None = None,
+        shard_retries: int = 1,
+        priority: int = 0,
+        coalesce: bool = True,
+        coalesce_sampled: bool = False,
+        temperature: float = 0.7,
     ) -> dict:
         """테스트 실행
 
         Args:
             test_run_id: 테스트 실행 ID
             timeout: 전체 타임아웃 (초)
-            on_progress: 진행률 콜백 (current, total, status)
+            on_progress: 진행률 콜백 (current, total, status),
+                종료 시 completed/failed/cancelled로 한 번 더 호출
+            engine: 실행 엔진 (promptfoo, native)
+            concurrency: native 엔진 동시 실행 셀 수 (상한, 실제 동시 요청은 rate limiter가 조절)
+            flush_size: 결과 배치 저장 크기
+            flush_interval: 결과 배치 저장 주기 (초)
+            use_cache: LLM 응답 캐시 사용 여부
+            resume: True면 이미 저장된 셀을 건너뜀, False면 기존 결과 삭제 후 처음부터
+            streaming: 스트리밍 측정 모드 (native 엔진 전용, TTFT/토큰 간 지연 저장)
+            workers: promptfoo 엔진 동시 프로세스 수 (1보다 크면 케이스를 shard로 나눠 병렬 실행)
+            shard_size: promptfoo shard당 케이스 수
+            shard_timeout: promptfoo shard 하나의 타임아웃 (초, 기본은 timeout)
+            shard_retries: promptfoo shard 실패 시 재시도 횟수
+            priority: native 엔진 슬롯 우선순위
+                (클수록 먼저, 같은 우선순위 실행끼리는 슬롯을 고르게 나눔)
+            coalesce: native 엔진에서 진행 중인 동일한 temperature 0 요청을 한 호출로 합침
+                (다른 실행의 요청과도, 셀 호출은 temperature=0일 때만,
+                아니면 llm-rubric 채점 호출만)
+            coalesce_sampled: 셀 호출 등 temperature > 0 요청도 합침 (합쳐진 셀은 같은 샘플을 공유)
+            temperature: native 엔진 셀 호출 샘플링 온도 (promptfoo는 프로바이더 기본값)
 
         Returns:
             실행 결과 요약
         """
+        if streaming and engine != ExecutionEngine.NATIVE.value:
+            raise ValueError("streaming measurement requires the native engine")
+
         # 1. 테스트 실행 정보 로드
         test_run = await self.test_service.get_test_run(test_run_id)
         if not test_run:
@@ -57,8 +109,25 @@ class TestExecutor:
             test_run_id,
             TestRunStatus.RUNNING.value,
         )
+        self.active_runs.add(test_run_id)
+        # 이 실행에서 만드는 task의 LLM 요청은 모두 이 share로 (provider, model) 슬롯을 받음
+        share_token = scheduling_share.set(SchedulingShare(test_run_id, priority))
 
         try:
+            # 완료된 셀 로드 (checkpoint) + (prompt, model)별 누적 집계 복원
+            aggregates = RunAggregates(self.db, test_run_id)
+            if resume:
+                # 에러로 끝난 셀은 지우고 다시 실행
+                await self.test_service.delete_error_results(test_run_id)
+                completed = await self.test_service.get_completed_cells(test_run_id)
+                await self.test_service.sync_progress(test_run_id)
+                if await aggregates.load() != len(completed):
+                    await aggregates.rebuild()  # 집계 도입 전 결과, 삭제된 에러 셀 등 불일치
+                    await self.db.commit()
+            else:
+                await self.test_service.clear_test_results(test_run_id)
+                completed = {}
+
             # 3. 프롬프트 정보 로드
             prompts = []
             prompt_map = {}  # promptfoo id → our prompt_id
@@ -86,111 +155,204 @@ class TestExecutor:
                 raise ValueError(f"Dataset not found: {dataset_id}")
             dataset_assertions = dataset.get("default_assertions", [])
 
-            cases_result = await self.dataset_service.list_cases(
-                dataset_id,
-                limit=10000,  # 전체 로드
-            )
-            cases = cases_result["cases"]
-
-            if not cases:
+            first = await self.dataset_service.list_cases(dataset_id, limit=1)
+            if not first["cases"]:
                 raise ValueError(f"Dataset has no cases: {dataset_id}")
 
             # 5. 매핑 + Assertion 병합하여 테스트 케이스 생성
+            # (케이스를 청크 단위로 읽어 바로 엔진에 넘김 → 데이터셋 크기와 무관한 메모리)
             resolved_mapping = test_run["resolved_mapping"]
-            tests = []
-
-            for case in cases:
-                mapped_input = MappingResolver.apply_mapping(
-                    case["raw_input"],
-                    resolved_mapping,
-                )
-
-                # 히든 필드로 case_id 추적 (프롬프트에서 사용 안됨)
-                vars_with_meta = {
-                    **mapped_input,
-                    "__case_id__": case["id"],
-                }
-
-                # 3단계 Assertion 병합
-                # 1. Dataset.default_assertions (Base)
-                # 2. Case.assertions (Override/Add)
-                # 3. expected_output → contains (Safety Net)
-                merged_assertions = AssertionMerger.merge_assertions(
-                    dataset_assertions=dataset_assertions,
-                    case_assertions=case.get("assertions"),
-                    expected_output=case.get("expected_output"),
-                )
-
-                test_config = {"vars": vars_with_meta}
-                if merged_assertions:
-                    test_config["assert"] = merged_assertions
-
-                tests.append(test_config)
-
-            # 6. 모델 목록
             model_ids = test_run["model_ids"]
 
-            # 7. promptfoo 실행
+            async def iter_tests():
+                async for case in self.dataset_service.iter_cases(dataset_id):
+                    # 모든 셀이 이미 완료된 케이스는 건너뜀
+                    if completed and all(
+                        (info["prompt_id"], model_id, case["id"]) in completed
+                        for info in prompt_map.values()
+                        for model_id in model_ids
+                    ):
+                        continue
+
+                    mapped_input = MappingResolver.apply_mapping(
+                        case["raw_input"],
+                        resolved_mapping,
+                    )
+
+                    # 히든 필드로 case_id 추적 (프롬프트에서 사용 안됨)
+                    vars_with_meta = {
+                        **mapped_input,
+                        "__case_id__": case["id"],
+                    }
+
+                    # 3단계 Assertion 병합
+                    # 1. Dataset.default_assertions (Base)
+                    # 2. Case.assertions (Override/Add)
+                    # 3. expected_output → contains (Safety Net)
+                    merged_assertions = AssertionMerger.merge_assertions(
+                        dataset_assertions=dataset_assertions,
+                        case_assertions=case.get("assertions"),
+                        expected_output=case.get("expected_output"),
+                    )
+
+                    test_config = {"vars": vars_with_meta}
+                    if merged_assertions:
+                        test_config["assert"] = merged_assertions
+
+                    yield test_config
+
+            tests = iter_tests()
+
+            # 6. 실행할 셀 수 (완료된 셀 제외)
+            total = test_run["total_cases"]
+            skipped = len(completed)
             if on_progress:
-                on_progress(0, len(tests) * len(prompts) * len(model_ids), "running")
+                on_progress(skipped, total, "running")
 
-            raw_results = await self.runner.run_eval(
-                prompts=prompts,
-                model_ids=model_ids,
-                tests=tests,
-                timeout=timeout,
-            )
-            parsed_results = self.runner.parse_results(raw_results)
+            def should_run(prompt: dict, model_id: str, test: dict) -> bool:
+                key = (
+                    prompt_map[prompt["id"]]["prompt_id"],
+                    model_id,
+                    test["vars"]["__case_id__"],
+                )
+                return key not in completed
 
-            # 8. 결과 저장
             saved_count = 0
-            for result in parsed_results:
-                # promptfoo ID에서 원래 정보 추출
-                pf_prompt_id = result.get("prompt_id")
-                prompt_info = prompt_map.get(pf_prompt_id, {})
-
-                # vars에서 case_id 추출 (히든 필드)
-                vars_data = result.get("vars", {})
-                case_id = vars_data.pop("__case_id__", "unknown")
-
-                # 모델 ID 정리 (openai:chat:model → model)
-                model_id = result.get("model_id", "")
-                if model_id.startswith("openai:chat:"):
-                    model_id = model_id.replace("openai:chat:", "")
-
-                await self.test_service.save_test_result(
-                    test_run_id=test_run_id,
-                    prompt_id=prompt_info.get("prompt_id", "unknown"),
-                    prompt_version=prompt_info.get("version", "unknown"),
-                    model_id=model_id,
-                    test_case_id=case_id,
-                    input_mapped=vars_data,
-                    input_rendered=result.get("prompt_raw", ""),
-                    output=result.get("output", ""),
-                    latency_ms=result.get("latency_ms", 0),
-                    passed=result.get("passed", False),
-                    assertion_results=result.get("assertion_results", []),
-                    input_tokens=result.get("input_tokens"),
-                    output_tokens=result.get("output_tokens"),
-                    error=result.get("error"),
+            passed_count = 0
+            cli_reported = 0
+
+            def on_cli_progress(cells: int) -> None:
+                # promptfoo 출력의 진행률 (JSONL 결과보다 먼저 나올 수 있음, 저장 수와 큰 쪽 사용)
+                nonlocal cli_reported
+                cli_reported += cells
+                current = skipped + max(saved_count, cli_reported)
+                on_progress(min(current, total), total, "running")
+
+            # 7. 엔진 실행 (promptfoo subprocess 또는 native asyncio)
+            native_runner = None
+            if engine not in (ExecutionEngine.NATIVE.value, ExecutionEngine.PROMPTFOO.value):
+                raise ValueError(f"Unknown engine: {engine}")
+
+            if completed and skipped >= total:
+                results = _no_results()  # 모든 셀이 이미 완료됨
+            elif engine == ExecutionEngine.NATIVE.value:
+                # 프로바이더/모델별 rate limit + AIMD 동시성 (configs/models.yaml)
+                adapter = create_together_adapter(
+                    rate_limiters=get_rate_limiters(
+                        self.runner.project_root / "configs" / "models.yaml"
+                    ),
+                )
+                if use_cache:
+                    adapter = CachedAdapter(adapter, ResponseCache(self.db))
+                if coalesce:
+                    # 캐시보다 바깥 → 동시에 들어온 같은 요청은 캐시 조회/저장도 한 번만
+                    adapter = CoalescingAdapter(adapter, sampled=coalesce_sampled)
+                native_runner = NativeRunner(
+                    adapter=adapter,
+                    concurrency=concurrency,
+                    temperature=temperature,
+                    streaming=streaming,
+                )
+                results = native_runner.iter_results(
+                    prompts=prompts,
+                    model_ids=model_ids,
+                    tests=tests,
+                    timeout=timeout,
+                    should_run=should_run if completed else None,
+                )
+            else:
+                results = self.runner.iter_results(
+                    prompts=prompts,
+                    model_ids=model_ids,
+                    tests=tests,
+                    timeout=timeout,
+                    use_cache=use_cache,
+                    workers=workers,
+                    shard_size=shard_size,
+                    shard_timeout=shard_timeout,
+                    shard_retries=shard_retries,
+                    on_progress=on_cli_progress if on_progress else None,
                 )
-                saved_count += 1
 
-                if on_progress:
-                    on_progress(saved_count, len(parsed_results), "running")
+            # 8. 결과 저장 (셀 완료 시마다 버퍼링 → 배치 트랜잭션 저장)
+            writer = self.test_service.result_writer(
+                test_run_id,
+                flush_size=flush_size,
+                flush_interval=flush_interval,
+                aggregates=aggregates,
+            )
+
+            async def consume() -> None:
+                nonlocal saved_count, passed_count
+                async for result in results:
+                    record = self._to_record(prompt_map, result)
+                    key = (record["prompt_id"], record["model_id"], record["test_case_id"])
+                    if key in completed:
+                        continue  # 부분 완료 케이스를 promptfoo가 다시 실행한 셀
+
+                    await writer.add(**record)
+                    saved_count += 1
+                    if record["passed"]:
+                        passed_count += 1
+
+                    if on_progress:
+                        current = skipped + max(saved_count, cli_reported)
+                        on_progress(min(current, total), total, "running")
+
+            # 별도 task로 소비 → cancel()이 이 task만 취소
+            # (진행 중인 셀/프로세스 정리 후 저장분 유지)
+            consumer = asyncio.create_task(consume())
+            self._consumers[test_run_id] = consumer
+            if test_run_id in self._cancel_requests:
+                consumer.cancel()
+            try:
+                await consumer
+            finally:
+                await writer.close()
+                await results.aclose()
+                await tests.aclose()
+                if native_runner:
+                    await native_runner.close()
 
             # 9. 완료 상태로 변경
             await self.test_service.update_test_run_status(
                 test_run_id,
                 TestRunStatus.COMPLETED.value,
             )
+            if on_progress:
+                on_progress(skipped + saved_count, total, "completed")
 
+            previously_passed = sum(1 for passed in completed.values() if passed)
             return {
                 "test_run_id": test_run_id,
                 "status": "completed",
+                "total_results": skipped + saved_count,
+                "passed": previously_passed + passed_count,
+                "failed": skipped + saved_count - previously_passed - passed_count,
+                "resumed_cells": skipped,
+            }
+
+        except asyncio.CancelledError:
+            if test_run_id not in self._cancel_requests:
+                raise  # 프로세스 종료 등 → running 상태로 남겨 재개 가능
+
+            # 취소 요청 → 저장된 결과 기준으로 진행률 맞추고 취소 상태로 변경
+            saved_count = await self.test_service.sync_progress(test_run_id)
+            saved = await self.test_service.get_completed_cells(test_run_id)
+            await self.test_service.update_test_run_status(
+                test_run_id,
+                TestRunStatus.CANCELLED.value,
+            )
+            if on_progress:
+                on_progress(saved_count, test_run["total_cases"], "cancelled")
+
+            passed = sum(1 for cell_passed in saved.values() if cell_passed)
+            return {
+                "test_run_id": test_run_id,
+                "status": "cancelled",
                 "total_results": saved_count,
-                "passed": sum(1 for r in parsed_results if r.get("passed")),
-                "failed": sum(1 for r in parsed_results if not r.get("passed")),
+                "passed": passed,
+                "failed": saved_count - passed,
             }
 
         except Exception as e:
@@ -200,15 +362,94 @@ class TestExecutor:
                 TestRunStatus.FAILED.value,
                 error_message=str(e),
             )
+            if on_progress:
+                failed_run = await self.test_service.get_test_run(test_run_id)
+                on_progress(failed_run["completed_cases"], failed_run["total_cases"], "failed")
             raise
 
+        finally:
+            scheduling_share.reset(share_token)
+            self.active_runs.discard(test_run_id)
+            self._consumers.pop(test_run_id, None)
+            stopped = self._cancel_requests.pop(test_run_id, None)
+            if stopped:
+                stopped.set()
+
+    @classmethod
+    async def cancel(cls, test_run_id: str, wait: float = 30.0) -> bool:
+        """이 프로세스에서 실행 중인 테스트 취소
+
+        새 셀 스케줄링을 멈추고 진행 중인 LLM 요청(native) 또는 promptfoo 프로세스를 종료한다.
+        이미 저장된 결과는 유지되고 상태는 cancelled가 된다 (다시 execute하면 남은 셀부터 재개).
+
+        Args:
+            test_run_id: 테스트 실행 ID
+            wait: 실행이 정리될 때까지 기다릴 최대 시간 (초)
+
+        Returns:
+            이 프로세스에서 실행 중이어서 취소를 요청했으면 True
+        """
+        if test_run_id not in cls.active_runs:
+            return False
+
+        stopped = cls._cancel_requests.setdefault(test_run_id, asyncio.Event())
+        consumer = cls._consumers.get(test_run_id)
+        if consumer:
+            consumer.cancel()
+
+        try:
+            await asyncio.wait_for(stopped.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+        return True
+
+    def _to_record(self, prompt_map: dict, result: dict) -> dict:
+        """파싱된 셀 결과 → ResultWriter.add 인자"""
+        # promptfoo ID에서 원래 정보 추출
+        pf_prompt_id = result.get("prompt_id")
+        prompt_info = prompt_map.get(pf_prompt_id, {})
+
+        # vars에서 case_id 추출 (히든 필드)
+        vars_data = result.get("vars") or {}
+        case_id = vars_data.pop("__case_id__", "unknown")
+
+        # 모델 ID 정리 (openai:chat:model → model)
+        model_id = result.get("model_id") or ""
+        if model_id.startswith("openai:chat:"):
+            model_id = model_id.replace("openai:chat:", "")
+
+        return {
+            "prompt_id": prompt_info.get("prompt_id", "unknown"),
+            "prompt_version": prompt_info.get("version", "unknown"),
+            "model_id": model_id,
+            "test_case_id": case_id,
+            "input_mapped": vars_data,
+            "input_rendered": result.get("prompt_raw") or "",
+            "output": result.get("output") or "",
+            "latency_ms": result.get("latency_ms") or 0,
+            "passed": bool(result.get("passed", False)),
+            "assertion_results": result.get("assertion_results", []),
+            "input_tokens": result.get("input_tokens"),
+            "output_tokens": result.get("output_tokens"),
+            "error": result.get("error"),
+            "stream_metrics": result.get("stream_metrics"),
+            "cached": bool(result.get("cached")),
+        }
+
+
+async def _no_results():
+    """빈 결과 스트림"""
+    return
+    yield
+
 
 async def execute_test_run(
     db: Database,
     test_run_id: str,
     project_root: Path | None = None,
     timeout: int = 600,
+    engine: str = ExecutionEngine.PROMPTFOO.value,
 ) -> dict:
     """편의 함수: 테스트 실행"""
     executor = TestExecutor(db, project_root=project_root)
-    return await executor.execute(test_run_id, timeout=timeout)
+    return await executor.execute(test_run_id, timeout=timeout, engine=engine)
@@ -10,15 +10,29 @@ from shared.database.database import Database
 
 from .prompt_service import PromptService
 from .dataset_service import DatasetService
+from .evaluation_service import EvaluationService
+from .pagination import decode_cursor, keyset_page
+from .result_writer import ResultWriter
+from .run_aggregates import RunAggregates
 
 
 class TestService:
     """테스트 실행 및 결과 관리"""
 
+    INSERT_RESULT_SQL = """
+        INSERT INTO test_results
+        (id, test_run_id, prompt_id, prompt_version, model_id, test_case_id,
+         input_mapped, input_rendered, output, latency_ms, input_tokens, output_tokens,
+         assertion_results, passed, error,
+         ttft_ms, tokens_per_second, itl_p50_ms, itl_p95_ms, itl_p99_ms, cached, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(self, db: Database):
         self.db = db
         self.prompt_service = PromptService(db)
         self.dataset_service = DatasetService(db)
+        self.evaluation_service = EvaluationService(db)
 
     # =========================================================================
     # 테스트 실행
@@ -45,7 +59,9 @@ class TestService:
             raise ValueError(f"Dataset not found: {dataset_id}")
 
         # 케이스 조회
-        cases_result = await self.dataset_service.list_cases(dataset_id, limit=1)
+        cases_result = await self.dataset_service.list_cases(
+            dataset_id, limit=1, include_total=True
+        )
         if not cases_result["cases"]:
             raise ValueError(f"Dataset has no cases: {dataset_id}")
 
@@ -121,8 +137,17 @@ class TestService:
         limit: int = 20,
         offset: int = 0,
         status: str | None = None,
+        cursor: str | None = None,
+        include_total: bool = False,
     ) -> dict:
-        """테스트 실행 목록 조회"""
+        """테스트 실행 목록 조회 (최신순)
+
+        cursor가 있으면 (created_at, id) keyset으로 이어서 조회하고 offset은 무시한다.
+        COUNT(*)는 include_total=True일 때만 실행 (아니면 total은 None).
+
+        Raises:
+            ValueError: 형식이 잘못된 cursor
+        """
         where = []
         params = []
 
@@ -130,30 +155,43 @@ class TestService:
             where.append("status = ?")
             params.append(status)
 
-        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
-
-        count_row = await self.db.fetchone(
-            f"SELECT COUNT(*) as cnt FROM test_runs {where_clause}",
-            tuple(params) if params else None
-        )
-        total = count_row["cnt"] if count_row else 0
+        total = None
+        if include_total:
+            where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+            count_row = await self.db.fetchone(
+                f"SELECT COUNT(*) as cnt FROM test_runs {where_clause}",
+                tuple(params) if params else None
+            )
+            total = count_row["cnt"] if count_row else 0
+
+        if cursor:
+            before = decode_cursor(cursor, ("created_at", "id"))
+            where.append("(created_at, id) < (?, ?)")
+            params.extend([before["created_at"], before["id"]])
+            params.append(limit + 1)
+            page_clause = "LIMIT ?"
+        else:
+            params.extend([limit + 1, offset])
+            page_clause = "LIMIT ? OFFSET ?"
 
-        params.extend([limit, offset])
+        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
         rows = await self.db.fetchall(
             f"""
             SELECT * FROM test_runs
             {where_clause}
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
+            ORDER BY created_at DESC, id DESC
+            {page_clause}
             """,
             tuple(params)
         )
+        rows, next_cursor = keyset_page(rows, limit)
 
         return {
             "test_runs": [self._run_to_dict(row) for row in rows],
             "total": total,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
         }
 
     async def delete_test_run(self, test_run_id: str) -> bool:
@@ -163,6 +201,9 @@ class TestService:
             return False
 
         await self.db.execute("DELETE FROM test_runs WHERE id = ?", (test_run_id,))
+        await self.db.execute("DELETE FROM jobs WHERE test_run_id = ?", (test_run_id,))
+        await self.evaluation_service.invalidate(test_run_id)
+        await RunAggregates(self.db, test_run_id).clear()
         await self.db.commit()
         return True
 
@@ -175,23 +216,48 @@ class TestService:
         test_run_id: str,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
+        include_total: bool = False,
     ) -> dict:
-        """테스트 결과 조회"""
-        count_row = await self.db.fetchone(
-            "SELECT COUNT(*) as cnt FROM test_results WHERE test_run_id = ?",
-            (test_run_id,)
-        )
-        total = count_row["cnt"] if count_row else 0
+        """테스트 결과 조회
 
-        rows = await self.db.fetchall(
-            """
-            SELECT * FROM test_results
-            WHERE test_run_id = ?
-            ORDER BY created_at
-            LIMIT ? OFFSET ?
-            """,
-            (test_run_id, limit, offset)
-        )
+        cursor가 있으면 (created_at, id) keyset으로 이어서 조회하고 offset은 무시한다.
+        (test_run_id, created_at, id) 인덱스를 타므로 마지막 페이지도 첫 페이지와 비용이 같다.
+        COUNT(*)는 include_total=True일 때만 실행 (아니면 total은 None).
+
+        Raises:
+            ValueError: 형식이 잘못된 cursor
+        """
+        total = None
+        if include_total:
+            count_row = await self.db.fetchone(
+                "SELECT COUNT(*) as cnt FROM test_results WHERE test_run_id = ?",
+                (test_run_id,)
+            )
+            total = count_row["cnt"] if count_row else 0
+
+        if cursor:
+            after = decode_cursor(cursor, ("created_at", "id"))
+            rows = await self.db.fetchall(
+                """
+                SELECT * FROM test_results
+                WHERE test_run_id = ? AND (created_at, id) > (?, ?)
+                ORDER BY created_at, id
+                LIMIT ?
+                """,
+                (test_run_id, after["created_at"], after["id"], limit + 1)
+            )
+        else:
+            rows = await self.db.fetchall(
+                """
+                SELECT * FROM test_results
+                WHERE test_run_id = ?
+                ORDER BY created_at, id
+                LIMIT ? OFFSET ?
+                """,
+                (test_run_id, limit + 1, offset)
+            )
+        rows, next_cursor = keyset_page(rows, limit)
 
         return {
             "test_run_id": test_run_id,
@@ -199,6 +265,48 @@ class TestService:
             "total": total,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
+        }
+
+    async def get_stream_metrics_by_model(self, test_run_id: str) -> dict[str, dict]:
+        """모델별 스트리밍 지표 집계 (측정 모드로 실행된 결과만)
+
+        TTFT 백분위수는 nearest-rank (SQLite에 percentile 함수가 없어 윈도 함수로 계산),
+        tokens/sec와 토큰 간 지연은 셀별 값의 평균.
+        """
+        rows = await self.db.fetchall(
+            """
+            WITH ranked AS (
+                SELECT
+                    model_id, ttft_ms, latency_ms, tokens_per_second,
+                    itl_p50_ms, itl_p95_ms, itl_p99_ms,
+                    ROW_NUMBER() OVER (PARTITION BY model_id ORDER BY ttft_ms) AS rn,
+                    COUNT(*) OVER (PARTITION BY model_id) AS n
+                FROM test_results
+                WHERE test_run_id = ? AND ttft_ms IS NOT NULL AND error IS NULL
+            )
+            SELECT
+                model_id,
+                COUNT(*) AS count,
+                AVG(ttft_ms) AS avg_ttft_ms,
+                MIN(CASE WHEN rn >= 0.50 * n THEN ttft_ms END) AS p50_ttft_ms,
+                MIN(CASE WHEN rn >= 0.95 * n THEN ttft_ms END) AS p95_ttft_ms,
+                MIN(CASE WHEN rn >= 0.99 * n THEN ttft_ms END) AS p99_ttft_ms,
+                AVG(latency_ms) AS avg_total_ms,
+                AVG(tokens_per_second) AS avg_tokens_per_second,
+                AVG(itl_p50_ms) AS avg_itl_p50_ms,
+                AVG(itl_p95_ms) AS avg_itl_p95_ms,
+                MAX(itl_p99_ms) AS max_itl_p99_ms
+            FROM ranked
+            GROUP BY model_id
+            ORDER BY model_id
+            """,
+            (test_run_id,)
+        )
+
+        return {
+            row["model_id"]: {key: row[key] for key in row.keys() if key != "model_id"}
+            for row in rows
         }
 
     async def save_test_result(
@@ -217,57 +325,210 @@ class TestService:
         input_tokens: int | None = None,
         output_tokens: int | None = None,
         error: str | None = None,
+        stream_metrics: dict | None = None,
+        cached: bool = False,
     ) -> dict:
-        """테스트 결과 저장"""
-        result_id = f"result_{uuid.uuid4().hex[:8]}"
-        now = self.db.now_iso()
+        """테스트 결과 저장 (1건 즉시 커밋)
+
+        대량 저장은 result_writer()로 배치 저장
+        """
+        result_id = self.new_result_id()
 
         await self.db.execute(
-            """
-            INSERT INTO test_results
-            (id, test_run_id, prompt_id, prompt_version, model_id, test_case_id,
-             input_mapped, input_rendered, output, latency_ms, input_tokens, output_tokens,
-             assertion_results, passed, error, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                result_id,
-                test_run_id,
-                prompt_id,
-                prompt_version,
-                model_id,
-                test_case_id,
-                self.db.serialize_json(input_mapped),
-                input_rendered,
-                output,
-                latency_ms,
-                input_tokens,
-                output_tokens,
-                self.db.serialize_json(assertion_results or []),
-                1 if passed else 0,
-                error,
-                now,
+            self.INSERT_RESULT_SQL,
+            self.result_params(
+                result_id=result_id,
+                test_run_id=test_run_id,
+                prompt_id=prompt_id,
+                prompt_version=prompt_version,
+                model_id=model_id,
+                test_case_id=test_case_id,
+                input_mapped=input_mapped,
+                input_rendered=input_rendered,
+                output=output,
+                latency_ms=latency_ms,
+                passed=passed,
+                assertion_results=assertion_results,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                error=error,
+                stream_metrics=stream_metrics,
+                cached=cached,
             ),
         )
 
         # 진행률 업데이트
+        await self.increment_progress(test_run_id, 1)
+
+        await self.db.commit()
+
+        return {
+            "id": result_id,
+            "test_run_id": test_run_id,
+            "passed": passed,
+        }
+
+    async def get_completed_cells(self, test_run_id: str) -> dict[tuple[str, str, str], bool]:
+        """에러 없이 저장된 셀 목록 (resume용, 에러 셀은 다시 실행 대상)
+
+        Returns:
+            {(prompt_id, model_id, test_case_id): passed}
+        """
+        rows = await self.db.fetchall(
+            """
+            SELECT prompt_id, model_id, test_case_id, passed
+            FROM test_results
+            WHERE test_run_id = ? AND error IS NULL
+            """,
+            (test_run_id,)
+        )
+        return {
+            (row["prompt_id"], row["model_id"], row["test_case_id"]): bool(row["passed"])
+            for row in rows
+        }
+
+    async def delete_error_results(self, test_run_id: str) -> int:
+        """에러로 끝난 셀 결과 삭제 (resume 시 다시 실행, 중복 행 방지)
+
+        Returns:
+            삭제된 결과 수
+        """
+        cursor = await self.db.execute(
+            "DELETE FROM test_results WHERE test_run_id = ? AND error IS NOT NULL",
+            (test_run_id,)
+        )
+        if cursor.rowcount:
+            await self.evaluation_service.invalidate(test_run_id)
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def sync_progress(self, test_run_id: str) -> int:
+        """진행률을 실제 저장된 결과 수에 맞춤
+
+        Returns:
+            저장된 결과 수
+        """
+        row = await self.db.fetchone(
+            "SELECT COUNT(*) AS count FROM test_results WHERE test_run_id = ?",
+            (test_run_id,)
+        )
         await self.db.execute(
             """
             UPDATE test_runs
-            SET completed_cases = completed_cases + 1,
-                progress = CAST((completed_cases + 1) * 100.0 / total_cases AS INTEGER)
+            SET completed_cases = ?,
+                progress = CAST(? * 100.0 / MAX(total_cases, 1) AS INTEGER)
             WHERE id = ?
             """,
-            (test_run_id,)
+            (row["count"], row["count"], test_run_id)
         )
+        await self.db.commit()
+        return row["count"]
 
+    async def clear_test_results(self, test_run_id: str) -> None:
+        """저장된 결과 삭제 + 진행률 초기화 (처음부터 재실행)"""
+        await self.db.execute("DELETE FROM test_results WHERE test_run_id = ?", (test_run_id,))
+        await self.db.execute(
+            "UPDATE test_runs SET completed_cases = 0, progress = 0 WHERE id = ?",
+            (test_run_id,)
+        )
+        await self.evaluation_service.invalidate(test_run_id)
+        await RunAggregates(self.db, test_run_id).clear()
         await self.db.commit()
 
-        return {
-            "id": result_id,
-            "test_run_id": test_run_id,
-            "passed": passed,
-        }
+    def result_writer(
+        self,
+        test_run_id: str,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        aggregates: RunAggregates | None = None,
+    ) -> ResultWriter:
+        """배치 결과 저장기 생성
+
+        Args:
+            test_run_id: 테스트 실행 ID
+            flush_size: 버퍼가 이 크기에 도달하면 flush
+            flush_interval: 마지막 flush 이후 이 시간(초)이 지나면 flush
+            aggregates: (prompt, model)별 누적 집계 (flush 때 함께 저장)
+        """
+        return ResultWriter(
+            self,
+            test_run_id,
+            flush_size=flush_size,
+            flush_interval=flush_interval,
+            aggregates=aggregates,
+        )
+
+    async def increment_progress(self, test_run_id: str, count: int) -> None:
+        """완료 케이스 수/진행률 증가 + 평가 요약 캐시 무효화 (커밋하지 않음)"""
+        await self.db.execute(
+            """
+            UPDATE test_runs
+            SET completed_cases = completed_cases + ?,
+                progress = CAST((completed_cases + ?) * 100.0 / total_cases AS INTEGER)
+            WHERE id = ?
+            """,
+            (count, count, test_run_id)
+        )
+        await self.evaluation_service.invalidate(test_run_id)
+
+    @staticmethod
+    def new_result_id() -> str:
+        """결과 ID 생성
+
+        실행당 결과가 10만 건 단위이므로 8자리(32bit)는 충돌 확률이 높아 16자리 사용
+        """
+        return f"result_{uuid.uuid4().hex[:16]}"
+
+    def result_params(
+        self,
+        result_id: str,
+        test_run_id: str,
+        prompt_id: str,
+        prompt_version: str,
+        model_id: str,
+        test_case_id: str,
+        input_mapped: dict,
+        input_rendered: str,
+        output: str,
+        latency_ms: float,
+        passed: bool,
+        assertion_results: list[dict] | None = None,
+        input_tokens: int | None = None,
+        output_tokens: int | None = None,
+        error: str | None = None,
+        stream_metrics: dict | None = None,
+        cached: bool = False,
+    ) -> tuple:
+        """INSERT_RESULT_SQL 파라미터 생성 (created_at 포함)
+
+        stream_metrics: 스트리밍 측정 모드 지표 (StreamMetrics.model_dump(), 없으면 NULL)
+        cached: 캐시 응답 여부 (True면 latency 집계에서 제외)
+        """
+        metrics = stream_metrics or {}
+        return (
+            result_id,
+            test_run_id,
+            prompt_id,
+            prompt_version,
+            model_id,
+            test_case_id,
+            self.db.serialize_json(input_mapped),
+            input_rendered,
+            output,
+            latency_ms,
+            input_tokens,
+            output_tokens,
+            self.db.serialize_json(assertion_results or []),
+            1 if passed else 0,
+            error,
+            metrics.get("ttft_ms"),
+            metrics.get("tokens_per_second"),
+            metrics.get("itl_p50_ms"),
+            metrics.get("itl_p95_ms"),
+            metrics.get("itl_p99_ms"),
+            1 if cached else 0,
+            self.db.now_iso(),
+        )
 
     async def update_test_run_status(
         self,
@@ -283,7 +544,11 @@ class TestService:
         if status == TestRunStatus.RUNNING.value:
             updates.append("started_at = ?")
             params.append(now)
-        elif status in [TestRunStatus.COMPLETED.value, TestRunStatus.FAILED.value]:
+        elif status in [
+            TestRunStatus.COMPLETED.value,
+            TestRunStatus.FAILED.value,
+            TestRunStatus.CANCELLED.value,
+        ]:
             updates.append("completed_at = ?")
             params.append(now)
 
@@ -424,5 +689,16 @@ class TestService:
             "assertion_results": self.db.deserialize_json(row["assertion_results"]),
             "passed": bool(row["passed"]),
             "error": row["error"],
+            "cached": bool(row["cached"]),
+            "stream_metrics": (
+                {
+                    "ttft_ms": row["ttft_ms"],
+                    "tokens_per_second": row["tokens_per_second"],
+                    "itl_p50_ms": row["itl_p50_ms"],
+                    "itl_p95_ms": row["itl_p95_ms"],
+                    "itl_p99_ms": row["itl_p99_ms"],
+                }
+                if row["ttft_ms"] is not None else None
+            ),
             "created_at": row["created_at"],
         }
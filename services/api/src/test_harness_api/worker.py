@@ -0,0 +1,138 @@
+"""테스트 실행 워커
+
+jobs 테이블에서 작업을 claim해서 TestExecutor로 실행하는 별도 프로세스.
+API 서버와 같은 DB 파일을 공유하며, 여러 개를 띄워도 작업이 중복 실행되지 않는다.
+
+    python -m test_harness_api.worker --max-jobs 2
+
+- 작업 실행 (heartbeat, 취소 요청 확인, lease 상실 처리)은 JobRunner
+- SIGTERM/SIGINT → 새 작업을 받지 않고 실행 중인 작업을 대기 상태로 되돌린 뒤 종료
+  (다른 워커가 이미 저장된 셀을 건너뛰고 재개)
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import uuid
+from pathlib import Path
+
+from shared.adapters.http_pool import close_http_pool, get_http_pool
+from shared.database.database import Database
+
+from .services.job_queue import JobQueue
+from .services.job_runner import JobRunner
+
+# worker.py → test_harness_api → src → api → services → Test-Harness
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent.parent
+
+
+class Worker:
+    """작업 큐 소비 워커"""
+
+    def __init__(
+        self,
+        db: Database,
+        worker_id: str | None = None,
+        project_root: Path | None = None,
+        max_jobs: int = 1,
+        poll_interval: float = 2.0,
+        lease_seconds: float = 60.0,
+    ):
+        self.db = db
+        self.queue = JobQueue(db)
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:4]}"
+        )
+        self.project_root = project_root or PROJECT_ROOT
+        self.max_jobs = max_jobs
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.runner = JobRunner(
+            db, self.worker_id, project_root=self.project_root, lease_seconds=lease_seconds
+        )
+        self._running: dict[str, asyncio.Task] = {}  # job_id → 실행 task
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """stop이 set될 때까지 작업을 claim해서 실행"""
+        try:
+            while not stop.is_set():
+                job = None
+                if len(self._running) < self.max_jobs:
+                    job = await self.queue.claim(self.worker_id, self.lease_seconds)
+
+                if job:
+                    task = asyncio.create_task(self._run_job(job))
+                    self._running[job["id"]] = task
+                    task.add_done_callback(
+                        lambda _, job_id=job["id"]: self._running.pop(job_id, None)
+                    )
+                    continue  # 남은 자리가 있으면 바로 다음 작업 확인
+
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # 실행 중인 작업 중단 → 각 task가 작업을 대기 상태로 되돌림
+            tasks = list(self._running.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_job(self, job: dict) -> None:
+        """작업 하나 실행 (종료 시그널이면 작업을 대기 상태로 되돌림)"""
+        try:
+            await self.runner.run(job)
+        except Exception:
+            pass  # test_run과 작업에 이미 failed로 기록됨
+
+
+async def main(args: argparse.Namespace) -> None:
+    db = Database(Path(args.db))
+    await db.connect()
+    get_http_pool(PROJECT_ROOT / "configs" / "models.yaml")
+
+    worker = Worker(
+        db,
+        worker_id=args.worker_id,
+        max_jobs=args.max_jobs,
+        poll_interval=args.poll_interval,
+        lease_seconds=args.lease_seconds,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass  # Windows → Ctrl+C는 KeyboardInterrupt로 처리
+
+    print(f"Worker {worker.worker_id} started (max_jobs={worker.max_jobs}).")
+    try:
+        await worker.run(stop)
+    finally:
+        await close_http_pool()
+        await db.close()
+        print(f"Worker {worker.worker_id} stopped.")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Test Harness 실행 워커")
+    parser.add_argument(
+        "--db", default="data/test_harness.db", help="SQLite DB 경로 (API 서버와 같은 파일)"
+    )
+    parser.add_argument("--worker-id", default=None, help="워커 ID (기본: 호스트-PID)")
+    parser.add_argument("--max-jobs", type=int, default=1, help="동시에 실행할 작업 수")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="대기 작업 확인 주기 (초)")
+    parser.add_argument("--lease-seconds", type=float, default=60.0, help="작업 lease 길이 (초)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        pass
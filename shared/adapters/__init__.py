@@ -1,14 +1,44 @@
-from .base import BaseLLMAdapter, LLMResponse, AdapterFactory
+from .base import BaseLLMAdapter, LLMResponse, StreamMetrics, AdapterFactory
 from .openai_compat import OpenAICompatibleAdapter
 from .together_ai import create_together_adapter, get_model_id, list_available_models, TOGETHER_MODELS
+from .cache import ResponseCache, CachedAdapter
+from .coalesce import InflightRequests, CoalescingAdapter, get_inflight_requests
+from .rate_limit import (
+    RateLimitConfig,
+    RateLimiter,
+    RateLimiterRegistry,
+    SchedulingShare,
+    get_rate_limiters,
+    scheduling_share,
+)
+from .retry import RetryPolicy, NO_RETRY
+from .http_pool import HTTPPoolConfig, HTTPClientPool, get_http_pool, close_http_pool
 
 __all__ = [
     "BaseLLMAdapter",
     "LLMResponse",
+    "StreamMetrics",
     "AdapterFactory",
     "OpenAICompatibleAdapter",
     "create_together_adapter",
     "get_model_id",
     "list_available_models",
     "TOGETHER_MODELS",
+    "ResponseCache",
+    "CachedAdapter",
+    "InflightRequests",
+    "CoalescingAdapter",
+    "get_inflight_requests",
+    "RateLimitConfig",
+    "RateLimiter",
+    "RateLimiterRegistry",
+    "get_rate_limiters",
+    "SchedulingShare",
+    "scheduling_share",
+    "RetryPolicy",
+    "NO_RETRY",
+    "HTTPPoolConfig",
+    "HTTPClientPool",
+    "get_http_pool",
+    "close_http_pool",
 ]
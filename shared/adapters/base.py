@@ -1,19 +1,80 @@
 """LLM 어댑터 기본 인터페이스"""
 
+import time
 from abc import ABC, abstractmethod
 from typing import AsyncIterator, Any
 
 from pydantic import BaseModel
 
 
+def percentile(values: list[float], q: float) -> float | None:
+    """백분위수 (선형 보간, q: 0~100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+class StreamMetrics(BaseModel):
+    """스트리밍 응답 지연 지표"""
+    ttft_ms: float                          # 요청 시작 → 첫 토큰
+    total_ms: float                         # 요청 시작 → 스트림 종료
+    tokens_per_second: float | None = None  # 첫 토큰 이후 디코딩 속도
+    itl_p50_ms: float | None = None         # 토큰 간 지연 (inter-token latency)
+    itl_p95_ms: float | None = None
+    itl_p99_ms: float | None = None
+
+    @classmethod
+    def from_timings(
+        cls,
+        start: float,
+        token_times: list[float],
+        end: float,
+        output_tokens: int | None = None,
+    ) -> "StreamMetrics":
+        """perf_counter 시각으로 지표 계산
+
+        Args:
+            start: 요청 시작 시각
+            token_times: 내용이 있는 청크 수신 시각 목록
+            end: 스트림 종료 시각
+            output_tokens: 실제 출력 토큰 수 (usage, 없으면 청크 수로 근사)
+        """
+        if not token_times:
+            total_ms = (end - start) * 1000
+            return cls(ttft_ms=total_ms, total_ms=total_ms)
+
+        gaps = [(b - a) * 1000 for a, b in zip(token_times, token_times[1:])]
+        tokens = output_tokens or len(token_times)
+        decode_seconds = end - token_times[0]
+        return cls(
+            ttft_ms=(token_times[0] - start) * 1000,
+            total_ms=(end - start) * 1000,
+            tokens_per_second=(
+                (tokens - 1) / decode_seconds if tokens > 1 and decode_seconds > 0 else None
+            ),
+            itl_p50_ms=percentile(gaps, 50),
+            itl_p95_ms=percentile(gaps, 95),
+            itl_p99_ms=percentile(gaps, 99),
+        )
+
+
 class LLMResponse(BaseModel):
     """LLM 응답"""
     content: str
-    latency_ms: float
+    latency_ms: float               # 마지막 시도의 지연 시간 (백오프 대기 제외)
     input_tokens: int | None = None
     output_tokens: int | None = None
     model: str
     raw_response: dict[str, Any] | None = None
+    cached: bool = False            # 응답 캐시에서 반환된 경우 True
+    coalesced: bool = False         # 진행 중이던 같은 요청의 응답을 공유한 경우 True
+    attempts: int = 1               # 재시도 포함 총 시도 횟수
+    backoff_ms: float = 0.0         # 재시도 대기 시간 합계
+    stream_metrics: StreamMetrics | None = None  # generate_measured로 생성한 경우
 
 
 class BaseLLMAdapter(ABC):
@@ -49,6 +110,40 @@ class BaseLLMAdapter(ABC):
         """스트리밍 응답 생성"""
         pass
 
+    async def generate_measured(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """스트리밍으로 응답 생성 + TTFT/토큰 간 지연 측정
+
+        기본 구현은 generate_stream 청크를 토큰으로 간주한다.
+        usage를 받을 수 있는 어댑터는 오버라이드해서 실제 토큰 수를 사용한다.
+        """
+        chunks: list[str] = []
+        token_times: list[float] = []
+        start = time.perf_counter()
+        async for chunk in self.generate_stream(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        ):
+            token_times.append(time.perf_counter())
+            chunks.append(chunk)
+        metrics = StreamMetrics.from_timings(start, token_times, time.perf_counter())
+
+        return LLMResponse(
+            content="".join(chunks),
+            latency_ms=metrics.total_ms,
+            model=model,
+            stream_metrics=metrics,
+        )
+
     async def health_check(self) -> bool:
         """연결 상태 확인"""
         return True
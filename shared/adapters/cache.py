@@ -0,0 +1,294 @@
+"""LLM 응답 캐시 (content-addressed)
+
+캐시 키 = SHA-256(어댑터 엔드포인트 + 모델 + 렌더링된 프롬프트 + 샘플링 파라미터).
+프롬프트 5개 중 1개만 수정한 뒤 회귀 테스트를 다시 돌리면
+바뀌지 않은 프롬프트의 호출은 캐시에서 바로 반환된다.
+"""
+
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Any
+
+from ..database.database import Database
+from .base import BaseLLMAdapter, LLMResponse
+
+
+class ResponseCache:
+    """SQLite(llm_cache 테이블) 기반 LLM 응답 캐시
+
+    - TTL: created_at 기준 ttl_seconds가 지난 항목은 miss 처리 후 삭제
+    - 크기: max_entries 초과 시 accessed_at이 오래된 항목부터 삭제 (LRU)
+    - 쓰기: hit 통계와 새 항목은 메모리에 모았다가 FLUSH_EVERY번마다 (또는 flush())
+      한 트랜잭션으로 저장 → 조회/저장마다 커밋하지 않음
+    """
+
+    # put 몇 번마다 크기 기반 eviction을 수행할지
+    EVICT_EVERY = 100
+
+    # hit/put 몇 번마다 모아둔 쓰기를 저장할지
+    FLUSH_EVERY = 100
+
+    def __init__(
+        self,
+        db: Database,
+        ttl_seconds: int | None = 7 * 24 * 3600,
+        max_entries: int | None = 100_000,
+    ):
+        """
+        Args:
+            db: 데이터베이스 (llm_cache 테이블 사용)
+            ttl_seconds: 항목 유효 시간 (None이면 만료 없음)
+            max_entries: 최대 항목 수 (None이면 제한 없음)
+        """
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._puts_since_evict = 0
+        self._pending_puts: dict[str, tuple] = {}  # cache_key → INSERT 파라미터
+        self._pending_hits: dict[str, tuple[int, str]] = {}  # cache_key → (hit 수, accessed_at)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        namespace: str,
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        **params: Any,
+    ) -> str:
+        """캐시 키 생성 (파라미터 순서와 무관)"""
+        payload = {
+            "namespace": namespace,
+            "model": model,
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "params": params,
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> LLMResponse | None:
+        """캐시 조회 (만료된 항목은 None)
+
+        반환되는 응답은 cached=True, latency_ms=0 (호출하지 않았으므로, 결과 저장 시 cached로
+        표시되어 latency 집계에서 제외됨).
+        """
+        pending = self._pending_puts.get(key)
+        if pending is not None:
+            response_json, created_at = pending[2], pending[3]
+        else:
+            row = await self.db.fetchone(
+                "SELECT response, created_at FROM llm_cache WHERE cache_key = ?",
+                (key,)
+            )
+            if not row:
+                self.misses += 1
+                return None
+            response_json, created_at = row["response"], row["created_at"]
+
+        if self._is_expired(created_at):
+            # 삭제는 다음 evict()에서
+            self.misses += 1
+            return None
+
+        count, _ = self._pending_hits.get(key, (0, ""))
+        self._pending_hits[key] = (count + 1, self.db.now_iso())
+        self.hits += 1
+        await self._maybe_flush()
+
+        return LLMResponse.model_validate_json(response_json).model_copy(
+            update={"cached": True, "latency_ms": 0.0}
+        )
+
+    async def put(self, key: str, response: LLMResponse) -> None:
+        """캐시 저장 (FLUSH_EVERY번마다 DB 반영)"""
+        now = self.db.now_iso()
+        self._pending_puts[key] = (key, response.model, response.model_dump_json(), now, now)
+        self._pending_hits.pop(key, None)  # 새 항목은 hit_count 0부터
+        await self._maybe_flush()
+
+    async def flush(self) -> None:
+        """모아둔 새 항목과 hit 통계를 한 트랜잭션으로 저장"""
+        puts = list(self._pending_puts.values())
+        hits = [
+            (count, accessed_at, key)
+            for key, (count, accessed_at) in self._pending_hits.items()
+        ]
+        self._pending_puts.clear()
+        self._pending_hits.clear()
+        if not puts and not hits:
+            return
+
+        if puts:
+            await self.db.executemany(
+                """
+                INSERT OR REPLACE INTO llm_cache
+                (cache_key, model, response, hit_count, created_at, accessed_at)
+                VALUES (?, ?, ?, 0, ?, ?)
+                """,
+                puts,
+            )
+        if hits:
+            await self.db.executemany(
+                """
+                UPDATE llm_cache
+                SET hit_count = hit_count + ?, accessed_at = ?
+                WHERE cache_key = ?
+                """,
+                hits,
+            )
+
+        self._puts_since_evict += len(puts)
+        if self._puts_since_evict >= self.EVICT_EVERY:
+            await self.evict()
+        await self.db.commit()
+
+    async def _maybe_flush(self) -> None:
+        if len(self._pending_puts) + len(self._pending_hits) >= self.FLUSH_EVERY:
+            await self.flush()
+
+    async def evict(self) -> int:
+        """만료/초과 항목 삭제 (커밋하지 않음)
+
+        Returns:
+            삭제된 항목 수
+        """
+        self._puts_since_evict = 0
+        deleted = 0
+
+        if self.ttl_seconds is not None:
+            cursor = await self.db.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?",
+                (self._cutoff_iso(),)
+            )
+            deleted += cursor.rowcount
+
+        if self.max_entries is not None:
+            cursor = await self.db.execute(
+                """
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            deleted += cursor.rowcount
+
+        return deleted
+
+    async def clear(self) -> None:
+        """캐시 전체 삭제"""
+        self._pending_puts.clear()
+        self._pending_hits.clear()
+        await self.db.execute("DELETE FROM llm_cache")
+        await self.db.commit()
+
+    def _cutoff_iso(self) -> str:
+        return (datetime.now() - timedelta(seconds=self.ttl_seconds)).isoformat()
+
+    def _is_expired(self, created_at: str) -> bool:
+        return self.ttl_seconds is not None and created_at < self._cutoff_iso()
+
+
+class CachedAdapter(BaseLLMAdapter):
+    """ResponseCache를 적용한 어댑터 래퍼
+
+    generate만 캐시하고 generate_stream/generate_measured는 그대로 위임한다
+    (캐시된 응답으로는 지연 시간을 측정할 수 없으므로).
+    """
+
+    def __init__(self, adapter: BaseLLMAdapter, cache: ResponseCache):
+        self.adapter = adapter
+        self.cache = cache
+
+    @property
+    def provider_name(self) -> str:
+        return self.adapter.provider_name
+
+    @property
+    def endpoint(self) -> str:
+        """내부 어댑터 엔드포인트 (다른 래퍼가 감싸도 키 구분 유지)"""
+        return getattr(self.adapter, "endpoint", "")
+
+    def _namespace(self) -> str:
+        """같은 모델명이라도 엔드포인트가 다르면 다른 캐시 키"""
+        endpoint = getattr(self.adapter, "endpoint", "")
+        return f"{self.adapter.provider_name}:{endpoint}"
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """캐시 조회 후 miss면 실제 호출 + 저장"""
+        key = self.cache.make_key(
+            self._namespace(), model, prompt, temperature, max_tokens, **kwargs
+        )
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.adapter.generate(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        await self.cache.put(key, response)
+        return response
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """스트리밍은 캐시하지 않음"""
+        async for chunk in self.adapter.generate_stream(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        ):
+            yield chunk
+
+    async def generate_measured(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """측정 모드는 캐시하지 않음"""
+        return await self.adapter.generate_measured(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+
+    async def health_check(self) -> bool:
+        return await self.adapter.health_check()
+
+    async def close(self) -> None:
+        """모아둔 캐시 쓰기 저장 + 내부 어댑터 종료"""
+        await self.cache.flush()
+        if hasattr(self.adapter, "close"):
+            await self.adapter.close()
@@ -0,0 +1,202 @@
+"""동일한 in-flight LLM 요청 합치기 (request coalescing)
+
+같은 모델 + 렌더링된 프롬프트 + 샘플링 파라미터 요청이 이미 진행 중이면
+새 HTTP 호출을 하지 않고 진행 중인 호출의 결과를 같이 받는다.
+프롬프트 여러 개가 같은 문자열로 렌더링되거나, 같은 golden 데이터셋을
+여러 실행이 동시에 돌릴 때 프로바이더 호출 수와 대기 시간이 줄어든다.
+
+- 진행 중인 요청 테이블은 프로세스 공용 (get_inflight_requests) → 실행 간에도 합쳐짐
+  단, 캐시를 쓰는 실행과 쓰지 않는 실행의 요청은 합치지 않음 (키에 캐시 사용 여부 포함)
+- 기본은 temperature 0 요청만 합침 (같은 요청이면 같은 응답이 기대되는 경우)
+  temperature > 0 요청은 셀마다 독립 샘플이 필요할 수 있으므로 sampled=True일 때만 합침
+  → NativeRunner 셀 호출은 기본 temperature 0.7이라, 셀 호출까지 합치려면
+    실행 temperature를 0으로 하거나 sampled=True (기본 설정에서는 llm-rubric 채점 호출만)
+- 먼저 요청한 쪽이 취소돼도 기다리는 쪽이 남아 있으면 호출은 계속됨
+  (기다리는 쪽이 모두 취소되면 호출도 취소)
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from .base import BaseLLMAdapter, LLMResponse
+from .cache import CachedAdapter, ResponseCache
+
+
+class _Flight:
+    """진행 중인 호출 하나와 결과를 기다리는 요청 수"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class InflightRequests:
+    """요청 키 → 진행 중인 호출"""
+
+    def __init__(self):
+        self._flights: dict[str, _Flight] = {}
+        self.calls = 0        # 실제로 보낸 호출 수
+        self.coalesced = 0    # 진행 중인 호출에 합쳐진 요청 수
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[LLMResponse]],
+    ) -> tuple[LLMResponse, bool]:
+        """같은 key 호출이 진행 중이면 그 결과를, 없으면 call()을 실행해서 반환
+
+        Returns:
+            (응답, 다른 요청의 호출에 합쳐졌으면 True)
+        """
+        flight = self._flights.get(key)
+        joined = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.create_task(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: 이 요청이 취소돼도 같은 호출을 기다리는 다른 요청에는 영향 없음
+            return await asyncio.shield(flight.task), joined
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # 기다리는 요청이 모두 취소됨 → 호출 취소, 이후 같은 요청은 새로 호출
+                flight.task.cancel()
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _finish(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # 기다리는 쪽이 없던 예외도 retrieved 처리
+
+
+class CoalescingAdapter(BaseLLMAdapter):
+    """InflightRequests를 적용한 어댑터 래퍼
+
+    generate만 합치고 generate_stream/generate_measured는 그대로 위임한다
+    (지연 시간 측정은 요청마다 독립 호출이어야 하므로).
+    합쳐진 요청의 응답은 coalesced=True인 복사본이다.
+    """
+
+    def __init__(
+        self,
+        adapter: BaseLLMAdapter,
+        inflight: "InflightRequests | None" = None,
+        sampled: bool = False,
+    ):
+        """
+        Args:
+            adapter: 실제 호출 어댑터 (CachedAdapter면 캐시 조회/저장도 한 번만)
+            inflight: 진행 중인 요청 테이블 (없으면 프로세스 공용)
+            sampled: True면 temperature > 0 요청도 합침 (같은 샘플을 공유하게 됨)
+        """
+        self.adapter = adapter
+        self.inflight = inflight if inflight is not None else get_inflight_requests()
+        self.sampled = sampled
+
+    @property
+    def provider_name(self) -> str:
+        return self.adapter.provider_name
+
+    def _namespace(self) -> str:
+        """같은 모델명이라도 엔드포인트나 캐시 사용 여부가 다르면 합치지 않음
+
+        (캐시를 끈 실행이 캐시를 쓰는 실행의 호출에 합쳐지면 캐시된 응답을 받게 됨)
+        """
+        endpoint = getattr(self.adapter, "endpoint", "")
+        cache = "cached" if isinstance(self.adapter, CachedAdapter) else "live"
+        return f"{self.adapter.provider_name}:{endpoint}:{cache}"
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """같은 요청이 진행 중이면 그 결과 공유, 아니면 실제 호출"""
+        def call() -> Awaitable[LLMResponse]:
+            return self.adapter.generate(
+                prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
+
+        if temperature > 0 and not self.sampled:
+            return await call()
+
+        key = ResponseCache.make_key(
+            self._namespace(), model, prompt, temperature, max_tokens, **kwargs
+        )
+        response, joined = await self.inflight.run(key, call)
+        if joined:
+            return response.model_copy(update={"coalesced": True})
+        return response
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """스트리밍은 합치지 않음"""
+        async for chunk in self.adapter.generate_stream(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        ):
+            yield chunk
+
+    async def generate_measured(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """측정 모드는 합치지 않음"""
+        return await self.adapter.generate_measured(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+
+    async def health_check(self) -> bool:
+        return await self.adapter.health_check()
+
+    async def close(self) -> None:
+        """내부 어댑터 종료"""
+        if hasattr(self.adapter, "close"):
+            await self.adapter.close()
+
+
+_inflight: InflightRequests | None = None
+
+
+def get_inflight_requests() -> InflightRequests:
+    """프로세스 공용 InflightRequests"""
+    global _inflight
+    if _inflight is None:
+        _inflight = InflightRequests()
+    return _inflight
@@ -0,0 +1,120 @@
+"""프로세스 공용 HTTP 클라이언트 풀
+
+어댑터마다 httpx.AsyncClient를 만들면 고동시성 실행에서 TLS 핸드셰이크가 반복된다.
+엔드포인트(scheme + host)별로 AsyncClient 하나를 공유해 keep-alive 연결을 재사용하고,
+h2 패키지가 설치되어 있으면 HTTP/2 멀티플렉싱을 사용한다 (서버가 지원하지 않으면 HTTP/1.1).
+
+설정 예시 (configs/models.yaml):
+    http_pool:
+      max_connections: 200
+      max_keepalive_connections: 100
+      keepalive_expiry: 60
+      http2: true
+"""
+
+import importlib.util
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import yaml
+
+
+@dataclass
+class HTTPPoolConfig:
+    """연결 풀 설정 (엔드포인트별로 적용)"""
+    max_connections: int = 100
+    max_keepalive_connections: int = 50
+    keepalive_expiry: float = 60.0      # 유휴 연결 유지 시간 (초)
+    connect_timeout: float = 10.0       # 연결/TLS 핸드셰이크 타임아웃 (초)
+    http2: bool = True                  # h2 미설치 시 자동으로 HTTP/1.1
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "HTTPPoolConfig":
+        """dict에서 생성 (알 수 없는 키는 무시)"""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @classmethod
+    def from_yaml(cls, path: str | Path) -> "HTTPPoolConfig":
+        """models.yaml의 http_pool 섹션으로 생성 (파일이 없으면 기본값)"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        return cls.from_dict(config.get("http_pool") or {})
+
+
+def http2_available() -> bool:
+    """HTTP/2 사용 가능 여부 (httpx[http2] → h2 패키지)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientPool:
+    """엔드포인트별 공유 httpx.AsyncClient
+
+    클라이언트에는 인증 헤더를 넣지 않는다. 같은 엔드포인트를 다른 API 키로
+    쓰는 어댑터도 연결을 공유할 수 있도록 헤더와 타임아웃은 요청마다 전달한다.
+    """
+
+    def __init__(self, config: HTTPPoolConfig | None = None):
+        self.config = config or HTTPPoolConfig()
+        self.http2 = self.config.http2 and http2_available()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _key(endpoint: str) -> str:
+        """연결 재사용 단위 (scheme://host:port)"""
+        parts = urlsplit(endpoint)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def get(self, endpoint: str) -> httpx.AsyncClient:
+        """엔드포인트용 클라이언트 반환 (없으면 생성)"""
+        key = self._key(endpoint)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(60.0, connect=self.config.connect_timeout),
+            )
+            self._clients[key] = client
+        return client
+
+    def timeout(self, total: float) -> httpx.Timeout:
+        """요청별 타임아웃 (연결 타임아웃은 풀 설정)"""
+        return httpx.Timeout(total, connect=min(total, self.config.connect_timeout))
+
+    async def aclose(self) -> None:
+        """모든 클라이언트 종료"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+_pool: HTTPClientPool | None = None
+
+
+def get_http_pool(config_path: str | Path | None = None) -> HTTPClientPool:
+    """프로세스 공용 HTTPClientPool (최초 호출 시 models.yaml 로드)"""
+    global _pool
+    if _pool is None:
+        _pool = HTTPClientPool(
+            HTTPPoolConfig.from_yaml(config_path or Path("configs/models.yaml"))
+        )
+    return _pool
+
+
+async def close_http_pool() -> None:
+    """공용 풀 종료 (FastAPI lifespan 종료 시 호출)"""
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
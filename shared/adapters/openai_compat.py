@@ -1,11 +1,23 @@
 """OpenAI 호환 API 어댑터 (Together AI, vLLM, 사내 모델 등)"""
 
+import asyncio
+import json
 import time
-from typing import AsyncIterator, Any
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
 
 import httpx
 
-from .base import BaseLLMAdapter, LLMResponse, AdapterFactory
+from .base import BaseLLMAdapter, LLMResponse, StreamMetrics, AdapterFactory
+from .http_pool import HTTPClientPool, get_http_pool
+from .rate_limit import RateLimiter, RateLimiterRegistry, RateLimitSlot
+from .retry import RetryPolicy
+
+# Rate limit 대상 상태 코드 (AIMD 감소 신호)
+THROTTLE_STATUS_CODES = (429, 503)
+
+T = TypeVar("T")
 
 
 class OpenAICompatibleAdapter(BaseLLMAdapter):
@@ -16,26 +28,47 @@ class OpenAICompatibleAdapter(BaseLLMAdapter):
         endpoint: str,
         api_key: str,
         timeout: float = 60.0,
+        provider: str = "openai",
+        rate_limiters: RateLimiterRegistry | None = None,
+        retry_policy: RetryPolicy | None = None,
+        http_pool: HTTPClientPool | None = None,
     ):
+        """
+        Args:
+            endpoint: API 베이스 URL
+            api_key: API 키
+            timeout: 요청 타임아웃 (초)
+            provider: 프로바이더 이름 (rate limit 설정 키: together, openai, vllm)
+            rate_limiters: (provider, model)별 rate limiter (없으면 제한 없음)
+            retry_policy: 재시도 정책 (없으면 기본 RetryPolicy, 끄려면 NO_RETRY)
+            http_pool: HTTP 클라이언트 풀 (없으면 프로세스 공용 풀)
+        """
         self.endpoint = endpoint.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
-        self._client: httpx.AsyncClient | None = None
+        self.provider = provider
+        self.rate_limiters = rate_limiters
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.http_pool = http_pool or get_http_pool()
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
 
     @property
     def provider_name(self) -> str:
         return "openai-compatible"
 
     async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self.timeout),
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-            )
-        return self._client
+        """엔드포인트 공유 클라이언트 (연결은 풀이 관리)"""
+        return self.http_pool.get(self.endpoint)
+
+    def _request_options(self) -> dict[str, Any]:
+        """요청별 헤더/타임아웃 (공유 클라이언트에는 인증 정보가 없음)"""
+        return {
+            "headers": self._headers,
+            "timeout": self.http_pool.timeout(self.timeout),
+        }
 
     async def generate(
         self,
@@ -45,7 +78,11 @@ class OpenAICompatibleAdapter(BaseLLMAdapter):
         max_tokens: int = 1024,
         **kwargs: Any,
     ) -> LLMResponse:
-        """단일 응답 생성"""
+        """단일 응답 생성
+
+        429/5xx/타임아웃은 retry_policy에 따라 재시도한다.
+        시도마다 rate limiter 슬롯을 새로 잡으므로 재시도도 한도에 포함된다.
+        """
         client = await self._get_client()
 
         payload = {
@@ -57,15 +94,10 @@ class OpenAICompatibleAdapter(BaseLLMAdapter):
             **kwargs,
         }
 
-        start_time = time.perf_counter()
-        response = await client.post(
-            f"{self.endpoint}/chat/completions",
-            json=payload,
+        (data, latency_ms), attempts, backoff_ms = await self._with_retry(
+            lambda: self._post(client, payload, prompt, model, max_tokens)
         )
-        response.raise_for_status()
-        latency_ms = (time.perf_counter() - start_time) * 1000
 
-        data = response.json()
         choice = data["choices"][0]
         usage = data.get("usage", {})
 
@@ -76,8 +108,171 @@ class OpenAICompatibleAdapter(BaseLLMAdapter):
             output_tokens=usage.get("completion_tokens"),
             model=data.get("model", model),
             raw_response=data,
+            attempts=attempts,
+            backoff_ms=backoff_ms,
+        )
+
+    async def generate_measured(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """스트리밍으로 응답 생성 + TTFT/토큰 간 지연 측정
+
+        stream_options.include_usage로 마지막 청크의 usage를 받아 실제 토큰 수로
+        tokens/sec를 계산한다. 재시도/rate limit은 generate와 같다
+        (스트림을 끝까지 받은 뒤 반환하므로 실패한 시도는 통째로 다시 실행).
+        """
+        client = await self._get_client()
+
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            **kwargs,
+        }
+
+        (content, usage, metrics), attempts, backoff_ms = await self._with_retry(
+            lambda: self._stream_once(client, payload, prompt, model, max_tokens)
+        )
+
+        return LLMResponse(
+            content=content,
+            latency_ms=metrics.total_ms,
+            input_tokens=usage.get("prompt_tokens"),
+            output_tokens=usage.get("completion_tokens"),
+            model=model,
+            attempts=attempts,
+            backoff_ms=backoff_ms,
+            stream_metrics=metrics,
         )
 
+    async def _with_retry(self, call: Callable[[], Awaitable[T]]) -> tuple[T, int, float]:
+        """retry_policy에 따라 call 재시도
+
+        Returns:
+            (call 결과, 시도 횟수, 백오프 대기 합계 ms)
+        """
+        attempt = 0
+        backoff_ms = 0.0
+        while True:
+            attempt += 1
+            try:
+                return await call(), attempt, backoff_ms
+            except Exception as e:
+                if (
+                    attempt >= self.retry_policy.max_attempts
+                    or not self.retry_policy.is_retryable(e)
+                ):
+                    raise
+                delay = self.retry_policy.next_delay(attempt, e)
+                backoff_ms += delay * 1000
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _slot(
+        self, prompt: str, model: str, max_tokens: int
+    ) -> AsyncIterator[RateLimitSlot | None]:
+        """요청 1회용 rate limiter 슬롯 (limiter가 없으면 None)
+
+        타임아웃/429/503으로 끝나면 AIMD 감소 신호로 기록한다.
+        """
+        limiter = self._get_limiter(model)
+        if limiter is None:
+            yield None
+            return
+
+        estimated = self._estimate_tokens(prompt, max_tokens)
+        async with limiter.slot(estimated_tokens=estimated) as slot:
+            try:
+                yield slot
+            except httpx.TimeoutException:
+                slot.throttled = True  # 과부하 신호로 간주
+                raise
+            except httpx.HTTPStatusError as e:
+                slot.throttled = e.response.status_code in THROTTLE_STATUS_CODES
+                raise
+
+    async def _post(
+        self,
+        client: httpx.AsyncClient,
+        payload: dict[str, Any],
+        prompt: str,
+        model: str,
+        max_tokens: int,
+    ) -> tuple[dict[str, Any], float]:
+        """chat/completions 1회 호출 (rate limiter 슬롯 안에서)
+
+        Returns:
+            (응답 JSON, 지연 시간 ms)
+        """
+        async with self._slot(prompt, model, max_tokens) as slot:
+            start_time = time.perf_counter()
+            response = await client.post(
+                f"{self.endpoint}/chat/completions",
+                json=payload,
+                **self._request_options(),
+            )
+            response.raise_for_status()
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            data = response.json()
+            if slot is not None:
+                slot.used_tokens = (data.get("usage") or {}).get("total_tokens")
+            return data, latency_ms
+
+    async def _stream_once(
+        self,
+        client: httpx.AsyncClient,
+        payload: dict[str, Any],
+        prompt: str,
+        model: str,
+        max_tokens: int,
+    ) -> tuple[str, dict[str, Any], StreamMetrics]:
+        """스트리밍 1회 호출 + 청크 수신 시각 기록 (rate limiter 슬롯 안에서)
+
+        Returns:
+            (전체 응답 텍스트, usage, 지연 지표)
+        """
+        async with self._slot(prompt, model, max_tokens) as slot:
+            parts: list[str] = []
+            token_times: list[float] = []
+            usage: dict[str, Any] = {}
+
+            start_time = time.perf_counter()
+            async with client.stream(
+                "POST",
+                f"{self.endpoint}/chat/completions",
+                json=payload,
+                **self._request_options(),
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                async for chunk in self._iter_chunks(response):
+                    if content := self._chunk_content(chunk):
+                        token_times.append(time.perf_counter())
+                        parts.append(content)
+                    if chunk.get("usage"):
+                        usage = chunk["usage"]
+            end_time = time.perf_counter()
+
+            if slot is not None:
+                slot.used_tokens = usage.get("total_tokens")
+
+        metrics = StreamMetrics.from_timings(
+            start_time,
+            token_times,
+            end_time,
+            output_tokens=usage.get("completion_tokens"),
+        )
+        return "".join(parts), usage, metrics
+
     async def generate_stream(
         self,
         prompt: str,
@@ -102,24 +297,47 @@ class OpenAICompatibleAdapter(BaseLLMAdapter):
             "POST",
             f"{self.endpoint}/chat/completions",
             json=payload,
+            **self._request_options(),
         ) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data = line[6:]
-                    if data == "[DONE]":
-                        break
-                    import json
-                    chunk = json.loads(data)
-                    delta = chunk["choices"][0].get("delta", {})
-                    if content := delta.get("content"):
-                        yield content
+            async for chunk in self._iter_chunks(response):
+                if content := self._chunk_content(chunk):
+                    yield content
+
+    @staticmethod
+    async def _iter_chunks(response: httpx.Response) -> AsyncIterator[dict[str, Any]]:
+        """SSE 응답에서 청크 JSON 추출 ([DONE]에서 종료)"""
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                yield json.loads(data)
+
+    @staticmethod
+    def _chunk_content(chunk: dict[str, Any]) -> str | None:
+        """청크의 delta content (usage 전용 청크는 choices가 비어 있음)"""
+        choices = chunk.get("choices") or []
+        if not choices:
+            return None
+        return (choices[0].get("delta") or {}).get("content")
+
+    def _get_limiter(self, model: str) -> RateLimiter | None:
+        """모델별 rate limiter"""
+        if self.rate_limiters is None:
+            return None
+        return self.rate_limiters.get(self.provider, model)
+
+    @staticmethod
+    def _estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """요청 토큰 수 추정 (tokens/minute 예약용, 실제 사용량으로 정산)
+
+        한글 비중이 높은 프롬프트 기준으로 약 2자당 1토큰
+        """
+        return len(prompt) // 2 + max_tokens
 
     async def close(self) -> None:
-        """클라이언트 종료"""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """연결은 공유 풀 소유이므로 닫지 않음 (close_http_pool에서 일괄 종료)"""
 
 
 # 어댑터 등록
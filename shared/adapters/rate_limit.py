@@ -0,0 +1,319 @@
+"""프로바이더/모델별 Rate Limiter + AIMD 동시성 제어
+
+- TokenBucket: requests/minute, tokens/minute 제한
+- AdaptiveConcurrency: 429/503이면 동시성 절반(Multiplicative Decrease),
+  성공하면 조금씩 증가(Additive Increase) → 프로바이더 실제 한도로 수렴
+- 슬롯 배분: 동시에 도는 실행(test run)들이 (provider, model) 슬롯을 나눠 씀
+  → 우선순위가 높은 실행 먼저, 같은 우선순위끼리는 사용 중인 슬롯이 적은 실행 먼저 (fair share)
+  → 대형 배치 실행이 돌고 있어도 작은 실행이 슬롯을 바로 받아 빨리 끝남
+- RateLimiterRegistry: configs/models.yaml의 rate_limits 섹션으로 구성
+
+실행 단위는 scheduling_share 컨텍스트 변수로 지정한다 (TestExecutor가 실행마다 설정,
+그 안에서 만든 task에도 전달됨):
+    token = scheduling_share.set(SchedulingShare(test_run_id, priority=10))
+    try:
+        ...
+    finally:
+        scheduling_share.reset(token)
+
+설정 예시 (configs/models.yaml):
+    rate_limits:
+      together:
+        requests_per_minute: 600
+        tokens_per_minute: 180000
+        max_concurrency: 32
+        models:
+          meta-llama/Llama-3.3-70B-Instruct-Turbo:
+            requests_per_minute: 300
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+
+@dataclass
+class RateLimitConfig:
+    """Rate limit 설정 (None이면 제한 없음)"""
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict[str, Any],
+        base: "RateLimitConfig | None" = None,
+    ) -> "RateLimitConfig":
+        """dict에서 생성 (알 수 없는 키는 무시, base 값 위에 덮어쓰기)"""
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        return replace(base or cls(), **values)
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷"""
+
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        """
+        Args:
+            per_minute: 분당 충전량
+            capacity: 버킷 크기 (기본: 분당 충전량 = 최대 1분치 burst)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def consume(self, amount: float = 1.0) -> None:
+        """amount만큼 토큰이 찰 때까지 대기 후 차감"""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """과다 예약한 토큰 반환"""
+        if amount > 0:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+@dataclass(frozen=True)
+class SchedulingShare:
+    """슬롯을 나눠 받는 단위 (실행 하나)"""
+    name: str
+    priority: int = 0   # 클수록 먼저 (예: golden 회귀 실행)
+
+
+# 현재 요청이 속한 실행 (설정하지 않은 요청은 하나의 기본 share로 묶임)
+scheduling_share: ContextVar[SchedulingShare | None] = ContextVar(
+    "scheduling_share", default=None
+)
+
+_DEFAULT_SHARE = SchedulingShare("")
+
+
+class AdaptiveConcurrency:
+    """AIMD 동시성 제어 + 우선순위/fair-share 슬롯 배분
+
+    - 성공: limit += 1/limit (limit개 성공마다 +1)
+    - 429/503: limit /= 2 (cooldown 동안 한 번만)
+    - 빈 슬롯은 대기 중인 share 중 priority가 가장 높은 share에게,
+      같은 priority면 사용 중인 슬롯이 가장 적은 share에게 (같으면 차례대로)
+    """
+
+    DECREASE_COOLDOWN = 1.0  # 초
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._share_in_flight: dict[SchedulingShare, int] = {}
+        self._waiters: dict[SchedulingShare, deque[asyncio.Future]] = {}
+
+    async def acquire(self, share: SchedulingShare | None = None) -> None:
+        share = share or _DEFAULT_SHARE
+        if not self._waiters and self.in_flight < int(self.limit):
+            self._grant(share)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(share, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(share)  # 슬롯을 받은 직후 취소됨 → 반납
+            else:
+                self._remove_waiter(share, waiter)
+            self._dispatch()
+            raise
+
+    async def release(self, throttled: bool = False, share: SchedulingShare | None = None) -> None:
+        if throttled:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.DECREASE_COOLDOWN:
+                self.limit = max(self.minimum, self.limit / 2)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        self._release(share or _DEFAULT_SHARE)
+        self._dispatch()
+
+    def snapshot(self) -> dict[str, Any]:
+        """현재 한도와 share별 사용/대기 슬롯 수"""
+        shares = set(self._share_in_flight) | set(self._waiters)
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "shares": {
+                share.name: {
+                    "priority": share.priority,
+                    "in_flight": self._share_in_flight.get(share, 0),
+                    "waiting": len(self._waiters.get(share, ())),
+                }
+                for share in shares
+            },
+        }
+
+    def _grant(self, share: SchedulingShare) -> None:
+        self.in_flight += 1
+        self._share_in_flight[share] = self._share_in_flight.get(share, 0) + 1
+
+    def _release(self, share: SchedulingShare) -> None:
+        self.in_flight -= 1
+        remaining = self._share_in_flight.get(share, 0) - 1
+        if remaining > 0:
+            self._share_in_flight[share] = remaining
+        else:
+            self._share_in_flight.pop(share, None)
+
+    def _remove_waiter(self, share: SchedulingShare, waiter: asyncio.Future) -> None:
+        waiters = self._waiters.get(share)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiters[share]
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 대기 중인 share에게 배분"""
+        while self._waiters and self.in_flight < int(self.limit):
+            # min()은 동률이면 dict 순서상 앞쪽 → 슬롯을 받은 share는 뒤로 보내 차례대로 돌아감
+            share = min(
+                self._waiters,
+                key=lambda s: (-s.priority, self._share_in_flight.get(s, 0)),
+            )
+            waiters = self._waiters.pop(share)
+            waiter = waiters.popleft()
+            if waiters:
+                self._waiters[share] = waiters
+            if waiter.done():
+                continue  # 기다리다 취소됨
+            self._grant(share)
+            waiter.set_result(None)
+
+
+class RateLimiter:
+    """프로바이더/모델 하나에 대한 rate limit + 적응형 동시성"""
+
+    def __init__(self, config: RateLimitConfig):
+        self.config = config
+        self.concurrency = AdaptiveConcurrency(
+            initial=config.initial_concurrency,
+            minimum=config.min_concurrency,
+            maximum=config.max_concurrency,
+        )
+        self.requests = (
+            TokenBucket(config.requests_per_minute) if config.requests_per_minute else None
+        )
+        self.tokens = (
+            TokenBucket(config.tokens_per_minute) if config.tokens_per_minute else None
+        )
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator["RateLimitSlot"]:
+        """요청 1건 실행 슬롯
+
+        사용 예:
+            async with limiter.slot(estimated_tokens=1200) as slot:
+                response = await client.post(...)
+                slot.throttled = response.status_code in (429, 503)
+                slot.used_tokens = usage["total_tokens"]
+        """
+        # 동시성 슬롯을 먼저 받아야 토큰 버킷 대기열에도 우선순위 순서대로 들어감
+        share = scheduling_share.get()
+        await self.concurrency.acquire(share)
+        slot = RateLimitSlot()
+        try:
+            if self.requests:
+                await self.requests.consume(1)
+            if self.tokens and estimated_tokens:
+                await self.tokens.consume(estimated_tokens)
+            yield slot
+        finally:
+            await self.concurrency.release(throttled=slot.throttled, share=share)
+            if self.tokens and slot.used_tokens is not None:
+                self.tokens.refund(estimated_tokens - slot.used_tokens)
+
+
+@dataclass
+class RateLimitSlot:
+    """slot() 안에서 요청 결과를 기록"""
+    throttled: bool = False
+    used_tokens: int | None = None
+
+
+class RateLimiterRegistry:
+    """(provider, model)별 RateLimiter 보관
+
+    모델별 설정이 없으면 프로바이더 설정을, 그것도 없으면 기본값을 사용한다.
+    같은 (provider, model)은 프로세스 안에서 하나의 RateLimiter를 공유한다.
+    """
+
+    def __init__(self, limits: dict[str, dict[str, Any]] | None = None):
+        self._limits = limits or {}
+        self._limiters: dict[tuple[str, str], RateLimiter] = {}
+
+    @classmethod
+    def from_yaml(cls, path: str | Path) -> "RateLimiterRegistry":
+        """models.yaml의 rate_limits 섹션으로 생성 (파일이 없으면 기본값)"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        return cls(config.get("rate_limits") or {})
+
+    def config_for(self, provider: str, model: str) -> RateLimitConfig:
+        """(provider, model) 설정 결정 (모델 > 프로바이더 > 기본값)"""
+        provider_limits = self._limits.get(provider) or {}
+        config = RateLimitConfig.from_dict(provider_limits)
+        model_limits = (provider_limits.get("models") or {}).get(model)
+        if model_limits:
+            config = RateLimitConfig.from_dict(model_limits, base=config)
+        return config
+
+    def get(self, provider: str, model: str) -> RateLimiter:
+        """(provider, model) RateLimiter 반환 (없으면 생성)"""
+        key = (provider, model)
+        if key not in self._limiters:
+            self._limiters[key] = RateLimiter(self.config_for(provider, model))
+        return self._limiters[key]
+
+
+_registry: RateLimiterRegistry | None = None
+
+
+def get_rate_limiters(config_path: str | Path | None = None) -> RateLimiterRegistry:
+    """프로세스 공용 RateLimiterRegistry (최초 호출 시 models.yaml 로드)"""
+    global _registry
+    if _registry is None:
+        _registry = RateLimiterRegistry.from_yaml(config_path or Path("configs/models.yaml"))
+    return _registry
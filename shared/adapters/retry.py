@@ -0,0 +1,64 @@
+"""LLM API 재시도 정책
+
+- 재시도 대상: 408/409/425/429/5xx, 타임아웃, 연결 오류
+- 재시도 불가: 그 외 4xx (인증 실패, 잘못된 요청 등)
+- 대기 시간: Retry-After 헤더가 있으면 우선, 없으면 full jitter 지수 백오프
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+@dataclass
+class RetryPolicy:
+    """재시도 정책"""
+    max_attempts: int = 4               # 최초 시도 포함
+    base_delay: float = 0.5             # 초
+    max_delay: float = 30.0             # 백오프 상한 (초)
+    max_retry_after: float = 120.0      # Retry-After 상한 (초)
+    retry_statuses: tuple[int, ...] = (408, 409, 425, 429, 500, 502, 503, 504)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """재시도 가능한 오류인지"""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retry_statuses
+        return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+    def next_delay(self, attempt: int, error: Exception) -> float:
+        """attempt번째 시도 실패 후 대기 시간 (초)"""
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = self.parse_retry_after(error.response)
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+
+        # Full jitter: [0, min(max_delay, base * 2^(attempt-1))]
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def parse_retry_after(response: httpx.Response) -> float | None:
+        """Retry-After 헤더 파싱 (초 또는 HTTP-date)"""
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# 재시도 없음 (1회만 시도)
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -2,6 +2,7 @@
 
 import os
 from .openai_compat import OpenAICompatibleAdapter
+from .rate_limit import RateLimiterRegistry
 
 
 TOGETHER_API_ENDPOINT = "https://api.together.xyz/v1"
@@ -31,12 +32,14 @@ TOGETHER_MODELS = {
 def create_together_adapter(
     api_key: str | None = None,
     timeout: float = 120.0,
+    rate_limiters: RateLimiterRegistry | None = None,
 ) -> OpenAICompatibleAdapter:
     """Together AI 어댑터 생성
 
     Args:
         api_key: API 키 (없으면 환경변수에서 읽음)
         timeout: 요청 타임아웃 (초)
+        rate_limiters: 모델별 rate limiter (configs/models.yaml rate_limits.together)
 
     Returns:
         OpenAICompatibleAdapter 인스턴스
@@ -49,6 +52,8 @@ def create_together_adapter(
         endpoint=TOGETHER_API_ENDPOINT,
         api_key=key,
         timeout=timeout,
+        provider="together",
+        rate_limiters=rate_limiters,
     )
 
 
@@ -10,7 +10,10 @@ from .models import (
     EvaluationSummary,
 )
 from .mapping import MappingResolver, MappingValidationResult, PromptVariableExtractor, AssertionMerger
+from .assertions import AssertionEvaluator
 from .promptfoo_runner import PromptfooRunner
+from .native_runner import NativeRunner
+from .sketch import QuantileSketch
 
 __all__ = [
     # Models
@@ -28,6 +31,10 @@ __all__ = [
     "MappingValidationResult",
     "PromptVariableExtractor",
     "AssertionMerger",
+    "AssertionEvaluator",
     # Runner
     "PromptfooRunner",
+    "NativeRunner",
+    # Metrics
+    "QuantileSketch",
 ]
@@ -0,0 +1,155 @@
+"""Python 네이티브 Assertion 평가
+
+promptfoo 없이 in-process 엔진에서 사용하는 assertion 평가기.
+입력은 AssertionMerger가 만든 promptfoo 형식 assertion 리스트이고,
+출력은 PromptfooRunner.parse_results의 assertion_results와 같은 형식이다.
+"""
+
+import json
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .models import AssertionType
+
+# llm-rubric 채점 함수: 채점 프롬프트 → 채점 모델 응답 텍스트
+GraderFn = Callable[[str], Awaitable[str]]
+
+RUBRIC_PROMPT = """당신은 LLM 출력 평가자입니다. 아래 출력이 평가 기준을 만족하는지 판단하세요.
+
+## 평가 기준
+{rubric}
+
+## 출력
+{output}
+
+반드시 아래 JSON 형식으로만 응답하세요.
+{{"pass": true 또는 false, "score": 0.0~1.0, "reason": "판단 근거"}}"""
+
+
+class AssertionEvaluator:
+    """promptfoo 형식 assertion을 Python으로 평가"""
+
+    def __init__(self, grader: GraderFn | None = None):
+        """
+        Args:
+            grader: llm-rubric 채점 함수 (없으면 llm-rubric은 실패 처리)
+        """
+        self.grader = grader
+
+    async def evaluate(
+        self,
+        assertions: list[dict],
+        output: str,
+    ) -> tuple[bool, list[dict]]:
+        """assertion 목록 평가
+
+        Args:
+            assertions: [{"type": "contains", "value": "..."}]
+            output: LLM 출력
+
+        Returns:
+            (전체 통과 여부, assertion 결과 리스트)
+        """
+        results = []
+        for assertion in assertions:
+            results.append(await self.evaluate_one(assertion, output))
+
+        passed = all(r["passed"] for r in results)
+        return passed, results
+
+    async def evaluate_one(self, assertion: dict, output: str) -> dict:
+        """단일 assertion 평가"""
+        a_type = assertion.get("type", "")
+        value = assertion.get("value") or ""
+
+        try:
+            if a_type == AssertionType.LLM_RUBRIC.value:
+                return await self._grade_rubric(assertion, output)
+
+            if a_type == AssertionType.CONTAINS.value:
+                passed = value in output
+                reason = None if passed else f"Expected output to contain \"{value}\""
+            elif a_type == AssertionType.NOT_CONTAINS.value:
+                passed = value not in output
+                reason = None if passed else f"Expected output to not contain \"{value}\""
+            elif a_type == AssertionType.EQUALS.value:
+                passed = output == value
+                reason = None if passed else f"Expected output to equal \"{value}\""
+            elif a_type == AssertionType.STARTS_WITH.value:
+                passed = output.startswith(value)
+                reason = None if passed else f"Expected output to start with \"{value}\""
+            elif a_type == AssertionType.REGEX.value:
+                passed = re.search(value, output) is not None
+                reason = None if passed else f"Expected output to match regex \"{value}\""
+            elif a_type == AssertionType.IS_JSON.value:
+                passed = self._is_json(output)
+                reason = None if passed else "Expected output to be valid JSON"
+            else:
+                passed = False
+                reason = f"Unsupported assertion type: {a_type}"
+        except re.error as e:
+            passed = False
+            reason = f"Invalid regex: {e}"
+
+        return {
+            "type": a_type,
+            "passed": passed,
+            "reason": reason or "Assertion passed",
+            "score": 1.0 if passed else 0.0,
+        }
+
+    async def _grade_rubric(self, assertion: dict, output: str) -> dict:
+        """llm-rubric 채점 (grader 모델 호출)"""
+        a_type = assertion.get("type", "")
+
+        if self.grader is None:
+            return {
+                "type": a_type,
+                "passed": False,
+                "reason": "llm-rubric requires a grader",
+                "score": 0.0,
+            }
+
+        prompt = RUBRIC_PROMPT.format(rubric=assertion.get("value", ""), output=output)
+        verdict = self._parse_verdict(await self.grader(prompt))
+
+        score = verdict["score"]
+        threshold = assertion.get("threshold")
+        passed = score >= threshold if threshold is not None else verdict["pass"]
+
+        return {
+            "type": a_type,
+            "passed": passed,
+            "reason": verdict["reason"],
+            "score": score,
+        }
+
+    @staticmethod
+    def _parse_verdict(text: str) -> dict[str, Any]:
+        """채점 모델 응답에서 JSON 판정 추출"""
+        match = re.search(r"\{.*\}", text, re.DOTALL)
+        if not match:
+            return {"pass": False, "score": 0.0, "reason": f"Unparseable grader output: {text}"}
+
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {"pass": False, "score": 0.0, "reason": f"Unparseable grader output: {text}"}
+
+        passed = bool(data.get("pass", False))
+        try:
+            score = float(data.get("score", 1.0 if passed else 0.0))
+        except (TypeError, ValueError):
+            score = 1.0 if passed else 0.0
+
+        return {"pass": passed, "score": score, "reason": data.get("reason", "")}
+
+    @staticmethod
+    def _is_json(output: str) -> bool:
+        """JSON 여부 확인"""
+        try:
+            json.loads(output)
+            return True
+        except (json.JSONDecodeError, TypeError):
+            return False
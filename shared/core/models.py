@@ -37,6 +37,21 @@ class TestRunStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class JobStatus(str, Enum):
+    """실행 작업 큐 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"         # 워커가 lease를 잡고 실행 중
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class ExecutionEngine(str, Enum):
+    """테스트 실행 엔진"""
+    PROMPTFOO = "promptfoo"     # promptfoo CLI subprocess
+    NATIVE = "native"           # in-process asyncio 엔진
+
+
 class PromptStatus(str, Enum):
     """프롬프트 버전 상태 (Fastcampus Part 8)"""
     DRAFT = "draft"
@@ -0,0 +1,194 @@
+"""asyncio 기반 in-process 실행 엔진
+
+promptfoo subprocess 대신 어댑터로 직접 LLM을 호출하고
+assertion을 Python으로 평가한다. PromptfooRunner와 같은 입력/출력 형식을 사용하므로
+TestExecutor에서 엔진만 바꿔 끼울 수 있다.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+
+from ..adapters.base import BaseLLMAdapter
+from ..adapters.together_ai import create_together_adapter
+from .assertions import AssertionEvaluator
+from .mapping import PromptVariableExtractor
+from .pipeline import iter_concurrent
+
+
+class NativeRunner:
+    """어댑터를 직접 호출하는 asyncio 실행 엔진
+
+    prompt × model × case 셀을 bounded concurrency로 병렬 실행
+    """
+
+    def __init__(
+        self,
+        adapter: BaseLLMAdapter | None = None,
+        concurrency: int = 8,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        streaming: bool = False,
+    ):
+        """
+        Args:
+            adapter: LLM 어댑터 (없으면 Together AI 어댑터 생성)
+            concurrency: 동시 실행 셀 수
+            temperature: 샘플링 온도
+            max_tokens: 최대 출력 토큰
+            streaming: True면 모든 셀을 스트리밍으로 호출해 TTFT/토큰 간 지연 측정
+        """
+        self._adapter = adapter
+        self.concurrency = concurrency
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.streaming = streaming
+
+    @property
+    def adapter(self) -> BaseLLMAdapter:
+        if self._adapter is None:
+            self._adapter = create_together_adapter()
+        return self._adapter
+
+    async def run_eval(
+        self,
+        prompts: list[dict],
+        model_ids: list[str],
+        tests: list[dict],
+        timeout: int = 300,
+    ) -> list[dict]:
+        """전체 셀 실행 후 결과 일괄 반환
+
+        Args:
+            prompts: [{"id": "prompt_1", "content": "{{question}}에 답해"}]
+            model_ids: ["meta-llama/Llama-3.3-70B-Instruct-Turbo"]
+            tests: [{"vars": {"question": "서울 인구?"}, "assert": [...]}]
+            timeout: 전체 타임아웃 (초)
+
+        Returns:
+            PromptfooRunner.parse_results와 같은 형식의 결과 리스트
+        """
+        return [r async for r in self.iter_results(prompts, model_ids, tests, timeout=timeout)]
+
+    async def iter_results(
+        self,
+        prompts: list[dict],
+        model_ids: list[str],
+        tests: Iterable[dict] | AsyncIterable[dict],
+        timeout: int = 300,
+        should_run: Callable[[dict, str, dict], bool] | None = None,
+    ) -> AsyncIterator[dict]:
+        """셀이 완료되는 순서대로 결과를 yield
+
+        결과를 모아두지 않으므로 셀 수와 무관하게 메모리가 일정하다.
+
+        Args:
+            prompts: 프롬프트 목록
+            model_ids: 모델 ID 목록
+            tests: 테스트 케이스 목록 또는 async iterable (필요한 만큼만 읽음)
+            timeout: 전체 타임아웃 (초)
+            should_run: 셀 필터 (prompt, model_id, test) → False면 건너뜀 (resume용)
+
+        Yields:
+            파싱된 결과 dict (완료 순서)
+        """
+        async def iter_tests():
+            if hasattr(tests, "__aiter__"):
+                async for test in tests:
+                    yield test
+            else:
+                for test in tests:
+                    yield test
+
+        async def iter_cells():
+            async for test in iter_tests():
+                for prompt in prompts:
+                    for model_id in model_ids:
+                        if should_run and not should_run(prompt, model_id, test):
+                            continue
+                        yield prompt, model_id, test
+
+        async def run(cell: tuple[dict, str, dict]) -> dict:
+            return await self.run_cell(*cell)
+
+        results = iter_concurrent(
+            iter_cells(), run, self.concurrency, timeout, name="native run"
+        )
+        try:
+            async for result in results:
+                yield result
+        finally:
+            await results.aclose()
+
+    async def run_cell(self, prompt: dict, model_id: str, test: dict) -> dict:
+        """단일 셀 (prompt, model, case) 실행 + assertion 평가"""
+        vars_data = dict(test.get("vars", {}))
+        rendered = PromptVariableExtractor.render(prompt["content"], vars_data)
+
+        result = {
+            "prompt_id": prompt["id"],
+            "prompt_raw": rendered,
+            "model_id": model_id,
+            "output": "",
+            "latency_ms": 0,
+            "input_tokens": None,
+            "output_tokens": None,
+            "passed": False,
+            "assertion_results": [],
+            "error": None,
+            "vars": vars_data,
+            "stream_metrics": None,
+        }
+
+        generate = self.adapter.generate_measured if self.streaming else self.adapter.generate
+        try:
+            response = await generate(
+                rendered,
+                model=model_id,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+            )
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            return result
+
+        result.update({
+            "output": response.content,
+            "latency_ms": response.latency_ms,
+            "input_tokens": response.input_tokens,
+            "output_tokens": response.output_tokens,
+            "cached": response.cached,
+            "stream_metrics": (
+                response.stream_metrics.model_dump() if response.stream_metrics else None
+            ),
+        })
+
+        evaluator = AssertionEvaluator(grader=self._make_grader(model_id))
+        try:
+            passed, assertion_results = await evaluator.evaluate(
+                test.get("assert", []),
+                response.content,
+            )
+        except Exception as e:
+            result["error"] = f"Assertion error: {e}"
+            return result
+
+        result["passed"] = passed
+        result["assertion_results"] = assertion_results
+        return result
+
+    def _make_grader(self, model_id: str):
+        """llm-rubric 채점 함수 (같은 모델, temperature 0)"""
+        async def grade(prompt: str) -> str:
+            response = await self.adapter.generate(
+                prompt,
+                model=model_id,
+                temperature=0.0,
+                max_tokens=512,
+            )
+            return response.content
+
+        return grade
+
+    async def close(self) -> None:
+        """어댑터 종료"""
+        if self._adapter is not None and hasattr(self._adapter, "close"):
+            await self._adapter.close()
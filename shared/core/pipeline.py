@@ -0,0 +1,115 @@
+"""producer → worker N개 → 소비자 파이프라인 (NativeRunner, PromptfooRunner 공용)
+
+items를 읽는 producer task 하나와 handle을 실행하는 worker task N개를 띄우고
+완료 순서대로 결과를 yield한다. 큐는 bounded라서 items를 미리 다 읽지 않는다.
+handle이 async iterator를 반환하면 (promptfoo shard 등) 결과가 나오는 대로 하나씩 전달한다.
+
+- producer(items 순회)나 worker(handle)가 예외를 던지면 다른 task를 정리하고
+  소비자에게 원래 예외를 바로 다시 던짐 (전체 timeout까지 기다리지 않음)
+- 전체 timeout이 지나면 asyncio.TimeoutError
+"""
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def iter_concurrent(
+    items: AsyncIterable[T],
+    handle: Callable[[T], Awaitable[R] | AsyncIterator[R]],
+    workers: int,
+    timeout: float,
+    buffer: int | None = None,
+    name: str = "run",
+) -> AsyncIterator[R]:
+    """items를 workers개 task로 handle하고 결과를 완료 순서대로 yield
+
+    Args:
+        items: 처리할 항목 (필요한 만큼만 읽음)
+        handle: 항목 하나 처리 (결과 하나를 await하거나, 여러 결과를 async iterator로 반환)
+        workers: 동시에 실행할 handle 수
+        timeout: 전체 타임아웃 (초)
+        buffer: 입력/결과 대기열 크기 (기본 workers * 2)
+        name: 타임아웃 메시지용 이름
+
+    Raises:
+        asyncio.TimeoutError: 전체 타임아웃 초과
+        Exception: items 순회나 handle에서 발생한 원래 예외
+    """
+    buffer = buffer or workers * 2
+    pending: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+    done: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+    loop = asyncio.get_running_loop()
+    failed = loop.create_future()  # 처음 실패한 task의 예외
+
+    async def produce() -> None:
+        async for item in items:
+            await pending.put((item,))
+        for _ in range(workers):
+            await pending.put(None)
+
+    async def work() -> None:
+        while True:
+            entry = await pending.get()
+            if entry is None:
+                await done.put(None)
+                return
+            output = handle(entry[0])
+            if hasattr(output, "__aiter__"):
+                # 취소되면 결과를 기다리며 멈춰 있는 generator도 바로 정리 (자식 프로세스 종료 등)
+                async with aclosing(output):
+                    async for result in output:
+                        await done.put(result)
+            else:
+                await done.put(await output)
+
+    def watch(task: asyncio.Task) -> None:
+        if task.cancelled() or failed.done():
+            return
+        error = task.exception()
+        if error is not None:
+            failed.set_exception(error)
+
+    deadline = loop.time() + timeout
+    tasks = [asyncio.create_task(produce())]
+    tasks += [asyncio.create_task(work()) for _ in range(workers)]
+    for task in tasks:
+        task.add_done_callback(watch)
+
+    try:
+        finished = 0
+        while finished < workers:
+            if failed.done():
+                failed.result()  # 원래 예외 다시 던짐
+
+            if done.empty():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError(f"{name} timed out after {timeout}s")
+                getter = asyncio.ensure_future(done.get())
+                await asyncio.wait(
+                    (getter, failed),
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not getter.done():
+                    getter.cancel()
+                    continue  # 실패 또는 타임아웃 → 루프 처음에서 처리
+                result = getter.result()
+            else:
+                result = done.get_nowait()
+
+            if result is None:
+                finished += 1
+                continue
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if failed.done() and not failed.cancelled():
+            failed.exception()  # 소비자가 먼저 멈춘 경우에도 retrieved 처리
@@ -3,19 +3,37 @@
 import asyncio
 import json
 import os
+import re
+import signal
 import sys
 import subprocess
 import tempfile
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
 from pathlib import Path
 from typing import Any
-from concurrent.futures import ThreadPoolExecutor
 
 import yaml
 
+from .pipeline import iter_concurrent
+
 
 class PromptfooRunner:
     """promptfoo를 subprocess로 실행하고 결과를 파싱"""
 
+    # 병렬 실행 시 shard당 기본 테스트 케이스 수
+    DEFAULT_SHARD_SIZE = 100
+    # 에러 메시지에 포함할 stderr 마지막 줄 수
+    STDERR_TAIL_LINES = 50
+    # stdout/stderr 한 줄 최대 길이 (바이트)
+    STREAM_LINE_LIMIT = 1024 * 1024
+    # 실행 중 JSONL 출력 파일에 새 결과가 쓰였는지 확인하는 주기 (초)
+    OUTPUT_POLL_INTERVAL = 0.2
+    # 진행률 출력 ("12/40", 날짜 등 "2024/10/18" 형식은 제외)
+    PROGRESS_PATTERN = re.compile(r"(?<![\d/])(\d+)\s*/\s*(\d+)(?![\d/])")
+    # 터미널 제어 문자 (진행률 표시줄의 커서 이동/색상)
+    ANSI_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
     def __init__(self, project_root: Path | None = None):
         """
         Args:
@@ -91,6 +109,7 @@ class PromptfooRunner:
         output_path: Path | None = None,
         timeout: int = 300,
         default_test: dict | None = None,
+        use_cache: bool = False,
     ) -> dict:
         """promptfoo eval 실행
 
@@ -101,14 +120,233 @@ class PromptfooRunner:
             output_path: 결과 저장 경로
             timeout: 실행 타임아웃 (초)
             default_test: 기본 assertion 등
+            use_cache: promptfoo 응답 캐시 사용 여부 (False면 --no-cache)
 
         Returns:
             promptfoo 평가 결과 dict
         """
         # 설정 생성
         config = self._build_config(prompts, model_ids, tests, default_test)
+        config_path = self._write_config(config)
+
+        # 출력 파일 경로
+        if output_path is None:
+            output_path = self._temp_output_path(".json")
+
+        try:
+            await self._run_cli(config_path, output_path, timeout, use_cache)
+
+            # 결과 파싱
+            with open(output_path, encoding="utf-8") as f:
+                results = json.load(f)
+
+            return results
+
+        finally:
+            # 임시 파일 정리 (결과 파일은 호출자가 지정한 경우 유지)
+            config_path.unlink(missing_ok=True)
+
+    async def iter_results(
+        self,
+        prompts: list[dict],
+        model_ids: list[str],
+        tests: Iterable[dict] | AsyncIterable[dict],
+        timeout: int = 300,
+        default_test: dict | None = None,
+        use_cache: bool = False,
+        workers: int = 1,
+        shard_size: int | None = None,
+        shard_timeout: int | None = None,
+        shard_retries: int = 1,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> AsyncIterator[dict]:
+        """promptfoo eval 실행 후 결과를 한 건씩 파싱하여 yield
+
+        tests는 설정 파일에 한 건씩 이어 쓰고, promptfoo가 셀마다 JSONL 출력(-o *.jsonl)에
+        추가하는 줄을 실행 중에 바로 읽어 yield하므로 (프로세스 종료를 기다리지 않음)
+        전체 케이스/결과를 메모리에 올리지 않는다.
+
+        workers > 1이거나 shard_size를 지정하면 tests를 shard_size개씩 나눠
+        promptfoo 프로세스를 최대 workers개 동시에 실행하고,
+        shard마다 결과가 쓰이는 대로 yield한다.
+        재시도 후에도 실패한 shard는 셀마다 error 결과로 반환하고 나머지 shard는 계속 실행한다.
+
+        Args:
+            timeout: 전체 타임아웃 (초)
+            workers: 동시에 실행할 promptfoo 프로세스 수
+            shard_size: shard당 테스트 케이스 수 (workers > 1이면 기본 DEFAULT_SHARD_SIZE)
+            shard_timeout: shard 하나의 타임아웃 (초, 기본은 timeout)
+            shard_retries: shard 실패 시 재시도 횟수
+            on_progress: 실행 중 진행률 콜백 (새로 완료된 셀 수,
+                JSONL 출력에서 읽은 셀 수와 promptfoo 진행률 출력 중 큰 값 기준)
+
+        Yields:
+            parse_result 형식의 결과 dict
+        """
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+
+        config = self._build_config(prompts, model_ids, [], default_test)
+
+        if workers == 1 and shard_size is None:
+            config_path, count = await self._write_config_stream(config, tests)
+            output_path = self._temp_output_path(".jsonl")
+            tracker = _CellTracker(on_progress, self._cell_count(config, count))
+            try:
+                async for result in self._iter_cli(
+                    config_path, output_path, timeout, use_cache, tracker
+                ):
+                    yield result
+            finally:
+                config_path.unlink(missing_ok=True)
+                output_path.unlink(missing_ok=True)
+            return
+
+        shard_size = shard_size or self.DEFAULT_SHARD_SIZE
+        shard_timeout = shard_timeout or timeout
+
+        async def iter_indexed_shards():
+            index = 0
+            async for shard in self._iter_shards(tests, shard_size):
+                yield index, shard
+                index += 1
+
+        def run(item: tuple[int, list[dict]]) -> AsyncIterator[dict]:
+            index, shard = item
+            return self._run_shard(
+                index, config, shard, shard_timeout, shard_retries, use_cache, on_progress
+            )
+
+        results = iter_concurrent(
+            iter_indexed_shards(), run, workers, timeout,
+            buffer=workers,  # shard는 크므로 대기열을 worker 수만큼만
+            name="promptfoo run",
+        )
+        try:
+            async for result in results:
+                yield result
+        finally:
+            await results.aclose()
+
+    async def _run_shard(
+        self,
+        index: int,
+        config: dict,
+        shard: list[dict],
+        timeout: int,
+        retries: int,
+        use_cache: bool,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> AsyncIterator[dict]:
+        """shard 하나 실행 (실패 시 재시도, 끝내 실패하면 남은 셀별 error 결과)
+
+        재시도는 shard 전체를 다시 실행하므로 이미 yield한 셀은 건너뛰고,
+        진행률도 이미 보고한 셀 수를 넘는 만큼만 보고한다 (_CellTracker를 재시도 간 공유).
+        """
+        config_path, count = await self._write_config_stream(config, shard)
+        output_path = self._temp_output_path(".jsonl")
+        tracker = _CellTracker(on_progress, self._cell_count(config, count))
+
+        try:
+            error = None
+            for attempt in range(retries + 1):
+                if attempt:
+                    await asyncio.sleep(min(2 ** (attempt - 1), 30))
+                try:
+                    async for result in self._iter_cli(
+                        config_path, output_path, timeout, use_cache, tracker
+                    ):
+                        yield result
+                    return
+                except (RuntimeError, ValueError, subprocess.TimeoutExpired) as e:
+                    error = e
+
+            message = f"promptfoo shard {index} failed after {retries + 1} attempts: {error}"
+            for test in shard:
+                for prompt in config["prompts"]:
+                    for provider in config["providers"]:
+                        result = self._error_result(prompt, provider, test, message)
+                        if tracker.add(self._cell_key(result)):
+                            yield result
+
+        finally:
+            config_path.unlink(missing_ok=True)
+            output_path.unlink(missing_ok=True)
+
+    @staticmethod
+    async def _iter_shards(
+        tests: Iterable[dict] | AsyncIterable[dict],
+        size: int,
+    ) -> AsyncIterator[list[dict]]:
+        """tests를 size개씩 묶어 yield"""
+        shard = []
+        if hasattr(tests, "__aiter__"):
+            async for test in tests:
+                shard.append(test)
+                if len(shard) >= size:
+                    yield shard
+                    shard = []
+        else:
+            for test in tests:
+                shard.append(test)
+                if len(shard) >= size:
+                    yield shard
+                    shard = []
+        if shard:
+            yield shard
+
+    @staticmethod
+    def _read_new_lines(output_path: Path, position: int, final: bool) -> tuple[int, list[bytes]]:
+        """JSONL 출력 파일에서 position 이후에 추가된 줄
+
+        쓰는 중인 마지막 줄은 다음 호출로 미룬다 (final이면 개행 없는 마지막 줄도 포함).
+        파일이 position보다 작아졌으면 (promptfoo가 다시 씀) 처음부터 읽는다.
+
+        Returns:
+            (다음 position, 줄 목록)
+        """
+        try:
+            with open(output_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < position:
+                    position = 0
+                f.seek(position)
+                data = f.read()
+        except FileNotFoundError:
+            return position, []
+
+        if not final:
+            data = data[:data.rfind(b"\n") + 1]
+        # JSON 문자열 안의 U+2028 등으로 나뉘지 않도록 \n에서만 분리
+        return position + len(data), [line for line in data.split(b"\n") if line.strip()]
+
+    @staticmethod
+    def _cell_key(result: dict) -> tuple:
+        """셀 식별 키 (prompt, provider, vars)"""
+        return (
+            result["prompt_id"],
+            result["model_id"],
+            json.dumps(result["vars"], sort_keys=True, ensure_ascii=False, default=str),
+        )
+
+    @staticmethod
+    def _error_result(prompt: dict, provider: dict, test: dict, message: str) -> dict:
+        """실행하지 못한 셀의 결과 (parse_result 형식)"""
+        return {
+            "prompt_id": prompt["label"],
+            "prompt_raw": None,
+            "model_id": provider["id"],
+            "output": None,
+            "latency_ms": None,
+            "input_tokens": None,
+            "output_tokens": None,
+            "passed": False,
+            "assertion_results": [],
+            "error": message,
+            "vars": dict(test.get("vars") or {}),
+        }
 
-        # 임시 파일 생성
+    def _write_config(self, config: dict) -> Path:
+        """설정을 임시 YAML 파일로 저장"""
         with tempfile.NamedTemporaryFile(
             mode="w",
             suffix=".yaml",
@@ -116,58 +354,206 @@ class PromptfooRunner:
             encoding="utf-8",
         ) as f:
             yaml.dump(config, f, allow_unicode=True)
-            config_path = Path(f.name)
+            return Path(f.name)
 
-        # 출력 파일 경로
-        if output_path is None:
-            output_file = tempfile.NamedTemporaryFile(
-                suffix=".json",
-                delete=False,
-            )
-            output_path = Path(output_file.name)
-            output_file.close()
+    async def _write_config_stream(
+        self,
+        config: dict,
+        tests: Iterable[dict] | AsyncIterable[dict],
+    ) -> tuple[Path, int]:
+        """설정을 임시 YAML 파일로 저장 (tests는 한 건씩 이어 씀)
 
+        Returns:
+            (설정 파일 경로, 테스트 수)
+        """
+        base = {key: value for key, value in config.items() if key != "tests"}
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            suffix=".yaml",
+            delete=False,
+            encoding="utf-8",
+        ) as f:
+            yaml.dump(base, f, allow_unicode=True)
+
+            def write(test: dict, first: bool) -> None:
+                if first:
+                    f.write("tests:\n")
+                yaml.dump([test], f, allow_unicode=True)
+
+            count = 0
+            if hasattr(tests, "__aiter__"):
+                async for test in tests:
+                    write(test, count == 0)
+                    count += 1
+            else:
+                for test in tests:
+                    write(test, count == 0)
+                    count += 1
+
+            if count == 0:
+                f.write("tests: []\n")
+            return Path(f.name), count
+
+    @staticmethod
+    def _cell_count(config: dict, test_count: int) -> int:
+        """promptfoo 프로세스 하나가 실행할 셀 수 (테스트 × 프롬프트 × 프로바이더)"""
+        return test_count * len(config["prompts"]) * len(config["providers"])
+
+    @staticmethod
+    def _temp_output_path(suffix: str) -> Path:
+        """임시 출력 파일 경로 생성"""
+        output_file = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        output_file.close()
+        return Path(output_file.name)
+
+    async def _run_cli(
+        self,
+        config_path: Path,
+        output_path: Path,
+        timeout: int,
+        use_cache: bool = False,
+    ) -> None:
+        """promptfoo eval CLI 실행 (결과는 끝난 뒤 output_path에서 읽음)
+
+        Raises:
+            subprocess.TimeoutExpired: timeout 초과
+            RuntimeError: promptfoo 비정상 종료
+        """
+        async for _ in self._iter_cli(config_path, output_path, timeout, use_cache, tail=False):
+            pass
+
+    async def _iter_cli(
+        self,
+        config_path: Path,
+        output_path: Path,
+        timeout: int,
+        use_cache: bool = False,
+        tracker: "_CellTracker | None" = None,
+        tail: bool = True,
+    ) -> AsyncIterator[dict]:
+        """promptfoo eval CLI 실행, JSONL 출력에 쓰이는 결과를 실행 중에 바로 yield
+
+        스레드를 점유하지 않는 asyncio subprocess로 실행하고 stdout/stderr를
+        줄 단위로 읽는다 (stderr는 에러 메시지용으로 마지막 몇 줄만 보관).
+        promptfoo는 셀이 끝날 때마다 JSONL 출력에 한 줄씩 추가하므로
+        OUTPUT_POLL_INTERVAL마다 새로 쓰인 줄을 읽어 parse_result 형식으로 yield한다.
+        타임아웃이나 취소 시 promptfoo가 띄운 자식 프로세스까지 프로세스 그룹째 종료한다.
+
+        Args:
+            tracker: 이미 yield한 셀과 보고한 진행률 (재시도 간 공유 → 다시 쓰인 셀은 건너뜀)
+            tail: False면 결과를 읽지 않고 실행만 (JSON 출력 등)
+
+        Raises:
+            subprocess.TimeoutExpired: timeout 초과 (그때까지 쓰인 결과는 먼저 yield)
+            RuntimeError: promptfoo 비정상 종료 (그때까지 쓰인 결과는 먼저 yield)
+        """
+        # promptfoo 실행 명령 구성
+        cmd = self.promptfoo_cmd + [
+            "eval",
+            "-c", str(config_path),
+            "-o", str(output_path),
+        ]
+        if not use_cache:
+            cmd.append("--no-cache")
+
+        options = {
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.PIPE,
+            "cwd": str(self.project_root),
+            "env": {**os.environ},
+            "limit": self.STREAM_LINE_LIMIT,
+        }
+        if tail:
+            output_path.write_bytes(b"")  # 이전 시도의 출력 제거
+        if self._is_windows:
+            # Windows에서는 npm(.cmd) 실행을 위해 shell 사용
+            proc = await asyncio.create_subprocess_shell(subprocess.list2cmdline(cmd), **options)
+        else:
+            proc = await asyncio.create_subprocess_exec(*cmd, start_new_session=True, **options)
+
+        stderr_tail: deque[str] = deque(maxlen=self.STDERR_TAIL_LINES)
+        tracker = tracker or _CellTracker()
+
+        async def pump(stream: asyncio.StreamReader, keep: bool) -> None:
+            async for raw in stream:
+                line = raw.decode("utf-8", errors="replace").rstrip()
+                if keep and line:
+                    stderr_tail.append(line)
+                # 진행률 표시줄은 터미널이 아니면 출력되지 않을 수 있음 → 결과 수로도 보고
+                current = self.parse_progress(line, tracker.cells)
+                if current is not None:
+                    tracker.report(current)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        position = 0
+        running = asyncio.gather(pump(proc.stdout, False), pump(proc.stderr, True), proc.wait())
         try:
-            # promptfoo 실행 명령 구성
-            cmd = self.promptfoo_cmd + [
-                "eval",
-                "-c", str(config_path),
-                "-o", str(output_path),
-                "--no-cache",
-                "--no-progress-bar",
-            ]
-
-            # Windows에서는 ThreadPoolExecutor로 subprocess.run 실행
-            def run_subprocess():
-                return subprocess.run(
-                    cmd,
+            while True:
+                finished = running.done()
+                if tail:
+                    position, lines = self._read_new_lines(output_path, position, finished)
+                    for line in lines:
+                        result = self.parse_result(json.loads(line))
+                        if tracker.add(self._cell_key(result)):
+                            yield result
+                if finished:
+                    running.result()  # pump 예외 전파
+                    break
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                await asyncio.wait(
+                    (running,), timeout=min(self.OUTPUT_POLL_INTERVAL, remaining)
+                )
+        except BaseException:
+            # 타임아웃/취소/파싱 실패 → 프로세스 그룹 종료 후 전파
+            self._kill(proc)
+            running.cancel()
+            await asyncio.gather(running, proc.wait(), return_exceptions=True)
+            raise
+
+        if proc.returncode != 0:
+            error_msg = "\n".join(stderr_tail)
+            raise RuntimeError(f"promptfoo failed (exit {proc.returncode}): {error_msg}")
+
+    def _kill(self, proc: asyncio.subprocess.Process) -> None:
+        """프로세스 그룹 종료 (이미 끝났으면 무시)"""
+        if proc.returncode is not None:
+            return
+        try:
+            if self._is_windows:
+                subprocess.run(
+                    ["taskkill", "/F", "/T", "/PID", str(proc.pid)],
                     capture_output=True,
-                    cwd=str(self.project_root),
-                    env={**os.environ},
-                    timeout=timeout,
-                    shell=self._is_windows,  # Windows에서만 shell=True
                 )
+            else:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass  # 그 사이 종료됨
 
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as pool:
-                result = await loop.run_in_executor(pool, run_subprocess)
-
-            if result.returncode != 0:
-                error_msg = result.stderr.decode("utf-8", errors="replace")
-                raise RuntimeError(f"promptfoo failed (exit {result.returncode}): {error_msg}")
+    @classmethod
+    def parse_progress(cls, line: str, total: int | None = None) -> int | None:
+        """출력 한 줄에서 완료 셀 수 추출 ("12/40" 형식, 없으면 None)
 
-            # 결과 파싱
-            with open(output_path, "r", encoding="utf-8") as f:
-                results = json.load(f)
+        진행률 표시줄은 \r로 같은 줄을 덮어쓰므로 마지막 화면만 본다.
 
-            return results
-
-        finally:
-            # 임시 파일 정리
-            config_path.unlink(missing_ok=True)
-            if output_path and output_path.exists():
-                # 결과 파일은 호출자가 지정한 경우 유지
-                pass
+        Args:
+            total: 전체 셀 수 (지정하면 분모가 같은 경우만 진행률로 봄 → 출력 내용의 분수 제외)
+        """
+        frames = [f for f in cls.ANSI_PATTERN.sub("", line).split("\r") if f.strip()]
+        if not frames:
+            return None
+        match = cls.PROGRESS_PATTERN.search(frames[-1])
+        if not match:
+            return None
+        current, found_total = int(match.group(1)), int(match.group(2))
+        if found_total == 0 or current > found_total:
+            return None
+        if total is not None and found_total != total:
+            return None
+        return current
 
     def parse_results(self, raw_results: dict) -> list[dict]:
         """promptfoo 결과를 내부 형식으로 변환
@@ -178,8 +564,6 @@ class PromptfooRunner:
         Returns:
             파싱된 결과 리스트
         """
-        parsed = []
-
         # promptfoo 출력 구조: results.results가 실제 결과 리스트
         results_wrapper = raw_results.get("results", {})
         if isinstance(results_wrapper, dict):
@@ -187,36 +571,39 @@ class PromptfooRunner:
         else:
             results = results_wrapper
 
-        for result in results:
-            prompt_info = result.get("prompt", {})
-            provider_info = result.get("provider", {})
-            response = result.get("response", {})
-
-            # assertion 결과 파싱
-            assertion_results = []
-            for gr in result.get("gradingResult", {}).get("componentResults", []):
-                assertion_results.append({
-                    "type": gr.get("assertion", {}).get("type"),
-                    "passed": gr.get("pass", False),
-                    "reason": gr.get("reason"),
-                    "score": gr.get("score"),
-                })
-
-            parsed.append({
-                "prompt_id": prompt_info.get("label"),  # label에서 우리 ID 추출
-                "prompt_raw": prompt_info.get("raw"),
-                "model_id": provider_info.get("id"),
-                "output": response.get("output"),
-                "latency_ms": response.get("latencyMs"),
-                "input_tokens": response.get("tokenUsage", {}).get("prompt"),
-                "output_tokens": response.get("tokenUsage", {}).get("completion"),
-                "passed": result.get("success", False),
-                "assertion_results": assertion_results,
-                "error": result.get("error"),
-                "vars": result.get("vars", {}),
+        return [self.parse_result(result) for result in results]
+
+    def parse_result(self, result: dict) -> dict:
+        """promptfoo 단일 결과를 내부 형식으로 변환"""
+        prompt_info = result.get("prompt", {})
+        provider_info = result.get("provider", {})
+        response = result.get("response") or {}
+
+        # assertion 결과 파싱
+        assertion_results = []
+        for gr in (result.get("gradingResult") or {}).get("componentResults", []):
+            assertion_results.append({
+                "type": gr.get("assertion", {}).get("type"),
+                "passed": gr.get("pass", False),
+                "reason": gr.get("reason"),
+                "score": gr.get("score"),
             })
 
-        return parsed
+        return {
+            "prompt_id": prompt_info.get("label"),  # label에서 우리 ID 추출
+            "prompt_raw": prompt_info.get("raw"),
+            "model_id": provider_info.get("id"),
+            "output": response.get("output"),
+            # 캐시 응답은 호출하지 않았으므로 지연 0 + cached 표시 (latency 집계에서 제외)
+            "latency_ms": 0 if response.get("cached") else response.get("latencyMs"),
+            "cached": bool(response.get("cached")),
+            "input_tokens": response.get("tokenUsage", {}).get("prompt"),
+            "output_tokens": response.get("tokenUsage", {}).get("completion"),
+            "passed": result.get("success", False),
+            "assertion_results": assertion_results,
+            "error": result.get("error"),
+            "vars": result.get("vars", {}),
+        }
 
     async def run_and_parse(
         self,
@@ -228,3 +615,41 @@ class PromptfooRunner:
         """실행 + 파싱을 한번에"""
         raw = await self.run_eval(prompts, model_ids, tests, **kwargs)
         return self.parse_results(raw)
+
+
+class _CellTracker:
+    """promptfoo 프로세스(shard) 하나의 셀 진행 상태 (재시도 간 공유)
+
+    - 이미 yield한 셀 키를 기억해 재시도에서 다시 쓰인 셀은 건너뜀
+    - 진행률은 yield한 셀 수와 promptfoo 출력의 "완료/전체" 중 큰 값 기준으로,
+      이미 보고한 값을 넘는 만큼만 on_progress에 전달 (재시도해도 같은 셀을 두 번 세지 않음)
+    """
+
+    def __init__(
+        self,
+        on_progress: Callable[[int], None] | None = None,
+        cells: int | None = None,
+    ):
+        """
+        Args:
+            on_progress: 새로 완료된 셀 수 콜백
+            cells: 프로세스 하나가 실행할 셀 수 (출력의 "완료/전체" 확인용)
+        """
+        self.on_progress = on_progress
+        self.cells = cells
+        self.seen: set[tuple] = set()
+        self.reported = 0
+
+    def add(self, key: tuple) -> bool:
+        """셀 결과 추가 (처음 보는 셀이면 True)"""
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.report(len(self.seen))
+        return True
+
+    def report(self, completed: int) -> None:
+        """완료 셀 수 보고 (이전 보고보다 커진 만큼만 on_progress)"""
+        if self.on_progress and completed > self.reported:
+            self.on_progress(completed - self.reported)
+            self.reported = completed
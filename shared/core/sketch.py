@@ -0,0 +1,99 @@
+"""스트리밍 분위수 스케치
+
+값을 모두 저장하지 않고 로그 스케일 버킷 카운트만 유지해 p50/p95 등을 근사한다
+(DDSketch 방식). 상대 오차가 relative_accuracy 이내로 보장되고,
+버킷 dict만 저장하면 되므로 JSON 직렬화와 병합이 간단하다.
+"""
+
+import math
+from typing import Any
+
+
+class QuantileSketch:
+    """상대 오차 보장 분위수 스케치
+
+    사용 예:
+        sketch = QuantileSketch()
+        for latency in latencies:
+            sketch.add(latency)
+        sketch.quantile(0.95)
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Args:
+            relative_accuracy: 분위수 추정 상대 오차 (0.01 = 1%)
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, value: float) -> None:
+        """값 추가 (0 이하는 0 버킷)"""
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """q 분위수 근사값 (q: 0~1, 값이 없으면 None)"""
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        running = self.zero_count
+        for key in sorted(self.bins):
+            running += self.bins[key]
+            if running > rank:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """다른 스케치 병합 (같은 relative_accuracy여야 함)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative_accuracy")
+
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON 직렬화용 dict"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        """to_dict 결과에서 복원"""
+        sketch = cls(relative_accuracy=data.get("relative_accuracy", 0.01))
+        sketch.bins = {int(key): count for key, count in (data.get("bins") or {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        return sketch
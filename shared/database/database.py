@@ -1,6 +1,6 @@
 """SQLite 데이터베이스 관리
 
-스키마 버전: 3.0
+스키마 버전: 5.0
 - prompt_versions 테이블 추가 (Semantic Versioning)
 - test_datasets 테이블 추가 (3단계 Fallback 매핑)
 - applications 테이블 추가 (Naver D2 개념)
@@ -8,9 +8,16 @@
 - test_runs에 resolved_mapping 추가
 - test_datasets에 default_assertions 추가 (v3)
 - test_cases에 assertions 추가 (v3)
+- llm_cache 테이블 추가 (LLM 응답 캐시)
+- test_results에 스트리밍 지표 추가 (v4: TTFT, tokens/sec, 토큰 간 지연)
+- test_results에 cached 추가 (v5: 캐시 응답 셀은 latency 집계에서 제외)
+- evaluation_summaries 테이블 추가 (평가 요약 캐시)
+- run_aggregates 테이블 추가 (실행 중 (prompt, model)별 누적 집계)
 """
 
 import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -21,18 +28,28 @@ import aiosqlite
 class Database:
     """SQLite 데이터베이스 관리 클래스"""
 
-    SCHEMA_VERSION = 3
+    SCHEMA_VERSION = 5
 
     def __init__(self, db_path: str | Path):
         self.db_path = Path(db_path)
         self._connection: aiosqlite.Connection | None = None
 
-    async def connect(self) -> None:
-        """데이터베이스 연결"""
+    async def connect(self, create_tables: bool = True) -> None:
+        """데이터베이스 연결
+
+        Args:
+            create_tables: 테이블 생성/마이그레이션 실행 여부 (이미 준비된 DB에 추가 연결 시 False)
+        """
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._connection = await aiosqlite.connect(self.db_path)
+        # API 서버와 워커 프로세스가 같은 파일을 공유 → WAL (읽기가 쓰기를 막지 않음)
+        # + 쓰기 잠금 대기 시간을 넉넉히 (짧은 트랜잭션끼리 순서대로 처리)
+        self._connection = await aiosqlite.connect(self.db_path, timeout=30.0)
         self._connection.row_factory = aiosqlite.Row
-        await self._create_tables()
+        # 결과 행을 반환하는 PRAGMA → 커서를 닫아야 이후 DROP INDEX가 table locked로 막히지 않음
+        async with self._connection.execute("PRAGMA journal_mode=WAL") as cursor:
+            await cursor.fetchone()
+        if create_tables:
+            await self._create_tables()
 
     async def close(self) -> None:
         """데이터베이스 연결 종료"""
@@ -123,8 +140,9 @@ class Database:
                 FOREIGN KEY (dataset_id) REFERENCES test_datasets(id) ON DELETE CASCADE
             );
 
-            CREATE INDEX IF NOT EXISTS idx_test_cases_dataset
-                ON test_cases(dataset_id);
+            DROP INDEX IF EXISTS idx_test_cases_dataset;
+            CREATE INDEX IF NOT EXISTS idx_test_cases_dataset_created
+                ON test_cases(dataset_id, created_at, id);
 
             -- =================================================================
             -- 애플리케이션 테이블 (Model + Prompt + Options)
@@ -168,10 +186,12 @@ class Database:
                 FOREIGN KEY (dataset_id) REFERENCES test_datasets(id)
             );
 
-            CREATE INDEX IF NOT EXISTS idx_test_runs_status
-                ON test_runs(status);
-            CREATE INDEX IF NOT EXISTS idx_test_runs_created
-                ON test_runs(created_at DESC);
+            DROP INDEX IF EXISTS idx_test_runs_status;
+            DROP INDEX IF EXISTS idx_test_runs_created;
+            CREATE INDEX IF NOT EXISTS idx_test_runs_status_created
+                ON test_runs(status, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_test_runs_created_id
+                ON test_runs(created_at, id);
 
             -- =================================================================
             -- 테스트 결과 테이블
@@ -192,15 +212,104 @@ class Database:
                 assertion_results TEXT DEFAULT '[]',
                 passed INTEGER NOT NULL,
                 error TEXT,
+                ttft_ms REAL,
+                tokens_per_second REAL,
+                itl_p50_ms REAL,
+                itl_p95_ms REAL,
+                itl_p99_ms REAL,
+                cached INTEGER NOT NULL DEFAULT 0,  -- 캐시 응답 (호출하지 않아 latency 집계 제외)
                 created_at TEXT NOT NULL,
                 FOREIGN KEY (test_run_id) REFERENCES test_runs(id) ON DELETE CASCADE,
                 FOREIGN KEY (test_case_id) REFERENCES test_cases(id)
             );
 
-            CREATE INDEX IF NOT EXISTS idx_test_results_run
-                ON test_results(test_run_id);
+            DROP INDEX IF EXISTS idx_test_results_run;
+            CREATE INDEX IF NOT EXISTS idx_test_results_run_created
+                ON test_results(test_run_id, created_at, id);
             CREATE INDEX IF NOT EXISTS idx_test_results_passed
                 ON test_results(test_run_id, passed);
+            CREATE INDEX IF NOT EXISTS idx_test_results_cell
+                ON test_results(test_run_id, prompt_id, model_id, test_case_id);
+            DROP INDEX IF EXISTS idx_test_results_case;
+            CREATE INDEX IF NOT EXISTS idx_test_results_case_model
+                ON test_results(test_run_id, test_case_id, model_id, passed, latency_ms);
+            -- latency 백분위수 인덱스는 cached 컬럼 추가 후 생성 (_migrate_to_v5)
+            DROP INDEX IF EXISTS idx_test_results_latency;
+
+            -- =================================================================
+            -- 평가 요약 캐시 테이블 (새 결과 저장 시 삭제 → 다음 조회 때 재계산)
+            -- =================================================================
+            CREATE TABLE IF NOT EXISTS evaluation_summaries (
+                test_run_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                result_count INTEGER NOT NULL,      -- 계산 시점의 test_runs.completed_cases
+                computed_at TEXT NOT NULL,
+                FOREIGN KEY (test_run_id) REFERENCES test_runs(id) ON DELETE CASCADE
+            );
+
+            -- =================================================================
+            -- 실행 중 누적 집계 테이블 ((prompt, model)별, 결과 flush와 같은 트랜잭션)
+            -- =================================================================
+            CREATE TABLE IF NOT EXISTS run_aggregates (
+                test_run_id TEXT NOT NULL,
+                prompt_id TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                passed INTEGER NOT NULL DEFAULT 0,
+                errors INTEGER NOT NULL DEFAULT 0,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                latency_sum REAL NOT NULL DEFAULT 0,
+                latency_sketch TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (test_run_id, prompt_id, model_id),
+                FOREIGN KEY (test_run_id) REFERENCES test_runs(id) ON DELETE CASCADE
+            );
+
+            -- =================================================================
+            -- LLM 응답 캐시 테이블 (모델 + 렌더링된 프롬프트 + 파라미터 해시)
+            -- =================================================================
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                accessed_at TEXT NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed
+                ON llm_cache(accessed_at);
+
+            -- =================================================================
+            -- 실행 작업 큐 테이블 (워커 프로세스가 lease를 잡고 실행, heartbeat로 연장)
+            -- =================================================================
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                test_run_id TEXT NOT NULL,
+                -- queued, running, completed, failed, cancelled
+                status TEXT NOT NULL DEFAULT 'queued',
+                options TEXT NOT NULL DEFAULT '{}',     -- JSON: TestExecutor.execute 인자
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                worker_id TEXT,
+                lease_expires_at TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                heartbeat_at TEXT,
+                finished_at TEXT,
+                FOREIGN KEY (test_run_id) REFERENCES test_runs(id) ON DELETE CASCADE
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_created
+                ON jobs(status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_run_status
+                ON jobs(test_run_id, status);
+            -- test_run당 대기 중/실행 중 작업은 하나 (동시에 execute해도 하나만 성공)
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_run
+                ON jobs(test_run_id) WHERE status IN ('queued', 'running');
 
             -- =================================================================
             -- 스키마 버전 테이블
@@ -212,8 +321,10 @@ class Database:
         """)
         await self._connection.commit()
 
-        # 스키마 마이그레이션 (v3: Assertion 컬럼 추가)
+        # 스키마 마이그레이션 (v3: Assertion 컬럼 추가, v4: 스트리밍 지표, v5: 캐시 응답 표시)
         await self._migrate_to_v3()
+        await self._migrate_to_v4()
+        await self._migrate_to_v5()
 
     async def _migrate_to_v3(self) -> None:
         """v3 마이그레이션: Assertion 컬럼 추가"""
@@ -237,6 +348,47 @@ class Database:
 
         await self._connection.commit()
 
+    async def _migrate_to_v4(self) -> None:
+        """v4 마이그레이션: test_results에 스트리밍 지표 컬럼 추가"""
+        assert self._connection is not None
+
+        for column in (
+            "ttft_ms REAL",
+            "tokens_per_second REAL",
+            "itl_p50_ms REAL",
+            "itl_p95_ms REAL",
+            "itl_p99_ms REAL",
+        ):
+            try:
+                await self._connection.execute(
+                    f"ALTER TABLE test_results ADD COLUMN {column}"
+                )
+            except Exception:
+                pass  # 이미 존재
+
+        await self._connection.commit()
+
+    async def _migrate_to_v5(self) -> None:
+        """v5 마이그레이션: test_results에 cached 컬럼 + 캐시 제외 latency 인덱스"""
+        assert self._connection is not None
+
+        try:
+            await self._connection.execute(
+                "ALTER TABLE test_results ADD COLUMN cached INTEGER NOT NULL DEFAULT 0"
+            )
+        except Exception:
+            pass  # 이미 존재
+
+        # 실제 호출한 셀만의 latency 백분위수 (EvaluationService.PERCENTILE_SQL 커버링)
+        await self._connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_test_results_live_latency
+                ON test_results(test_run_id, latency_ms, prompt_id, model_id)
+                WHERE cached = 0
+            """
+        )
+        await self._connection.commit()
+
     # =========================================================================
     # 기본 CRUD 메서드
     # =========================================================================
@@ -262,6 +414,36 @@ class Database:
         assert self._connection is not None
         await self._connection.commit()
 
+    async def rollback(self) -> None:
+        """롤백"""
+        assert self._connection is not None
+        await self._connection.rollback()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["Database"]:
+        """별도 연결에서 BEGIN ... COMMIT (예외 시 ROLLBACK)
+
+        공유 연결은 여러 요청이 함께 쓰므로, 다른 작업의 commit/rollback이
+        이 트랜잭션을 중간에 커밋하거나 되돌리지 않도록 연결을 따로 연다.
+        트랜잭션 동안 DB 쓰기 잠금을 잡으므로 네트워크 I/O (업로드 읽기, LLM 호출 등)를
+        기다리는 동안 열어 두면 안 된다 (다른 모든 쓰기가 최대 30초 대기 후 실패).
+
+        사용 예:
+            async with db.transaction() as tx:
+                await tx.executemany(...)
+        """
+        tx = Database(self.db_path)
+        await tx.connect(create_tables=False)
+        try:
+            await tx.execute("BEGIN")
+            yield tx
+            await tx.commit()
+        except BaseException:
+            await tx.rollback()
+            raise
+        finally:
+            await tx.close()
+
     async def fetchone(
         self, query: str, params: tuple[Any, ...] | None = None
     ) -> aiosqlite.Row | None:
@@ -0,0 +1,88 @@
+"""공용 fixture: 임시 SQLite DB + 프롬프트/데이터셋/테스트 실행 시드"""
+
+import pytest
+from test_harness_api.services.dataset_service import DatasetService
+from test_harness_api.services.prompt_service import PromptService
+from test_harness_api.services.test_service import TestService
+
+from shared.database.database import Database
+
+
+@pytest.fixture
+async def db(tmp_path):
+    database = Database(tmp_path / "test.db")
+    await database.connect()
+    yield database
+    await database.close()
+
+
+@pytest.fixture
+def test_service(db) -> TestService:
+    return TestService(db)
+
+
+@pytest.fixture
+def make_run(db, test_service):
+    """케이스 n개짜리 데이터셋으로 테스트 실행 생성 (dataset_id를 주면 그 데이터셋 재사용)"""
+
+    async def make(
+        n_cases: int = 3,
+        model_ids: list[str] | None = None,
+        dataset_id: str | None = None,
+    ) -> dict:
+        prompt = await PromptService(db).create_prompt(name="p", content="Q {{q}}")
+        if dataset_id is None:
+            datasets = DatasetService(db)
+            dataset_id = (await datasets.create_dataset(name="d"))["id"]
+            for i in range(n_cases):
+                await datasets.add_case(dataset_id, raw_input={"q": str(i)})
+        return await test_service.create_test_run(
+            [prompt["id"]], dataset_id, model_ids or ["m1"]
+        )
+
+    return make
+
+
+@pytest.fixture
+def save_result(test_service):
+    """셀 결과 1건 저장"""
+
+    async def save(
+        run: dict,
+        test_case_id: str,
+        passed: bool = True,
+        latency_ms: float = 100.0,
+        model_id: str | None = None,
+        error: str | None = None,
+        cached: bool = False,
+    ) -> dict:
+        return await test_service.save_test_result(
+            test_run_id=run["id"],
+            prompt_id=run["prompt_ids"][0],
+            prompt_version="1.0.0",
+            model_id=model_id or run["model_ids"][0],
+            test_case_id=test_case_id,
+            input_mapped={},
+            input_rendered="",
+            output="out",
+            latency_ms=latency_ms,
+            passed=passed,
+            error=error,
+            cached=cached,
+        )
+
+    return save
+
+
+@pytest.fixture
+def case_ids(db):
+    """테스트 실행 데이터셋의 케이스 ID (ID 순)"""
+
+    async def get(run: dict) -> list[str]:
+        rows = await db.fetchall(
+            "SELECT id FROM test_cases WHERE dataset_id = ? ORDER BY id",
+            (run["dataset_id"],),
+        )
+        return [row["id"] for row in rows]
+
+    return get
@@ -0,0 +1,84 @@
+"""AssertionEvaluator: assertion 타입별 평가와 llm-rubric 채점"""
+
+import pytest
+
+from shared.core.assertions import AssertionEvaluator
+
+
+@pytest.mark.parametrize(
+    ("assertion", "output", "passed"),
+    [
+        ({"type": "contains", "value": "서울"}, "수도는 서울입니다", True),
+        ({"type": "contains", "value": "부산"}, "수도는 서울입니다", False),
+        ({"type": "not-contains", "value": "죄송"}, "답변입니다", True),
+        ({"type": "not-contains", "value": "죄송"}, "죄송합니다", False),
+        ({"type": "equals", "value": "42"}, "42", True),
+        ({"type": "equals", "value": "42"}, "42 ", False),
+        ({"type": "starts-with", "value": "답:"}, "답: 42", True),
+        ({"type": "starts-with", "value": "답:"}, "42", False),
+        ({"type": "regex", "value": r"\d{3}-\d{4}"}, "전화 555-1234", True),
+        ({"type": "regex", "value": r"^\d+$"}, "12a", False),
+        ({"type": "is-json"}, '{"a": [1, 2]}', True),
+        ({"type": "is-json"}, "{'a': 1}", False),
+    ],
+)
+async def test_builtin_assertions(assertion, output, passed):
+    result = await AssertionEvaluator().evaluate_one(assertion, output)
+
+    assert result["type"] == assertion["type"]
+    assert result["passed"] is passed
+    assert result["score"] == (1.0 if passed else 0.0)
+    if not passed:
+        assert result["reason"].startswith("Expected output")
+
+
+async def test_invalid_regex_and_unknown_type_fail_without_raising():
+    evaluator = AssertionEvaluator()
+
+    invalid = await evaluator.evaluate_one({"type": "regex", "value": "("}, "x")
+    unknown = await evaluator.evaluate_one({"type": "javascript", "value": "true"}, "x")
+
+    assert not invalid["passed"] and invalid["reason"].startswith("Invalid regex")
+    assert not unknown["passed"] and "Unsupported" in unknown["reason"]
+
+
+async def test_evaluate_passes_only_when_all_assertions_pass():
+    passed, results = await AssertionEvaluator().evaluate(
+        [{"type": "contains", "value": "a"}, {"type": "contains", "value": "z"}],
+        "abc",
+    )
+
+    assert passed is False
+    assert [r["passed"] for r in results] == [True, False]
+    assert await AssertionEvaluator().evaluate([], "abc") == (True, [])
+
+
+async def test_llm_rubric_uses_grader_verdict_and_threshold():
+    prompts: list[str] = []
+
+    async def grader(prompt: str) -> str:
+        prompts.append(prompt)
+        return '판정: {"pass": true, "score": 0.6, "reason": "대체로 정확"}'
+
+    evaluator = AssertionEvaluator(grader=grader)
+    verdict = await evaluator.evaluate_one({"type": "llm-rubric", "value": "정확할 것"}, "답")
+    strict = await evaluator.evaluate_one(
+        {"type": "llm-rubric", "value": "정확할 것", "threshold": 0.8}, "답"
+    )
+
+    assert "정확할 것" in prompts[0]
+    assert verdict == {"type": "llm-rubric", "passed": True, "reason": "대체로 정확", "score": 0.6}
+    assert strict["passed"] is False  # score 0.6 < threshold 0.8
+
+
+async def test_llm_rubric_fails_without_grader_or_parseable_verdict():
+    async def rambling(prompt: str) -> str:
+        return "잘 모르겠습니다"
+
+    missing = await AssertionEvaluator().evaluate_one({"type": "llm-rubric", "value": "x"}, "y")
+    garbled = await AssertionEvaluator(grader=rambling).evaluate_one(
+        {"type": "llm-rubric", "value": "x"}, "y"
+    )
+
+    assert not missing["passed"] and missing["reason"] == "llm-rubric requires a grader"
+    assert not garbled["passed"] and garbled["reason"].startswith("Unparseable")
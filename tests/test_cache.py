@@ -0,0 +1,79 @@
+"""ResponseCache: 모아둔 쓰기, TTL 만료, max_entries 초과 시 LRU 삭제"""
+
+from datetime import datetime, timedelta
+
+from shared.adapters.base import LLMResponse
+from shared.adapters.cache import ResponseCache
+
+
+def _response(content: str) -> LLMResponse:
+    return LLMResponse(content=content, latency_ms=120.0, model="m")
+
+
+def _ago(seconds: int) -> str:
+    return (datetime.now() - timedelta(seconds=seconds)).isoformat()
+
+
+async def _keys(db) -> set[str]:
+    return {row["cache_key"] for row in await db.fetchall("SELECT cache_key FROM llm_cache")}
+
+
+async def test_pending_put_is_served_before_flush(db):
+    cache = ResponseCache(db)
+    await cache.put("k", _response("hi"))
+
+    hit = await cache.get("k")
+
+    assert (hit.content, hit.cached, hit.latency_ms) == ("hi", True, 0.0)
+    assert await _keys(db) == set()  # 아직 저장 전
+    await cache.flush()
+    row = await db.fetchone("SELECT hit_count FROM llm_cache WHERE cache_key = 'k'")
+    assert row["hit_count"] == 1
+
+
+async def test_expired_entry_is_a_miss_and_evicted(db):
+    cache = ResponseCache(db, ttl_seconds=60)
+    await cache.put("old", _response("old"))
+    await cache.put("new", _response("new"))
+    await cache.flush()
+    await db.execute(
+        "UPDATE llm_cache SET created_at = ? WHERE cache_key = 'old'", (_ago(120),)
+    )
+
+    assert await cache.get("old") is None
+    assert (await cache.get("new")).content == "new"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert await cache.evict() == 1
+    assert await _keys(db) == {"new"}
+
+
+async def test_evict_keeps_most_recently_accessed_entries(db):
+    cache = ResponseCache(db, ttl_seconds=None, max_entries=2)
+    for key in ("a", "b", "c"):
+        await cache.put(key, _response(key))
+    await cache.flush()
+    # a가 가장 오래 전에 쓰였지만 다시 조회되면 최근 항목이 됨
+    for key, seconds in (("a", 30), ("b", 20), ("c", 10)):
+        await db.execute(
+            "UPDATE llm_cache SET accessed_at = ? WHERE cache_key = ?", (_ago(seconds), key)
+        )
+    assert (await cache.get("a")).content == "a"
+    await cache.flush()
+
+    assert await cache.evict() == 1
+    assert await _keys(db) == {"a", "c"}
+
+
+async def test_flush_evicts_every_evict_every_puts(db, monkeypatch):
+    monkeypatch.setattr(ResponseCache, "EVICT_EVERY", 3)
+    cache = ResponseCache(db, max_entries=2)
+
+    for key in ("a", "b"):
+        await cache.put(key, _response(key))
+    await cache.flush()
+    await cache.put("c", _response("c"))
+    assert len(await _keys(db)) == 2  # c는 아직 메모리에만
+
+    await cache.flush()  # 누적 put 3번 → eviction
+    assert len(await _keys(db)) == 2
@@ -0,0 +1,128 @@
+"""CoalescingAdapter: 진행 중인 동일 요청 합치기"""
+
+import asyncio
+
+from shared.adapters.base import BaseLLMAdapter, LLMResponse
+from shared.adapters.cache import CachedAdapter, ResponseCache
+from shared.adapters.coalesce import CoalescingAdapter, InflightRequests
+from shared.core.native_runner import NativeRunner
+
+
+class SlowAdapter(BaseLLMAdapter):
+    """release가 set될 때까지 응답을 붙잡는 가짜 어댑터 (호출 수 기록)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    @property
+    def provider_name(self) -> str:
+        return "fake"
+
+    async def generate(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        self.calls += 1
+        await self.release.wait()
+        return LLMResponse(content=f"answer: {prompt}", model=model, latency_ms=10.0)
+
+    async def generate_stream(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        yield "answer"
+
+
+async def _generate_concurrently(adapter, upstream, count, **kwargs):
+    tasks = [
+        asyncio.create_task(adapter.generate("same prompt", model="m", **kwargs))
+        for _ in range(count)
+    ]
+    await asyncio.sleep(0)  # 모든 요청이 진행 중인 상태에서 응답
+    upstream.release.set()
+    return await asyncio.gather(*tasks)
+
+
+async def test_identical_inflight_calls_make_one_upstream_call():
+    upstream = SlowAdapter()
+    adapter = CoalescingAdapter(upstream, inflight=InflightRequests())
+
+    first, second = await _generate_concurrently(adapter, upstream, 2, temperature=0)
+
+    assert upstream.calls == 1
+    assert first.content == second.content == "answer: same prompt"
+    assert [first.coalesced, second.coalesced] == [False, True]
+
+
+async def test_sampled_requests_are_independent_by_default():
+    upstream = SlowAdapter()
+    adapter = CoalescingAdapter(upstream, inflight=InflightRequests())
+
+    await _generate_concurrently(adapter, upstream, 2, temperature=0.7)
+
+    assert upstream.calls == 2
+
+
+async def test_sampled_requests_coalesce_when_enabled():
+    upstream = SlowAdapter()
+    adapter = CoalescingAdapter(upstream, inflight=InflightRequests(), sampled=True)
+
+    await _generate_concurrently(adapter, upstream, 3, temperature=0.7)
+
+    assert upstream.calls == 1
+
+
+async def test_cancelled_leader_does_not_cancel_other_waiters():
+    upstream = SlowAdapter()
+    inflight = InflightRequests()
+    adapter = CoalescingAdapter(upstream, inflight=inflight)
+
+    leader = asyncio.create_task(adapter.generate("p", model="m", temperature=0))
+    follower = asyncio.create_task(adapter.generate("p", model="m", temperature=0))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    response = await follower
+    assert response.content == "answer: p"
+    assert upstream.calls == 1
+    assert len(inflight) == 0
+
+
+async def test_cached_and_uncached_runs_do_not_share_calls(db):
+    upstream = SlowAdapter()
+    inflight = InflightRequests()
+    cached = CoalescingAdapter(CachedAdapter(upstream, ResponseCache(db)), inflight=inflight)
+    live = CoalescingAdapter(upstream, inflight=inflight)
+
+    tasks = [
+        asyncio.create_task(adapter.generate("p", model="m", temperature=0))
+        for adapter in (cached, live)
+    ]
+    await asyncio.sleep(0.01)  # 캐시 조회까지 진행된 상태에서 응답
+    upstream.release.set()
+    responses = await asyncio.gather(*tasks)
+
+    # 캐시를 끈 실행은 캐시를 쓰는 실행의 호출에 합쳐지지 않음
+    assert upstream.calls == 2
+    assert not any(response.coalesced for response in responses)
+
+
+async def test_native_runner_cells_coalesce_at_temperature_zero():
+    upstream = SlowAdapter()
+    runner = NativeRunner(
+        adapter=CoalescingAdapter(upstream, inflight=InflightRequests()), temperature=0
+    )
+    # 두 프롬프트가 같은 문자열로 렌더링됨 → 셀 호출 하나로 합쳐짐
+    results = runner.iter_results(
+        prompts=[{"id": "a", "content": "Q {{q}}"}, {"id": "b", "content": "Q {{q}}"}],
+        model_ids=["m"],
+        tests=[{"vars": {"q": "1"}}],
+        timeout=5,
+    )
+    drain = asyncio.create_task(_collect(results))
+    await asyncio.sleep(0.01)
+    upstream.release.set()
+
+    assert len(await drain) == 2
+    assert upstream.calls == 1
+
+
+async def _collect(results) -> list[dict]:
+    return [result async for result in results]
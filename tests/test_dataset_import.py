@@ -0,0 +1,148 @@
+"""데이터셋 Import: 배치 커밋, 스테이징 롤백, 스트리밍 CSV 파싱과 업로드 디코딩"""
+
+import asyncio
+import csv
+import io
+import time
+
+import pytest
+from fastapi import UploadFile
+from test_harness_api.routers import datasets as datasets_router
+from test_harness_api.routers.datasets import _iter_upload_text
+from test_harness_api.services.dataset_service import (
+    DatasetService,
+    ImportAbortedError,
+    _iter_csv_rows,
+)
+
+
+@pytest.fixture
+async def dataset(db) -> dict:
+    return await DatasetService(db).create_dataset(name="d")
+
+
+async def _slow_csv(rows: int, fail: bool = False):
+    """업로드가 천천히 들어오는 CSV 청크 스트림"""
+    yield "question,expected_output\n"
+    for i in range(rows // 10):
+        await asyncio.sleep(0.01)
+        yield "".join(f"q{i}-{j},a\n" for j in range(10))
+    if fail:
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+
+async def test_upload_does_not_block_other_writes(db, dataset):
+    service = DatasetService(db)
+
+    async def write_while_uploading() -> float:
+        slowest = 0.0
+        for _ in range(10):
+            started = time.monotonic()
+            await db.execute(
+                "UPDATE test_datasets SET description = ? WHERE id = ?", ("x", dataset["id"])
+            )
+            await db.commit()
+            slowest = max(slowest, time.monotonic() - started)
+            await asyncio.sleep(0.01)
+        return slowest
+
+    result, slowest = await asyncio.gather(
+        service.import_csv_stream(dataset["id"], _slow_csv(300), batch_size=50),
+        write_while_uploading(),
+    )
+
+    assert result["imported"] == 300
+    assert (await service.get_dataset(dataset["id"]))["case_count"] == 300
+    # 업로드 전체(약 0.3초)를 기다리지 않음
+    assert slowest < 0.1
+
+
+async def test_aborted_upload_leaves_no_cases(db, dataset):
+    service = DatasetService(db)
+
+    with pytest.raises(ImportAbortedError) as exc_info:
+        await service.import_csv_stream(
+            dataset["id"], _slow_csv(100, fail=True), column_mapping={"q": "question"},
+            batch_size=20,
+        )
+
+    assert exc_info.value.result["imported"] == 0
+    assert (await db.fetchone("SELECT COUNT(*) AS cnt FROM test_cases"))["cnt"] == 0
+    stored = await service.get_dataset(dataset["id"])
+    assert stored["case_count"] == 0
+    assert stored["column_mapping"] is None
+
+
+async def test_cancelled_upload_leaves_no_cases(db, dataset):
+    service = DatasetService(db)
+    task = asyncio.create_task(
+        service.import_csv_stream(dataset["id"], _slow_csv(1000), batch_size=20)
+    )
+    await asyncio.sleep(0.1)  # 일부 배치가 커밋될 때까지
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert (await db.fetchone("SELECT COUNT(*) AS cnt FROM test_cases"))["cnt"] == 0
+
+
+async def _chunks(text: str, size: int):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+CSV_TEXT = (
+    'question,expected_output,_source\n'
+    'plain,a,x\n'
+    '"multi\nline\r\nfield","say ""hi""",y\n'
+    '"comma, inside","\n",z\n'
+    'hello\x85world end,b,w\n'
+    'last,"no newline at end",v'
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+@pytest.mark.parametrize("batch_lines", [1, 2, 1000])
+async def test_csv_rows_match_csv_module_across_chunk_boundaries(chunk_size, batch_lines):
+    rows = [
+        row async for row in _iter_csv_rows(_chunks(CSV_TEXT, chunk_size), batch_lines)
+    ]
+
+    assert rows == list(csv.DictReader(io.StringIO(CSV_TEXT)))
+    assert rows[1]["question"] == "multi\nline\r\nfield"
+    assert rows[3]["question"] == "hello\x85world end"
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="cases.csv")
+
+
+async def _decode(data: bytes) -> str:
+    return "".join([text async for text in _iter_upload_text(_upload(data))])
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """멀티바이트 문자가 청크 경계에 걸리도록 작은 청크로 읽음"""
+    monkeypatch.setattr(datasets_router, "UPLOAD_CHUNK_SIZE", 5)
+
+
+async def test_upload_text_decodes_utf8_split_across_chunks(small_chunks):
+    text = "question\n서울은 어디?\n"
+
+    assert await _decode(text.encode("utf-8")) == text
+
+
+async def test_upload_text_falls_back_to_cp949_after_ascii_prefix(small_chunks):
+    text = "question,expected_output\n수도는?,서울\n"
+
+    assert await _decode(text.encode("cp949")) == text
+
+
+async def test_upload_text_rejects_invalid_bytes_after_utf8_text(small_chunks):
+    # 이미 UTF-8 한글을 읽은 뒤 → cp949로 바꾸면 앞부분과 인코딩이 섞이므로 실패
+    data = "question\n서울\n".encode() + "부산\n".encode("cp949")
+
+    with pytest.raises(UnicodeDecodeError):
+        await _decode(data)
@@ -0,0 +1,191 @@
+"""EvaluationService: SQL 요약, 비교표, 실행 간 회귀 비교"""
+
+import pytest
+from test_harness_api.services.evaluation_service import EvaluationService
+from test_harness_api.services.run_aggregates import RunAggregates
+
+
+async def test_summary_matches_stored_results(db, make_run, save_result, case_ids):
+    run = await make_run(n_cases=4, model_ids=["m1", "m2"])
+    cases = await case_ids(run)
+    latencies = {}
+    for i, case_id in enumerate(cases):
+        for model_id in run["model_ids"]:
+            latency = 100.0 * (i + 1) + (50.0 if model_id == "m2" else 0.0)
+            latencies[(case_id, model_id)] = latency
+            await save_result(
+                run,
+                case_id,
+                passed=i % 2 == 0,
+                latency_ms=latency,
+                model_id=model_id,
+                error="boom" if i == 3 and model_id == "m2" else None,
+            )
+
+    summary = await EvaluationService(db).get_summary(run["id"])
+
+    assert summary["cached"] is False
+    assert summary["total_tests"] == 8
+    assert summary["passed_tests"] == 4
+    assert summary["error_tests"] == 1
+    assert summary["pass_rate"] == pytest.approx(0.5)
+    assert summary["avg_latency_ms"] == pytest.approx(sum(latencies.values()) / 8)
+    assert summary["min_latency_ms"] == 100.0
+    assert summary["max_latency_ms"] == 450.0
+    assert summary["by_model"]["m1"]["total_tests"] == 4
+    assert summary["by_model"]["m2"]["avg_latency_ms"] == pytest.approx(300.0)
+
+
+async def test_cached_responses_are_excluded_from_latency(db, make_run, save_result, case_ids):
+    run = await make_run(n_cases=4)
+    cases = await case_ids(run)
+    for case_id, latency in zip(cases[:2], (100.0, 300.0)):
+        await save_result(run, case_id, latency_ms=latency)
+    for case_id in cases[2:]:
+        await save_result(run, case_id, latency_ms=0.0, cached=True)
+
+    summary = await EvaluationService(db).get_summary(run["id"])
+    aggregates = RunAggregates(db, run["id"])
+    await aggregates.rebuild()
+    live = aggregates.snapshot()
+
+    # 셀 수에는 포함, latency는 실제 호출한 셀만
+    assert summary["total_tests"] == live["total_tests"] == 4
+    assert summary["avg_latency_ms"] == live["avg_latency_ms"] == pytest.approx(200.0)
+    assert summary["min_latency_ms"] == 100.0
+    assert summary["p50_latency_ms"] == 100.0
+    assert live["p50_latency_ms"] == pytest.approx(100.0, rel=0.02)
+
+
+async def test_summary_is_cached_until_invalidated(db, make_run, save_result, case_ids):
+    run = await make_run(n_cases=2)
+    cases = await case_ids(run)
+    service = EvaluationService(db)
+    await save_result(run, cases[0])
+
+    assert (await service.get_summary(run["id"]))["cached"] is False
+    assert (await service.get_summary(run["id"]))["cached"] is True
+
+    # 새 결과 저장 → 캐시 무효화 → 다시 계산
+    await save_result(run, cases[1], passed=False)
+    summary = await service.get_summary(run["id"])
+    assert summary["cached"] is False
+    assert summary["total_tests"] == 2
+
+
+async def test_summary_for_missing_run_is_none(db):
+    assert await EvaluationService(db).get_summary("run_missing") is None
+
+
+async def _page_through(service, run_id, limit, case_filter="all"):
+    """next_cursor를 따라가며 모든 페이지의 행 수집"""
+    rows, cursor = [], None
+    while True:
+        page = await service.compare(run_id, limit=limit, cursor=cursor, case_filter=case_filter)
+        assert len(page["rows"]) <= limit
+        rows += page["rows"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return rows
+
+
+async def test_compare_pages_cover_every_case_once(db, make_run, save_result, case_ids):
+    run = await make_run(n_cases=7, model_ids=["m1", "m2"])
+    cases = await case_ids(run)
+    for i, case_id in enumerate(cases):
+        await save_result(run, case_id, passed=True, model_id="m1")
+        await save_result(run, case_id, passed=i % 3 != 0, model_id="m2")
+    service = EvaluationService(db)
+
+    rows = await _page_through(service, run["id"], limit=3)
+
+    assert [row["test_case_id"] for row in rows] == cases
+    assert all(len(row["cells"]) == 2 for row in rows)
+
+    disagree = await _page_through(service, run["id"], limit=2, case_filter="disagree")
+    assert [row["test_case_id"] for row in disagree] == cases[::3]
+
+
+async def test_compare_rejects_invalid_cursor(db, make_run):
+    run = await make_run(n_cases=1)
+
+    with pytest.raises(ValueError):
+        await EvaluationService(db).compare(run["id"], cursor="not-a-cursor")
+
+
+async def test_diff_runs_classifies_changes(db, make_run, save_result, case_ids):
+    base = await make_run(n_cases=4)
+    head = await make_run(dataset_id=base["dataset_id"])
+    cases = await case_ids(base)
+    # (base passed, base latency) → (head passed, head latency)
+    changes = [
+        ((True, 100.0), (False, 100.0)),   # newly_failing
+        ((False, 100.0), (True, 100.0)),   # newly_passing
+        ((True, 100.0), (True, 400.0)),    # latency_regressed
+        ((True, 100.0), (True, 110.0)),    # unchanged (증가량이 기준 미만)
+    ]
+    for case_id, ((base_passed, base_ms), (head_passed, head_ms)) in zip(cases, changes):
+        await save_result(base, case_id, passed=base_passed, latency_ms=base_ms)
+        await save_result(head, case_id, passed=head_passed, latency_ms=head_ms)
+
+    diff = await EvaluationService(db).diff_runs(base["id"], head["id"])
+
+    assert diff["counts"] == {
+        "newly_failing": 1,
+        "newly_passing": 1,
+        "latency_regressed": 1,
+        "unchanged": 1,
+    }
+    assert [c["test_case_id"] for c in diff["newly_failing"]] == [cases[0]]
+    assert [c["test_case_id"] for c in diff["newly_passing"]] == [cases[1]]
+    assert diff["latency_regressed"][0]["head_latency_ms"] == 400.0
+
+
+async def test_diff_runs_rejects_different_datasets(db, make_run):
+    base = await make_run(n_cases=1)
+    head = await make_run(n_cases=1)
+
+    with pytest.raises(ValueError):
+        await EvaluationService(db).diff_runs(base["id"], head["id"])
+
+
+async def test_summary_computed_during_a_flush_is_not_cached(
+    db, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=2)
+    cases = await case_ids(run)
+    await save_result(run, cases[0])
+    service = EvaluationService(db)
+    compute = service.compute_summary
+
+    async def compute_then_flush(test_run_id):
+        # 집계를 마친 뒤, 캐시에 저장하기 전에 새 결과 flush (→ invalidate)
+        summary = await compute(test_run_id)
+        await save_result(run, cases[1])
+        return summary
+
+    service.compute_summary = compute_then_flush
+    assert (await service.get_summary(run["id"]))["total_tests"] == 1
+    service.compute_summary = compute
+
+    summary = await service.get_summary(run["id"])
+    assert summary["cached"] is False
+    assert summary["total_tests"] == 2
+
+
+async def test_cached_summary_is_recomputed_when_result_count_changes(
+    db, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=2)
+    cases = await case_ids(run)
+    await save_result(run, cases[0])
+    service = EvaluationService(db)
+    await service.get_summary(run["id"])
+
+    # invalidate 없이 결과 수만 바뀐 경우 (다른 프로세스의 flush가 캐시 저장과 엇갈림)
+    await db.execute(
+        "UPDATE test_runs SET completed_cases = completed_cases + 1 WHERE id = ?", (run["id"],)
+    )
+    await db.commit()
+
+    assert (await service.get_summary(run["id"]))["cached"] is False
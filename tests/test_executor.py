@@ -0,0 +1,185 @@
+"""TestExecutor: 남은 셀만 다시 실행하는 resume, 실행 취소"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from test_harness_api.routers import tests as tests_router
+from test_harness_api.services import test_executor
+from test_harness_api.services.job_queue import JobQueue
+
+from shared.adapters.base import BaseLLMAdapter, LLMResponse
+
+
+class RecordingAdapter(BaseLLMAdapter):
+    """받은 프롬프트를 기록하고 바로 응답하는 가짜 어댑터"""
+
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    @property
+    def provider_name(self) -> str:
+        return "fake"
+
+    async def generate(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        self.prompts.append(prompt)
+        return LLMResponse(content=f"answer: {prompt}", model=model, latency_ms=10.0)
+
+    async def generate_stream(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        yield "answer"
+
+
+@pytest.fixture
+def adapter(monkeypatch) -> RecordingAdapter:
+    fake = RecordingAdapter()
+    monkeypatch.setattr(test_executor, "create_together_adapter", lambda **kwargs: fake)
+    return fake
+
+
+async def test_resume_runs_only_missing_and_errored_cells(
+    db, test_service, adapter, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=4)
+    cases = await case_ids(run)
+    await save_result(run, cases[0], passed=True)
+    await save_result(run, cases[1], passed=False)
+    await save_result(run, cases[2], passed=False, error="timeout")
+
+    executor = test_executor.TestExecutor(db)
+    summary = await executor.execute(run["id"], engine="native", coalesce=False)
+
+    # 에러로 끝난 셀과 저장되지 않은 셀만 다시 호출
+    rerun = await db.fetchall(
+        "SELECT raw_input FROM test_cases WHERE id IN (?, ?)", (cases[2], cases[3])
+    )
+    assert sorted(adapter.prompts) == sorted(
+        f"Q {json.loads(row['raw_input'])['q']}" for row in rerun
+    )
+    assert summary["resumed_cells"] == 2
+    assert summary["total_results"] == 4
+    rows = await db.fetchall(
+        "SELECT test_case_id, error FROM test_results WHERE test_run_id = ?", (run["id"],)
+    )
+    assert sorted(row["test_case_id"] for row in rows) == sorted(cases)
+    assert all(row["error"] is None for row in rows)
+    finished = await test_service.get_test_run(run["id"])
+    assert finished["status"] == "completed"
+    assert finished["completed_cases"] == 4
+
+
+async def test_completed_cells_lookup_does_not_touch_progress(
+    test_service, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=2)
+    for case_id in await case_ids(run):
+        await save_result(run, case_id, error="boom")
+    before = await test_service.get_test_run(run["id"])
+
+    assert await test_service.get_completed_cells(run["id"]) == {}
+    assert await test_service.get_test_run(run["id"]) == before
+
+
+class BlockingAdapter(RecordingAdapter):
+    """fast에 있는 프롬프트만 바로 응답하고 나머지는 취소될 때까지 대기"""
+
+    def __init__(self, fast: set[str]):
+        super().__init__()
+        self.fast = fast
+        self.blocked = 0
+        self.cancelled = 0
+
+    async def generate(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        if prompt in self.fast:
+            return await super().generate(prompt, model)
+        self.blocked += 1
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+async def _start_blocked_run(monkeypatch, make_run, db, n_cases=5):
+    """결과 2건 이후 요청이 멈춘 native 실행 시작 → (run, adapter, 실행 task)"""
+    run = await make_run(n_cases=n_cases)
+    adapter = BlockingAdapter(fast={"Q 0", "Q 1"})
+    monkeypatch.setattr(test_executor, "create_together_adapter", lambda **kwargs: adapter)
+    # 케이스 순서와 무관하게 Q 0, Q 1이 먼저 실행되도록 동시성을 케이스 수만큼
+    execution = asyncio.create_task(
+        test_executor.TestExecutor(db).execute(
+            run["id"], engine="native", coalesce=False, concurrency=n_cases
+        )
+    )
+    for _ in range(200):
+        if adapter.blocked == n_cases - 2:
+            break
+        await asyncio.sleep(0.01)
+    return run, adapter, execution
+
+
+async def test_cancel_stops_inflight_calls_and_keeps_saved_results(
+    db, test_service, monkeypatch, make_run
+):
+    run, adapter, execution = await _start_blocked_run(monkeypatch, make_run, db)
+
+    assert await test_executor.TestExecutor.cancel(run["id"], wait=5) is True
+    summary = await asyncio.wait_for(execution, timeout=5)
+
+    assert summary["status"] == "cancelled"
+    assert summary["total_results"] == 2
+    assert adapter.cancelled == 3  # 멈춰 있던 요청은 모두 취소
+    cancelled = await test_service.get_test_run(run["id"])
+    assert cancelled["status"] == "cancelled"
+    assert cancelled["completed_cases"] == 2
+    assert run["id"] not in test_executor.TestExecutor.active_runs
+
+
+async def test_cancel_of_run_not_executing_here_returns_false(make_run):
+    run = await make_run()
+
+    assert await test_executor.TestExecutor.cancel(run["id"], wait=0.1) is False
+
+
+async def test_cancel_endpoint_cancels_local_run(db, test_service, monkeypatch, make_run):
+    run, _, execution = await _start_blocked_run(monkeypatch, make_run, db)
+
+    response = await tests_router.cancel_test_run(run["id"], service=test_service)
+    await asyncio.wait_for(execution, timeout=5)
+
+    assert response["status"] == "cancelled"
+    assert response["completed_cases"] == 2
+
+
+async def test_cancel_endpoint_defers_to_the_owning_worker(test_service, make_run):
+    run = await make_run()
+    queue = JobQueue(test_service.db)
+    job = await queue.enqueue(run["id"])
+    await queue.claim("worker-1")
+    await test_service.update_test_run_status(run["id"], "running")
+
+    response = await tests_router.cancel_test_run(run["id"], service=test_service)
+
+    # 다른 프로세스가 lease를 갖고 실행 중 → 202, 소유자가 heartbeat에서 확인
+    assert response.status_code == 202
+    body = json.loads(response.body)
+    assert body["cancel_requested"] is True and body["job_id"] == job["id"]
+    assert (await test_service.get_test_run(run["id"]))["status"] == "running"
+    assert (await queue.heartbeat(job["id"], "worker-1"))["cancel_requested"] is True
+
+
+async def test_cancel_endpoint_cancels_queued_and_rejects_finished_runs(test_service, make_run):
+    queued = await make_run()
+    await JobQueue(test_service.db).enqueue(queued["id"])
+    finished = await make_run()
+    await test_service.update_test_run_status(finished["id"], "completed")
+
+    response = await tests_router.cancel_test_run(queued["id"], service=test_service)
+    with pytest.raises(HTTPException) as rejected:
+        await tests_router.cancel_test_run(finished["id"], service=test_service)
+    with pytest.raises(HTTPException) as missing:
+        await tests_router.cancel_test_run("run_missing", service=test_service)
+
+    assert response["status"] == "cancelled"
+    assert rejected.value.status_code == 400
+    assert missing.value.status_code == 404
@@ -0,0 +1,47 @@
+"""HTTPClientPool: 엔드포인트별 클라이언트 공유와 설정"""
+
+from shared.adapters.http_pool import HTTPClientPool, HTTPPoolConfig
+
+
+async def test_endpoints_on_the_same_host_share_one_client():
+    pool = HTTPClientPool(HTTPPoolConfig(http2=False))
+    try:
+        chat = pool.get("https://API.together.xyz/v1/chat/completions")
+        models = pool.get("https://api.together.xyz/v1/models")
+        other = pool.get("https://api.openai.com/v1/chat/completions")
+
+        assert chat is models
+        assert other is not chat
+    finally:
+        await pool.aclose()
+
+
+async def test_closed_pool_hands_out_new_clients():
+    pool = HTTPClientPool(HTTPPoolConfig(http2=False))
+    first = pool.get("https://api.together.xyz/v1")
+    await pool.aclose()
+
+    second = pool.get("https://api.together.xyz/v1")
+
+    assert first.is_closed
+    assert second is not first and not second.is_closed
+    await pool.aclose()
+
+
+def test_request_timeout_keeps_connect_timeout_from_config():
+    pool = HTTPClientPool(HTTPPoolConfig(connect_timeout=5.0, http2=False))
+
+    assert pool.timeout(120).connect == 5.0
+    assert pool.timeout(120).read == 120
+    assert pool.timeout(2).connect == 2  # 전체 타임아웃보다 길게 잡지 않음
+
+
+def test_config_is_read_from_http_pool_section(tmp_path):
+    path = tmp_path / "models.yaml"
+    path.write_text("http_pool:\n  max_connections: 8\n  unknown: 1\n", encoding="utf-8")
+
+    config = HTTPPoolConfig.from_yaml(path)
+
+    assert config.max_connections == 8
+    assert config.max_keepalive_connections == HTTPPoolConfig().max_keepalive_connections
+    assert HTTPPoolConfig.from_yaml(tmp_path / "missing.yaml") == HTTPPoolConfig()
@@ -0,0 +1,104 @@
+"""JobQueue: claim 순서, lease 만료 후 재claim, 취소"""
+
+import pytest
+from test_harness_api.services.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(db) -> JobQueue:
+    return JobQueue(db)
+
+
+async def test_enqueue_rejects_second_active_job(queue, make_run):
+    run = await make_run()
+    await queue.enqueue(run["id"])
+
+    with pytest.raises(ValueError):
+        await queue.enqueue(run["id"])
+    with pytest.raises(ValueError):
+        await queue.start(run["id"], "api")
+
+
+async def test_claim_prefers_priority_then_age(queue, make_run):
+    runs = [await make_run() for _ in range(3)]
+    await queue.enqueue(runs[0]["id"])
+    await queue.enqueue(runs[1]["id"])
+    await queue.enqueue(runs[2]["id"], options={"priority": 5})
+
+    claimed = [(await queue.claim("w"))["test_run_id"] for _ in range(3)]
+
+    assert claimed == [runs[2]["id"], runs[0]["id"], runs[1]["id"]]
+    assert await queue.claim("w") is None
+
+
+async def test_expired_lease_is_reclaimed_by_another_worker(queue, make_run):
+    run = await make_run()
+    job = await queue.enqueue(run["id"])
+    # 음수 lease → claim 직후 만료 (워커가 죽은 상황)
+    first = await queue.claim("w1", lease_seconds=-1)
+    assert not JobQueue.is_live(first)
+
+    second = await queue.claim("w2")
+
+    assert second["id"] == job["id"]
+    assert second["worker_id"] == "w2"
+    assert second["attempts"] == 2
+    assert JobQueue.is_live(second)
+    # 이전 워커는 lease를 잃었으므로 연장도 종료도 못 함
+    assert await queue.heartbeat(job["id"], "w1") is None
+    assert await queue.finish(job["id"], "w1", "completed") is False
+    assert await queue.finish(job["id"], "w2", "completed") is True
+
+
+async def test_expired_job_fails_after_max_attempts(queue, test_service, make_run):
+    run = await make_run()
+    job = await queue.enqueue(run["id"], max_attempts=1)
+    await queue.claim("w1", lease_seconds=-1)
+
+    assert await queue.claim("w2") is None
+    assert (await queue.get_job(job["id"]))["status"] == "failed"
+    assert (await test_service.get_test_run(run["id"]))["status"] == "failed"
+
+
+async def test_cancel_queued_job_is_immediate(queue, make_run):
+    run = await make_run()
+    await queue.enqueue(run["id"])
+
+    job = await queue.request_cancel(run["id"])
+
+    assert job["status"] == "cancelled"
+    assert await queue.get_active(run["id"]) is None
+    assert await queue.request_cancel(run["id"]) is None
+
+
+async def test_cancel_live_job_is_requested_until_lease_expires(
+    queue, test_service, make_run
+):
+    run = await make_run()
+    job = await queue.enqueue(run["id"])
+    await queue.claim("w1")
+
+    requested = await queue.request_cancel(run["id"])
+    assert requested["status"] == "running"
+    assert requested["cancel_requested"] is True
+    # 소유 워커는 heartbeat에서 취소 요청을 확인
+    assert (await queue.heartbeat(job["id"], "w1"))["cancel_requested"] is True
+
+    # 워커가 취소를 처리하지 못하고 죽으면 lease 만료 후 cancelled로 정리
+    await queue.heartbeat(job["id"], "w1", lease_seconds=-1)
+    assert await queue.reclaim_expired() == 1
+    assert (await queue.get_job(job["id"]))["status"] == "cancelled"
+    assert (await test_service.get_test_run(run["id"]))["status"] == "cancelled"
+
+
+async def test_start_replaces_expired_running_job(queue, make_run):
+    run = await make_run()
+    stale = await queue.start(run["id"], "api", lease_seconds=-1)
+
+    job = await queue.start(run["id"], "api")
+
+    assert job["id"] != stale["id"]
+    assert JobQueue.is_live(job)
+    assert (await queue.get_job(stale["id"]))["status"] == "failed"
+    with pytest.raises(ValueError):
+        await queue.start(run["id"], "api")
@@ -0,0 +1,84 @@
+"""Keyset 페이지네이션: 결과 목록 이어서 조회"""
+
+import pytest
+from test_harness_api.routers import tests as tests_router
+from test_harness_api.services.pagination import decode_cursor, encode_cursor
+
+
+async def test_results_resume_without_gaps_or_duplicates(
+    db, test_service, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=10)
+    cases = await case_ids(run)
+    for case_id in cases[:7]:
+        await save_result(run, case_id)
+    # 같은 created_at → id로 순서가 정해져야 페이지 경계에서 빠지거나 겹치지 않음
+    await db.execute(
+        "UPDATE test_results SET created_at = '2026-01-01T00:00:00' WHERE test_run_id = ?",
+        (run["id"],),
+    )
+    await db.commit()
+
+    seen, cursor = [], None
+    page = await test_service.get_test_results(run["id"], limit=3)
+    while True:
+        seen += [result["id"] for result in page["results"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        if len(seen) == 3:
+            # 페이지를 넘기는 중에 새 결과 저장 → 이후 페이지에 한 번만 나타나야 함
+            for case_id in cases[7:]:
+                await save_result(run, case_id)
+        page = await test_service.get_test_results(run["id"], limit=3, cursor=cursor)
+
+    stored = await db.fetchall(
+        "SELECT id FROM test_results WHERE test_run_id = ? ORDER BY created_at, id",
+        (run["id"],),
+    )
+    assert seen == [row["id"] for row in stored]
+    assert len(seen) == len(set(seen)) == 10
+
+
+async def test_last_page_has_no_next_cursor(test_service, make_run, save_result, case_ids):
+    run = await make_run(n_cases=3)
+    for case_id in await case_ids(run):
+        await save_result(run, case_id)
+
+    page = await test_service.get_test_results(run["id"], limit=3)
+
+    assert len(page["results"]) == 3
+    assert page["next_cursor"] is None
+
+
+def test_cursor_round_trip_and_validation():
+    cursor = encode_cursor({"created_at": "2026-01-01T00:00:00", "id": "res_1"})
+
+    assert decode_cursor(cursor, ("created_at", "id"))["id"] == "res_1"
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, ("case",))
+    with pytest.raises(ValueError):
+        decode_cursor("%%%", ("id",))
+
+
+async def test_total_is_returned_on_first_page_only_by_default(
+    test_service, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=3)
+    for case_id in await case_ids(run):
+        await save_result(run, case_id)
+
+    first = await tests_router.get_test_results(run["id"], limit=2, service=test_service)
+    second = await tests_router.get_test_results(
+        run["id"], limit=2, cursor=first["next_cursor"], service=test_service
+    )
+    counted = await tests_router.get_test_results(
+        run["id"], limit=2, cursor=first["next_cursor"], include_total=True,
+        service=test_service,
+    )
+    runs = await tests_router.list_test_runs(limit=1, service=test_service)
+
+    assert first["total"] == 3
+    assert second["total"] is None
+    assert counted["total"] == 3
+    assert runs["total"] == 1
@@ -0,0 +1,117 @@
+"""iter_concurrent: producer/worker 실패는 timeout을 기다리지 않고 바로 전달"""
+
+import asyncio
+
+import pytest
+
+from shared.adapters.base import BaseLLMAdapter, LLMResponse
+from shared.core.native_runner import NativeRunner
+from shared.core.pipeline import iter_concurrent
+
+
+async def _numbers(count: int, fail_at: int | None = None):
+    for i in range(count):
+        if i == fail_at:
+            raise RuntimeError("producer failed")
+        yield i
+
+
+async def _double(value: int) -> int:
+    await asyncio.sleep(0)
+    return value * 2
+
+
+async def _drain(results) -> None:
+    async for _ in results:
+        pass
+
+
+async def test_yields_every_result():
+    results = [r async for r in iter_concurrent(_numbers(20), _double, workers=4, timeout=5)]
+
+    assert sorted(results) == [i * 2 for i in range(20)]
+
+
+async def test_producer_error_is_raised_immediately():
+    results = iter_concurrent(_numbers(20, fail_at=5), _double, workers=2, timeout=60)
+
+    # 전체 timeout(60초)까지 기다리면 wait_for가 먼저 TimeoutError
+    with pytest.raises(RuntimeError, match="producer failed"):
+        await asyncio.wait_for(_drain(results), timeout=1)
+
+
+async def test_worker_error_is_raised_immediately():
+    async def handle(value: int) -> int:
+        if value == 3:
+            raise KeyError("worker failed")
+        return await _double(value)
+
+    results = iter_concurrent(_numbers(20), handle, workers=2, timeout=60)
+
+    with pytest.raises(KeyError, match="worker failed"):
+        await asyncio.wait_for(_drain(results), timeout=1)
+
+
+async def test_timeout():
+    async def slow(value: int) -> int:
+        await asyncio.sleep(10)
+        return value
+
+    results = iter_concurrent(_numbers(3), slow, workers=2, timeout=0.05, name="native run")
+
+    with pytest.raises(asyncio.TimeoutError, match="native run timed out"):
+        await _drain(results)
+
+
+async def test_tasks_are_cleaned_up_when_consumer_stops_early():
+    started = asyncio.Event()
+    cancelled = []
+
+    async def handle(value: int) -> int:
+        if value > 0:
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(value)
+                raise
+        return value
+
+    results = iter_concurrent(_numbers(5), handle, workers=2, timeout=5)
+    assert await anext(results) == 0
+    await started.wait()
+    await results.aclose()
+
+    assert cancelled
+
+
+class EchoAdapter(BaseLLMAdapter):
+    @property
+    def provider_name(self) -> str:
+        return "fake"
+
+    async def generate(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        return LLMResponse(content=prompt, model=model, latency_ms=1.0)
+
+    async def generate_stream(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        yield prompt
+
+
+async def _cases(count: int, fail_at: int):
+    for i in range(count):
+        if i == fail_at:
+            raise RuntimeError("dataset read failed")
+        yield {"vars": {"q": str(i)}}
+
+
+async def test_native_runner_surfaces_test_iterable_error():
+    runner = NativeRunner(adapter=EchoAdapter(), concurrency=2)
+    results = runner.iter_results(
+        prompts=[{"id": "p", "content": "Q {{q}}"}],
+        model_ids=["m"],
+        tests=_cases(10, fail_at=4),
+        timeout=60,
+    )
+
+    with pytest.raises(RuntimeError, match="dataset read failed"):
+        await asyncio.wait_for(_drain(results), timeout=1)
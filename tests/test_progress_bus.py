@@ -0,0 +1,105 @@
+"""ProgressBus: 전달 빈도 제한, 종료 메시지, 느린 구독자"""
+
+import asyncio
+
+from test_harness_api.routers.websocket import ConnectionManager
+from test_harness_api.services.progress_bus import (
+    ProgressBus,
+    ProgressBusConfig,
+    progress_message,
+)
+
+
+def _drain(queue: asyncio.Queue) -> list[dict]:
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+async def test_updates_within_interval_are_coalesced_to_the_latest():
+    bus = ProgressBus(ProgressBusConfig(max_rate=20.0))  # 50ms 간격
+    queue = bus.subscribe("run_1")
+
+    for current in range(1, 11):
+        bus.publish("run_1", progress_message("run_1", current, 10, "running"))
+
+    # 첫 메시지는 바로, 나머지는 간격이 지난 뒤 마지막 값 하나만
+    assert [m["current"] for m in _drain(queue)] == [1]
+    await asyncio.sleep(0.1)
+    assert [m["current"] for m in _drain(queue)] == [10]
+
+
+async def test_final_status_is_delivered_immediately():
+    bus = ProgressBus(ProgressBusConfig(max_rate=1.0))
+    queue = bus.subscribe("run_1")
+
+    bus.publish("run_1", progress_message("run_1", 1, 10, "running"))
+    bus.publish("run_1", progress_message("run_1", 5, 10, "running"))
+    bus.publish("run_1", progress_message("run_1", 10, 10, "completed"))
+
+    messages = _drain(queue)
+    assert [m["status"] for m in messages] == ["running", "completed"]
+    assert messages[-1]["progress"] == 100
+
+
+async def test_slow_subscriber_keeps_only_newest_messages():
+    bus = ProgressBus(ProgressBusConfig(max_rate=0, queue_size=2))  # 빈도 제한 없음
+    queue = bus.subscribe("run_1")
+
+    for current in range(1, 6):
+        bus.publish("run_1", progress_message("run_1", current, 5, "running"))
+
+    assert [m["current"] for m in _drain(queue)] == [4, 5]
+
+
+async def test_unsubscribe_drops_run_channel():
+    bus = ProgressBus()
+    queue = bus.subscribe("run_1")
+    bus.unsubscribe("run_1", queue)
+
+    bus.publish("run_1", progress_message("run_1", 1, 1, "completed"))
+
+    assert queue.empty()
+    assert "run_1" not in bus._channels
+
+
+class FakeWebSocket:
+    """보낸 메시지를 기록하는 가짜 WebSocket"""
+
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message: dict):
+        self.sent.append(message)
+
+
+async def test_websocket_polls_progress_of_runs_in_other_processes(
+    test_service, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=2)
+    bus = ProgressBus(ProgressBusConfig(poll_interval=0.02))
+    manager = ConnectionManager(bus)
+    websocket = FakeWebSocket()
+
+    async def poll():
+        test_run = await test_service.get_test_run(run["id"])
+        return progress_message(
+            run["id"], test_run["completed_cases"], test_run["total_cases"], test_run["status"]
+        )
+
+    await manager.connect(websocket, run["id"], await poll(), poll=poll)
+    # 워커가 실행 → 이 프로세스의 버스에는 알림 없이 DB만 바뀜
+    await test_service.update_test_run_status(run["id"], "running")
+    for case_id in await case_ids(run):
+        await save_result(run, case_id)
+    await asyncio.sleep(0.1)
+    manager.disconnect(websocket, run["id"])
+
+    sent = [(m["current"], m["status"]) for m in websocket.sent]
+    assert sent[0] == (0, "pending")
+    assert sent[-1] == (2, "running")
+    assert len(sent) == len(set(sent))  # 바뀌지 않은 진행률은 다시 보내지 않음
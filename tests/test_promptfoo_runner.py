@@ -0,0 +1,213 @@
+"""PromptfooRunner: shard 병렬 실행, 결과 스트리밍, 진행률 (promptfoo CLI 대신 가짜 스크립트)"""
+
+import asyncio
+import sys
+
+import pytest
+
+from shared.core.promptfoo_runner import PromptfooRunner
+
+# promptfoo eval -c CONFIG -o OUTPUT.jsonl 흉내: 셀마다 JSONL에 한 줄 추가
+# FAKE_PROMPTFOO_GATE: 마지막 셀은 이 파일이 생길 때까지 기다렸다가 씀
+# FAKE_PROMPTFOO_FAIL_AFTER: 첫 실행은 이 수만큼 셀을 쓰고 exit 1
+FAKE_PROMPTFOO = """
+import json, os, sys, time
+import yaml
+
+args = sys.argv[1:]
+config = yaml.safe_load(open(args[args.index("-c") + 1], encoding="utf-8"))
+output = args[args.index("-o") + 1]
+cells = [
+    (test, prompt, provider)
+    for test in config["tests"]
+    for prompt in config["prompts"]
+    for provider in config["providers"]
+]
+
+attempts = output + ".attempts"
+attempt = int(open(attempts).read()) + 1 if os.path.exists(attempts) else 1
+open(attempts, "w").write(str(attempt))
+fail_after = int(os.environ.get("FAKE_PROMPTFOO_FAIL_AFTER", "-1"))
+gate = os.environ.get("FAKE_PROMPTFOO_GATE")
+
+for i, (test, prompt, provider) in enumerate(cells):
+    if attempt == 1 and i == fail_after:
+        print("Error: provider call failed", file=sys.stderr)
+        sys.exit(1)
+    if gate and i == len(cells) - 1:
+        while not os.path.exists(gate):
+            time.sleep(0.01)
+    row = {
+        "prompt": {"label": prompt["label"], "raw": prompt["raw"]},
+        "provider": {"id": provider["id"]},
+        "vars": test["vars"],
+        "response": {"output": "ok", "latencyMs": 5},
+        "success": True,
+    }
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(row, ensure_ascii=False) + "\\n")
+    # 진행률 표시줄 (cli-progress 형식, vars에 분수가 있어도 완료/전체가 먼저)
+    percent = (i + 1) * 100 // len(cells)
+    print(
+        f"\\rEvaluating [{'#' * (percent // 10):<10}] {percent}% | {i + 1}/{len(cells)} | "
+        f"{provider['id']} {prompt['raw']!r} ratio=1/2",
+        flush=True,
+    )
+
+print("Evaluation complete. Pass Rate: 99/100 (example output)")
+"""
+
+PROMPTS = [{"id": "p", "content": "Q {{q}}"}]
+
+
+@pytest.fixture
+def runner(tmp_path) -> PromptfooRunner:
+    script = tmp_path / "fake_promptfoo.py"
+    script.write_text(FAKE_PROMPTFOO, encoding="utf-8")
+    runner = PromptfooRunner(project_root=tmp_path)
+    runner.promptfoo_cmd = [sys.executable, str(script)]
+    runner.OUTPUT_POLL_INTERVAL = 0.01
+    return runner
+
+
+async def _cases(count: int, fail_at: int | None = None):
+    for i in range(count):
+        if i == fail_at:
+            raise RuntimeError("dataset read failed")
+        yield {"vars": {"q": str(i)}}
+
+
+async def test_results_are_yielded_while_promptfoo_runs(runner, tmp_path, monkeypatch):
+    gate = tmp_path / "gate"
+    monkeypatch.setenv("FAKE_PROMPTFOO_GATE", str(gate))
+    results = runner.iter_results(PROMPTS, ["m"], _cases(3), timeout=30)
+
+    # 마지막 셀은 gate가 열릴 때까지 쓰이지 않음 → 종료 전에 앞 셀이 먼저 나와야 함
+    first = await asyncio.wait_for(anext(results), timeout=10)
+    assert first["vars"] == {"q": "0"}
+    assert first["output"] == "ok"
+
+    gate.touch()
+    rest = [result async for result in results]
+    assert [r["vars"]["q"] for r in rest] == ["1", "2"]
+
+
+async def test_retried_shard_yields_each_cell_once(runner, monkeypatch):
+    monkeypatch.setenv("FAKE_PROMPTFOO_FAIL_AFTER", "2")
+
+    results = [
+        result
+        async for result in runner.iter_results(
+            PROMPTS, ["m1", "m2"], _cases(3), timeout=30, workers=2, shard_size=2
+        )
+    ]
+
+    keys = [(r["model_id"], r["vars"]["q"]) for r in results]
+    assert len(keys) == len(set(keys)) == 6
+    assert all(r["error"] is None for r in results)
+
+
+async def test_failed_shard_reports_only_missing_cells(runner, monkeypatch):
+    monkeypatch.setenv("FAKE_PROMPTFOO_FAIL_AFTER", "1")
+
+    results = [
+        result
+        async for result in runner.iter_results(
+            PROMPTS, ["m"], _cases(3), timeout=30, shard_size=3, shard_retries=0
+        )
+    ]
+
+    assert [(r["vars"]["q"], r["error"] is None) for r in results] == [
+        ("0", True), ("1", False), ("2", False),
+    ]
+    assert "shard 0 failed" in results[1]["error"]
+
+
+class FakeShardRunner(PromptfooRunner):
+    """shard를 실제로 실행하지 않고 케이스마다 결과 하나를 돌려줌"""
+
+    def __init__(self, tmp_path):
+        super().__init__(project_root=tmp_path)
+        self.shards: list[int] = []
+
+    async def _run_shard(self, index, config, shard, timeout, retries, use_cache, on_progress=None):
+        self.shards.append(index)
+        for test in shard:
+            await asyncio.sleep(0)
+            yield {"shard": index, "vars": test["vars"]}
+
+
+async def test_sharded_run_yields_every_case(tmp_path):
+    runner = FakeShardRunner(tmp_path)
+
+    results = [
+        result
+        async for result in runner.iter_results(
+            PROMPTS, ["m"], _cases(25), timeout=60, workers=3, shard_size=10
+        )
+    ]
+
+    assert sorted(int(r["vars"]["q"]) for r in results) == list(range(25))
+    assert sorted(runner.shards) == [0, 1, 2]
+
+
+async def test_sharded_run_surfaces_test_iterable_error(tmp_path):
+    runner = FakeShardRunner(tmp_path)
+
+    async def drain():
+        async for _ in runner.iter_results(
+            PROMPTS, ["m"], _cases(50, fail_at=25), timeout=60, workers=2, shard_size=10
+        ):
+            pass
+
+    # 전체 timeout(60초)까지 기다리면 wait_for가 먼저 TimeoutError
+    with pytest.raises(RuntimeError, match="dataset read failed"):
+        await asyncio.wait_for(drain(), timeout=1)
+
+
+async def test_retried_shard_reports_each_cell_once(runner, monkeypatch):
+    monkeypatch.setenv("FAKE_PROMPTFOO_FAIL_AFTER", "3")
+    progress: list[int] = []
+
+    results = [
+        result
+        async for result in runner.iter_results(
+            PROMPTS, ["m1", "m2"], _cases(4), timeout=30, workers=2, shard_size=2,
+            on_progress=progress.append,
+        )
+    ]
+
+    # 재시도한 shard의 셀도 한 번씩만 (출력의 99/100 같은 분수도 제외)
+    assert len(results) == sum(progress) == 8
+
+
+# 실제 promptfoo 출력 형식 (진행률 표시줄은 ANSI 제어 문자 + \r로 같은 줄을 덮어씀)
+PROMPTFOO_OUTPUT = [
+    ("Starting evaluation eval-Xk2-2025-10-18T05:33:12", None),
+    ("Running 12 test cases (up to 4 at a time)...", None),
+    (
+        "\x1b[?25lEvaluating [████████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░] 30% | ETA: 7s | "
+        "4/12 | openai:chat:meta-llama/Llama-3.3-70B-Instruct-Turbo \"Q {{q}}\" q=3/4",
+        4,
+    ),
+    (
+        "\rEvaluating [████░░░░] 8% | ETA: 20s | 1/12 | openai:chat:m \"Q\""
+        "\rEvaluating [████████████████████████░░░░] 58% | ETA: 3s | 7/12 | openai:chat:m \"Q\"",
+        7,
+    ),
+    ("Evaluation complete. ID: eval-Xk2-2025-10-18T05:33:12", None),
+    ("Successes: 10", None),
+    ("Pass Rate: 83.33%", None),
+    ("Token usage: Total: 2,481 Prompt: 1,203 Completion: 1,278 Cached: 0", None),
+    ("2025/10/18 05:33:20 Done.", None),
+]
+
+
+@pytest.mark.parametrize("line, expected", PROMPTFOO_OUTPUT)
+def test_parse_progress_from_promptfoo_output(line, expected):
+    assert PromptfooRunner.parse_progress(line, total=12) == expected
+
+
+def test_parse_progress_ignores_fractions_with_another_total():
+    assert PromptfooRunner.parse_progress("answer: 3/4 of the cases", total=12) is None
+    assert PromptfooRunner.parse_progress("answer: 3/4 of the cases") == 3
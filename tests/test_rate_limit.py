@@ -0,0 +1,186 @@
+"""Rate limit: 토큰 버킷 충전, AIMD 동시성, 슬롯 배분 (우선순위, fair share, 대기 중 취소)"""
+
+import asyncio
+
+import pytest
+
+from shared.adapters.rate_limit import (
+    AdaptiveConcurrency,
+    RateLimitConfig,
+    RateLimiterRegistry,
+    SchedulingShare,
+    TokenBucket,
+)
+
+BATCH = SchedulingShare("batch")
+SMALL = SchedulingShare("small")
+GOLDEN = SchedulingShare("golden", priority=10)
+
+
+def _fixed(limit: int) -> AdaptiveConcurrency:
+    """성공해도 한도가 늘지 않는 limiter (슬롯 배분만 확인)"""
+    return AdaptiveConcurrency(initial=limit, maximum=limit)
+
+
+async def _wait(limiter: AdaptiveConcurrency, share: SchedulingShare, granted: list[str]):
+    """슬롯 대기 task 시작 (슬롯을 받으면 share 이름 기록)"""
+
+    async def acquire():
+        await limiter.acquire(share)
+        granted.append(share.name)
+
+    task = asyncio.create_task(acquire())
+    await asyncio.sleep(0)  # 대기열에 들어갈 때까지
+    return task
+
+
+async def test_higher_priority_share_is_served_first():
+    limiter = _fixed(1)
+    granted: list[str] = []
+    await limiter.acquire(BATCH)
+    await _wait(limiter, BATCH, granted)
+    await _wait(limiter, GOLDEN, granted)
+
+    await limiter.release(share=BATCH)
+    await asyncio.sleep(0)
+    assert granted == ["golden"]
+
+    await limiter.release(share=GOLDEN)
+    await asyncio.sleep(0)
+    assert granted == ["golden", "batch"]
+
+
+async def test_share_with_fewer_slots_is_served_first():
+    limiter = _fixed(2)
+    granted: list[str] = []
+    await limiter.acquire(BATCH)
+    await limiter.acquire(BATCH)
+    # 배치 실행이 먼저 줄을 서 있어도 슬롯이 없는 작은 실행이 먼저 받음
+    await _wait(limiter, BATCH, granted)
+    await _wait(limiter, BATCH, granted)
+    await _wait(limiter, SMALL, granted)
+
+    await limiter.release(share=BATCH)
+    await asyncio.sleep(0)
+    assert granted == ["small"]
+
+    await limiter.release(share=BATCH)
+    await asyncio.sleep(0)
+    assert granted == ["small", "batch"]
+    assert limiter.snapshot()["shares"]["batch"] == {
+        "priority": 0, "in_flight": 1, "waiting": 1,
+    }
+
+
+async def test_cancelled_waiter_does_not_take_a_slot():
+    limiter = _fixed(1)
+    granted: list[str] = []
+    await limiter.acquire(BATCH)
+    cancelled = await _wait(limiter, GOLDEN, granted)
+    await _wait(limiter, SMALL, granted)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    await limiter.release(share=BATCH)
+    await asyncio.sleep(0)
+
+    assert granted == ["small"]
+    assert limiter.in_flight == 1
+    assert limiter.snapshot()["shares"].keys() == {"small"}
+
+
+async def test_waiter_cancelled_after_grant_passes_slot_on():
+    limiter = _fixed(1)
+    granted: list[str] = []
+    await limiter.acquire(BATCH)
+    first = await _wait(limiter, GOLDEN, granted)
+    await _wait(limiter, SMALL, granted)
+
+    # 슬롯을 받았지만 task가 재개되기 전에 취소 → 슬롯을 반납하고 다음 대기자에게
+    await limiter.release(share=BATCH)
+    first.cancel()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert granted == ["small"]
+    assert limiter.in_flight == 1
+    await limiter.release(share=SMALL)
+    assert limiter.in_flight == 0
+    assert limiter.snapshot()["shares"] == {}
+
+
+async def test_token_bucket_waits_for_refill_after_burst():
+    bucket = TokenBucket(per_minute=600, capacity=2)  # 초당 10개
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await bucket.consume()
+    await bucket.consume()
+    burst = loop.time() - start
+    await bucket.consume()  # 비었으므로 1/10초 충전 대기
+    waited = loop.time() - start - burst
+
+    assert burst < 0.05
+    assert 0.08 <= waited < 0.5
+
+
+async def test_token_bucket_refund_is_capped_at_capacity():
+    bucket = TokenBucket(per_minute=60, capacity=10)
+    await bucket.consume(8)
+
+    bucket.refund(5)
+    assert 6.9 < bucket._tokens <= 7.1
+    bucket.refund(100)
+    assert bucket._tokens == 10
+
+
+async def test_concurrency_grows_by_one_per_limit_successes():
+    limiter = AdaptiveConcurrency(initial=2, maximum=3)
+
+    # 성공마다 1/limit씩 → 2 + 1/2 + 1/2.5 = 2.9, 세 번째 성공에서 3
+    for _ in range(2):
+        await limiter.acquire()
+        await limiter.release()
+    assert limiter.limit == pytest.approx(2.9)
+    await limiter.acquire()
+    await limiter.release()
+    assert limiter.snapshot()["limit"] == 3
+
+    for _ in range(10):
+        await limiter.acquire()
+        await limiter.release()
+    assert limiter.limit == 3  # maximum에서 멈춤
+
+
+async def test_throttling_halves_concurrency_once_per_cooldown():
+    limiter = AdaptiveConcurrency(initial=16, minimum=2)
+
+    await limiter.acquire()
+    await limiter.acquire()
+    await limiter.release(throttled=True)
+    await limiter.release(throttled=True)  # 같은 429 폭주 → cooldown 안에서는 한 번만 감소
+    assert limiter.limit == 8
+
+    for _ in range(3):
+        limiter._last_decrease -= AdaptiveConcurrency.DECREASE_COOLDOWN
+        await limiter.acquire()
+        await limiter.release(throttled=True)
+    assert limiter.limit == 2  # minimum 아래로는 내려가지 않음
+
+
+def test_registry_applies_model_overrides_on_top_of_provider_limits():
+    registry = RateLimiterRegistry({
+        "together": {
+            "requests_per_minute": 600,
+            "max_concurrency": 32,
+            "models": {"big": {"requests_per_minute": 60}},
+        },
+    })
+
+    big = registry.config_for("together", "big")
+    small = registry.config_for("together", "small")
+
+    assert (big.requests_per_minute, big.max_concurrency) == (60, 32)
+    assert small.requests_per_minute == 600
+    assert registry.config_for("openai", "gpt") == RateLimitConfig()
+    assert registry.get("together", "big") is registry.get("together", "big")
@@ -0,0 +1,91 @@
+"""셀 결과 SSE 스트림: replay와 Last-Event-ID 이어받기"""
+
+import asyncio
+import json
+
+from test_harness_api.services.progress_bus import ProgressBus, progress_message
+from test_harness_api.services.result_stream import stream_results
+
+
+def _parse(chunks: list[str]) -> list[dict]:
+    """SSE 문자열 → [{"id", "event", "data"}] (retry/주석 제외)"""
+    events = []
+    for chunk in chunks:
+        fields = dict(
+            line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":")
+        )
+        if "event" in fields:
+            events.append({
+                "id": fields.get("id"),
+                "event": fields["event"],
+                "data": json.loads(fields["data"]),
+            })
+    return events
+
+
+async def _collect(stream) -> list[dict]:
+    return _parse([chunk async for chunk in stream])
+
+
+async def test_finished_run_is_replayed_then_ends(
+    test_service, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=5)
+    for case_id in await case_ids(run):
+        await save_result(run, case_id)
+    await test_service.update_test_run_status(run["id"], "completed")
+
+    events = await _collect(stream_results(test_service, ProgressBus(), run["id"], batch_size=2))
+
+    assert [e["event"] for e in events] == ["result"] * 5 + ["end"]
+    assert events[-1]["data"]["status"] == "completed"
+    assert len({e["id"] for e in events[:-1]}) == 5
+
+
+async def test_resume_from_last_event_id_skips_delivered_results(
+    test_service, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=6)
+    for case_id in await case_ids(run):
+        await save_result(run, case_id)
+    await test_service.update_test_run_status(run["id"], "completed")
+    bus = ProgressBus()
+    first = await _collect(stream_results(test_service, bus, run["id"]))
+    results = [e for e in first if e["event"] == "result"]
+
+    resumed = await _collect(
+        stream_results(test_service, bus, run["id"], last_event_id=results[2]["id"], batch_size=2)
+    )
+
+    resumed_ids = [e["data"]["id"] for e in resumed if e["event"] == "result"]
+    assert resumed_ids == [e["data"]["id"] for e in results[3:]]
+    assert resumed[-1]["event"] == "end"
+
+
+async def test_running_run_streams_new_results_until_final_status(
+    test_service, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=2)
+    cases = await case_ids(run)
+    await test_service.update_test_run_status(run["id"], "running")
+    bus = ProgressBus()
+    stream = stream_results(test_service, bus, run["id"], poll_interval=5.0)
+    assert (await anext(stream)).startswith("retry:")
+
+    async def run_tests():
+        # 스트림이 알림을 기다리는 동안 결과 저장 → 진행률 알림으로 깨움
+        await asyncio.sleep(0.01)
+        for i, case_id in enumerate(cases, 1):
+            await save_result(run, case_id)
+            bus.publish(run["id"], progress_message(run["id"], i, len(cases), "running"))
+        await test_service.update_test_run_status(run["id"], "completed")
+        bus.publish(run["id"], progress_message(run["id"], 2, 2, "completed"))
+
+    producer = asyncio.create_task(run_tests())
+    # poll_interval(5초)까지 기다리지 않고 알림으로 바로 전달
+    events = await asyncio.wait_for(_collect(stream), timeout=1)
+    await producer
+
+    assert [e["data"]["test_case_id"] for e in events if e["event"] == "result"] == cases
+    assert events[-1]["event"] == "end"
+    assert bus._channels == {}
@@ -0,0 +1,57 @@
+"""ResultWriter: 크기/타이머 flush와 종료 시 저장"""
+
+import asyncio
+
+
+def _record(run: dict, case_id: str) -> dict:
+    return {
+        "prompt_id": run["prompt_ids"][0],
+        "prompt_version": "1.0.0",
+        "model_id": run["model_ids"][0],
+        "test_case_id": case_id,
+        "input_mapped": {},
+        "input_rendered": "",
+        "output": "out",
+        "latency_ms": 10.0,
+        "passed": True,
+    }
+
+
+async def _stored(db, run: dict) -> int:
+    row = await db.fetchone(
+        "SELECT COUNT(*) AS count FROM test_results WHERE test_run_id = ?", (run["id"],)
+    )
+    return row["count"]
+
+
+async def test_buffer_is_flushed_when_it_reaches_flush_size(
+    db, test_service, make_run, case_ids
+):
+    run = await make_run(n_cases=5)
+    cases = await case_ids(run)
+
+    async with test_service.result_writer(run["id"], flush_size=2, flush_interval=60) as writer:
+        for i, case_id in enumerate(cases, 1):
+            await writer.add(**_record(run, case_id))
+            assert await _stored(db, run) == i - i % 2  # 2건마다 한 트랜잭션
+        assert writer.written == 4
+
+    # 종료 시 남은 1건 저장 + 진행률 반영
+    assert await _stored(db, run) == 5
+    assert (await test_service.get_test_run(run["id"]))["completed_cases"] == 5
+
+
+async def test_timer_flushes_a_partial_buffer_without_new_results(
+    db, test_service, make_run, case_ids
+):
+    run = await make_run(n_cases=1)
+    (case_id,) = await case_ids(run)
+
+    async with test_service.result_writer(run["id"], flush_size=100, flush_interval=0.05) as writer:
+        await writer.add(**_record(run, case_id))
+        assert await _stored(db, run) == 0
+
+        # 다음 결과가 오지 않아도 flush_interval 안에 저장
+        await asyncio.sleep(0.15)
+        assert await _stored(db, run) == 1
+        assert writer.written == 1
@@ -0,0 +1,65 @@
+"""RetryPolicy: 재시도 대상 판별, Retry-After 파싱, 백오프 상한"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from shared.adapters.retry import RetryPolicy
+
+
+def _status_error(status: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_retryable_errors():
+    policy = RetryPolicy()
+
+    assert policy.is_retryable(_status_error(429))
+    assert policy.is_retryable(_status_error(503))
+    assert policy.is_retryable(httpx.ReadTimeout("timeout"))
+    assert policy.is_retryable(httpx.ConnectError("refused"))
+    assert not policy.is_retryable(_status_error(401))
+    assert not policy.is_retryable(_status_error(400))
+    assert not policy.is_retryable(ValueError("bad json"))
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("7", 7.0), ("1.5", 1.5), ("-3", 0.0), ("soon", None), (None, None)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    headers = {"Retry-After": value} if value is not None else {}
+    response = _status_error(429, headers).response
+
+    assert RetryPolicy.parse_retry_after(response) == expected
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    future = _status_error(503, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+    past = _status_error(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+    # HTTP-date는 초 단위로 잘리므로 1초 오차
+    assert 28.0 <= RetryPolicy.parse_retry_after(future.response) <= 30.0
+    assert RetryPolicy.parse_retry_after(past.response) == 0.0
+
+
+def test_retry_after_takes_precedence_but_is_capped():
+    policy = RetryPolicy(max_retry_after=10.0)
+
+    assert policy.next_delay(1, _status_error(429, {"Retry-After": "4"})) == 4.0
+    assert policy.next_delay(1, _status_error(429, {"Retry-After": "3600"})) == 10.0
+
+
+def test_backoff_is_jittered_within_exponential_ceiling():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+    error = _status_error(500)
+
+    for attempt, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (4, 3.0), (10, 3.0)]:
+        delays = [policy.next_delay(attempt, error) for _ in range(200)]
+        assert all(0.0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2  # full jitter → 구간 전체에 분포
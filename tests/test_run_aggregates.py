@@ -0,0 +1,95 @@
+"""QuantileSketch 오차 보장과 RunAggregates 저장/복원/재계산"""
+
+import json
+import random
+
+import pytest
+from test_harness_api.services.run_aggregates import RunAggregates
+
+from shared.core.sketch import QuantileSketch
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _exact(values: list[float], q: float) -> float:
+    """스케치와 같은 rank 정의의 정확한 분위수"""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantiles_stay_within_relative_accuracy(accuracy):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(6, 1.2) for _ in range(5000)]  # 긴 꼬리 latency 분포
+    sketch = QuantileSketch(relative_accuracy=accuracy)
+    for value in values:
+        sketch.add(value)
+
+    for q in QUANTILES:
+        exact = _exact(values, q)
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact * (1 + 1e-9)
+
+
+def test_merge_and_round_trip_match_a_single_sketch():
+    rng = random.Random(11)
+    values = [rng.uniform(1, 2000) for _ in range(2000)] + [0.0] * 50
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+
+    left.merge(right)
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(left.to_dict())))
+
+    for q in (0.0, *QUANTILES, 1.0):
+        assert restored.quantile(q) == whole.quantile(q)
+    assert restored.count == len(values)
+    with pytest.raises(ValueError):
+        left.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+async def test_flushed_aggregates_are_restored_by_load(db, make_run, case_ids):
+    run = await make_run(n_cases=4, model_ids=["m1", "m2"])
+    aggregates = RunAggregates(db, run["id"])
+    for i, case_id in enumerate(await case_ids(run)):
+        for model_id in run["model_ids"]:
+            aggregates.add(
+                prompt_id=run["prompt_ids"][0],
+                model_id=model_id,
+                test_case_id=case_id,
+                passed=i != 0,
+                latency_ms=100.0 * (i + 1),
+                error="boom" if i == 0 else None,
+                input_tokens=10,
+            )
+    await aggregates.flush()
+    await db.commit()
+
+    restored = RunAggregates(db, run["id"])
+
+    assert await restored.load() == 8
+    assert restored.snapshot() == aggregates.snapshot()
+    summary = restored.snapshot()
+    assert (summary["passed_tests"], summary["error_tests"]) == (6, 2)
+    assert summary["by_model"]["m1"]["avg_latency_ms"] == pytest.approx(250.0)
+
+
+async def test_rebuild_recovers_from_results_after_a_mismatch(
+    db, make_run, save_result, case_ids
+):
+    run = await make_run(n_cases=3)
+    cases = await case_ids(run)
+    # 집계 없이 저장된 결과 (집계 도입 전 실행 등)
+    for case_id, passed in zip(cases, (True, False, True)):
+        await save_result(run, case_id, passed=passed, latency_ms=200.0)
+    aggregates = RunAggregates(db, run["id"])
+    assert await aggregates.load() == 0
+
+    assert await aggregates.rebuild() == 3
+    await db.commit()
+
+    reloaded = RunAggregates(db, run["id"])
+    assert await reloaded.load() == 3
+    summary = reloaded.snapshot()
+    assert summary["passed_tests"] == 2
+    assert summary["avg_latency_ms"] == pytest.approx(200.0)
+    assert summary["p95_latency_ms"] == pytest.approx(200.0, rel=0.01)
@@ -0,0 +1,75 @@
+"""StreamMetrics: TTFT, 토큰 간 지연, 디코딩 속도 계산"""
+
+import pytest
+
+from shared.adapters.base import BaseLLMAdapter, StreamMetrics, percentile
+
+
+def test_ttft_and_inter_token_latency_from_timings():
+    # 시작 10.0초, 첫 토큰 10.2초, 이후 50/50/100/300ms 간격, 종료 10.8초
+    metrics = StreamMetrics.from_timings(
+        start=10.0,
+        token_times=[10.2, 10.25, 10.3, 10.4, 10.7],
+        end=10.8,
+    )
+
+    assert metrics.ttft_ms == pytest.approx(200.0)
+    assert metrics.total_ms == pytest.approx(800.0)
+    assert metrics.itl_p50_ms == pytest.approx(75.0)    # [50, 50, 100, 300]의 중앙값
+    assert metrics.itl_p95_ms == pytest.approx(270.0)
+    assert metrics.itl_p99_ms == pytest.approx(294.0)
+    # 첫 토큰 이후 0.6초 동안 나머지 4개 청크
+    assert metrics.tokens_per_second == pytest.approx(4 / 0.6)
+
+
+def test_usage_token_count_overrides_chunk_count():
+    metrics = StreamMetrics.from_timings(1.0, [1.1, 1.2], end=1.6, output_tokens=21)
+
+    assert metrics.tokens_per_second == pytest.approx(20 / 0.5)
+
+
+def test_stream_without_tokens_reports_total_as_ttft():
+    metrics = StreamMetrics.from_timings(1.0, [], end=1.5)
+
+    assert metrics.ttft_ms == metrics.total_ms == pytest.approx(500.0)
+    assert metrics.tokens_per_second is None
+    assert metrics.itl_p50_ms is None
+
+
+def test_single_token_has_no_decode_rate_or_gaps():
+    metrics = StreamMetrics.from_timings(1.0, [1.3], end=1.3)
+
+    assert metrics.ttft_ms == pytest.approx(300.0)
+    assert metrics.tokens_per_second is None
+    assert metrics.itl_p95_ms is None
+
+
+def test_percentile_interpolates_linearly():
+    assert percentile([], 50) is None
+    assert percentile([5.0], 99) == 5.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == pytest.approx(2.5)
+    assert percentile([1.0, 2.0], 100) == 2.0
+
+
+class ChunkAdapter(BaseLLMAdapter):
+    """청크 3개를 스트리밍하는 가짜 어댑터"""
+
+    @property
+    def provider_name(self) -> str:
+        return "fake"
+
+    async def generate(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        raise NotImplementedError
+
+    async def generate_stream(self, prompt, model, temperature=0.7, max_tokens=1024, **kwargs):
+        for chunk in ("안녕", "하세", "요"):
+            yield chunk
+
+
+async def test_generate_measured_joins_chunks_and_attaches_metrics():
+    response = await ChunkAdapter().generate_measured("p", model="m")
+
+    assert response.content == "안녕하세요"
+    assert response.stream_metrics is not None
+    assert response.latency_ms == response.stream_metrics.total_ms
+    assert response.stream_metrics.ttft_ms <= response.stream_metrics.total_ms